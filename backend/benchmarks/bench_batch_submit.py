@@ -0,0 +1,85 @@
+"""
+Grade a worksheet of N sentences one submit at a time versus in one batch:
+webhook round trips against a local n8n stub, and session inserts against a
+throwaway SQLite database (point --database-url at Postgres for real numbers).
+
+    cd backend && python -m benchmarks.bench_batch_submit --sentences 30
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from benchmarks.stubs import StubServer, create_n8n_stub
+from db.database import Base, async_database_url
+from services.ai_service import AIService
+from services.http_client import http_clients
+from services.practice_service import PracticeService
+
+
+async def _validate(stub_url: str, items: list, batched: bool) -> float:
+    service = AIService()
+    service.webhook_url = f"{stub_url}/webhook/validate-sentence"
+    service.batch_webhook_url = f"{stub_url}/webhook/validate-batch"
+    start = time.perf_counter()
+    if batched:
+        await service.validate_batch(items)
+    else:
+        for item in items:
+            await service.validate_sentence(item["word"], item["definition"], item["sentence"])
+    elapsed = time.perf_counter() - start
+    await http_clients.shutdown()
+    return elapsed
+
+
+async def _save(database_url: str, rows: list, batched: bool) -> float:
+    engine = create_async_engine(async_database_url(database_url))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    start = time.perf_counter()
+    async with factory() as db:
+        service = PracticeService(db)
+        if batched:
+            await service.save_sessions(rows)
+        else:
+            for row in rows:
+                await service.save_session(**row)
+    elapsed = time.perf_counter() - start
+    await engine.dispose()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sentences", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    items = [
+        {"word": "apple", "definition": "A fruit", "sentence": f"I ate apple number {i} today."}
+        for i in range(args.sentences)
+    ]
+    rows = [
+        {"word_id": 1, "user_sentence": item["sentence"], "score": 8.0, "cefr_level": "B1", "feedback": "ok"}
+        for item in items
+    ]
+
+    with StubServer(create_n8n_stub(args.latency)) as stub:
+        sequential = asyncio.run(_validate(stub.url, items, batched=False))
+        batched = asyncio.run(_validate(stub.url, items, batched=True))
+    print(f"validation  sequential={sequential:7.3f}s batch={batched:7.3f}s speedup={sequential / batched:5.1f}x")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        sequential = asyncio.run(_save(database_url, rows, batched=False))
+        batched = asyncio.run(_save(database_url, rows, batched=True))
+    print(f"db inserts  sequential={sequential:7.3f}s batch={batched:7.3f}s speedup={sequential / batched:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
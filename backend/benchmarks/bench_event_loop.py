@@ -0,0 +1,83 @@
+"""
+Measure event-loop stalls while concurrent requests run a slow query, once
+through the synchronous engine (how routes used to call PracticeService) and
+once through the asyncio engine.
+
+A ticker coroutine sleeps 1ms in a loop; its overshoot is the time the loop
+was blocked. With SQLite the slow query is a recursive CTE; with Postgres
+(--database-url postgresql://...) it is pg_sleep.
+
+    cd backend && python -m benchmarks.bench_event_loop --requests 20
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from db.database import async_database_url
+
+
+def _slow_query(database_url: str) -> str:
+    if make_url(database_url).get_backend_name() == "postgresql":
+        return "SELECT pg_sleep(0.05)"
+    return "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 200000) SELECT count(*) FROM c"
+
+
+async def _ticker(stop: asyncio.Event, lags: list) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(time.perf_counter() - start - 0.001)
+
+
+async def _run(database_url: str, requests: int, use_async: bool) -> tuple:
+    query = text(_slow_query(database_url))
+    pool = {"pool_size": requests} if make_url(database_url).get_backend_name() == "postgresql" else {}
+    if use_async:
+        engine = create_async_engine(async_database_url(database_url), **pool)
+
+        async def request():
+            async with engine.connect() as conn:
+                await conn.execute(query)
+    else:
+        engine = create_engine(database_url, **pool)
+
+        async def request():
+            with engine.connect() as conn:
+                conn.execute(query)
+
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    start = time.perf_counter()
+    await asyncio.gather(*(request() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+
+    if use_async:
+        await engine.dispose()
+    else:
+        engine.dispose()
+    return elapsed, max(lags, default=0.0), len(lags)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        for name, use_async in (("sync engine", False), ("async engine", True)):
+            elapsed, max_lag, ticks = asyncio.run(_run(database_url, args.requests, use_async))
+            print(f"{name:<13} wall={elapsed:6.3f}s max_loop_stall={max_lag * 1000:8.2f}ms ticks={ticks}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Export throughput and peak Python memory for the streaming session export
+versus loading every row through the ORM first. Seeds a throwaway SQLite
+database with synthetic sessions; point --database-url at a Postgres copy
+(already populated) for real numbers.
+
+    cd backend && python -m benchmarks.bench_export --rows 1000000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from db.database import Base, async_database_url
+from db.models import PracticeSession
+from services.session_export import export_sessions
+
+
+async def _seed(factory, rows: int) -> None:
+    start = datetime(2024, 1, 1)
+    async with factory() as db:
+        for offset in range(0, rows, 20000):
+            await db.execute(insert(PracticeSession), [
+                {
+                    "word_id": i % 500,
+                    "user_sentence": f"I practiced sentence number {i} today.",
+                    "score": float(i % 11),
+                    "cefr_level": ("A1", "A2", "B1", "B2", "C1", "C2")[i % 6],
+                    "feedback": "Good sentence structure.",
+                    "practiced_at": start + timedelta(seconds=i),
+                    "status": "completed"
+                }
+                for i in range(offset, min(offset + 20000, rows))
+            ])
+        await db.commit()
+
+
+async def _streamed(factory, fmt: str, gzip: bool) -> int:
+    size = 0
+    async for chunk in await export_sessions(fmt, gzip=gzip, session_factory=factory):
+        size += len(chunk)
+    return size
+
+
+async def _naive(factory) -> int:
+    async with factory() as db:
+        sessions = (await db.execute(select(PracticeSession))).scalars().all()
+        body = "".join(
+            json.dumps({
+                "id": s.id,
+                "word_id": s.word_id,
+                "user_sentence": s.user_sentence,
+                "score": float(s.score),
+                "cefr_level": s.cefr_level,
+                "feedback": s.feedback,
+                "corrected_sentence": s.corrected_sentence,
+                "practiced_at": s.practiced_at.isoformat()
+            }) + "\n"
+            for s in sessions
+        ).encode()
+    return len(body)
+
+
+async def _measure(name: str, fn) -> None:
+    start = time.perf_counter()
+    size = await fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    await fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<16} {elapsed:7.2f}s  {size / 2**20:8.1f}MiB out  peak={peak / 2**20:8.1f}MiB")
+
+
+async def _run(database_url: str, rows: int, seed: bool, naive: bool) -> None:
+    engine = create_async_engine(async_database_url(database_url))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    if seed:
+        await _seed(factory, rows)
+
+    await _measure("ndjson", lambda: _streamed(factory, "ndjson", False))
+    await _measure("ndjson+gzip", lambda: _streamed(factory, "ndjson", True))
+    await _measure("csv+gzip", lambda: _streamed(factory, "csv", True))
+    try:
+        import pyarrow  # noqa: F401
+        await _measure("parquet", lambda: _streamed(factory, "parquet", False))
+    except ImportError:
+        print("parquet          skipped (pyarrow not installed)")
+    if naive:
+        await _measure("orm load-all", lambda: _naive(factory))
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--skip-naive", action="store_true", help="skip the load-everything baseline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        asyncio.run(_run(database_url, args.rows, seed=args.database_url is None, naive=not args.skip_naive))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare a fresh httpx.AsyncClient per request against the shared pooled client.
+
+    cd backend && python -m benchmarks.bench_http_client --requests 500
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from benchmarks.stubs import StubServer, create_vocab_stub
+from services.http_client import UpstreamConfig
+
+
+def _report(name: str, samples: list) -> None:
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(
+        f"{name:<14} mean={statistics.mean(samples) * 1000:7.3f}ms "
+        f"p50={statistics.median(samples) * 1000:7.3f}ms "
+        f"p99={p99 * 1000:7.3f}ms"
+    )
+
+
+async def _fresh_client(url: str, n: int) -> list:
+    samples = []
+    for _ in range(n):
+        start = time.perf_counter()
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            (await client.get(url)).raise_for_status()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def _shared_client(url: str, n: int) -> list:
+    samples = []
+    client = UpstreamConfig(name="vocab", timeout=10.0).build_client()
+    try:
+        for _ in range(n):
+            start = time.perf_counter()
+            (await client.get(url)).raise_for_status()
+            samples.append(time.perf_counter() - start)
+    finally:
+        await client.aclose()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    with StubServer(create_vocab_stub()) as stub:
+        url = f"{stub.url}/api/words/1"
+        _report("fresh client", asyncio.run(_fresh_client(url, args.requests)))
+        _report("shared client", asyncio.run(_shared_client(url, args.requests)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+End-to-end load test of the backend against local stand-ins for n8n and
+worddee_api. The backend runs as a real uvicorn subprocess on a throwaway
+SQLite database (or --database-url); the stubs run in this process.
+
+Reports throughput and p50/p95/p99 for GET /api/practice/word,
+POST /api/practice/submit and GET /api/dashboard/stats, writes them to
+--output as JSON, and with --baseline exits non-zero on a regression.
+
+    cd backend && python -m benchmarks.bench_load --duration 10 --output results/main.json
+    cd backend && python -m benchmarks.bench_load --baseline results/main.json --tolerance 0.15
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from benchmarks.load import compare, run_load
+from benchmarks.stubs import WORDS, StubServer, _free_port, create_n8n_stub, create_vocab_stub
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+class BackendProcess:
+    """The real app under uvicorn in its own process, so the load driver and
+    the server do not share a GIL or an event loop."""
+
+    def __init__(self, env: dict):
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._env = {**os.environ, **env}
+        self._process = None
+
+    def __enter__(self) -> "BackendProcess":
+        subprocess.run([sys.executable, "-m", "db.migrate"], cwd=BACKEND_DIR, env=self._env, check=True)
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(self.port), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=self._env
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                if httpx.get(f"{self.url}/ready", timeout=1).status_code == 200:
+                    return self
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+        self.__exit__()
+        raise RuntimeError("backend did not become ready")
+
+    def __exit__(self, *exc):
+        self._process.terminate()
+        self._process.wait(timeout=30)
+
+
+def _submit_body(n: int) -> dict:
+    word = WORDS[n % len(WORDS)]
+    # Distinct sentences, so the validation cache does not answer everything.
+    return {"word_id": word["id"], "user_sentence": f"I used the word {word['word']} in sentence {n}."}
+
+
+async def _run_scenarios(url: str, args) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        scenarios = {
+            "word": ("GET", "/api/practice/word", None),
+            "submit": ("POST", "/api/practice/submit", _submit_body),
+            "dashboard_stats": ("GET", "/api/dashboard/stats", None)
+        }
+        results = {}
+        for name, (method, path, body) in scenarios.items():
+            await run_load(client, method, path, args.concurrency, args.warmup, body)
+            results[name] = await run_load(client, method, path, args.concurrency, args.duration, body)
+            r = results[name]
+            print(
+                f"{name:<16} {r['throughput_rps']:8.1f} req/s  p50={r['p50_ms']:8.2f}ms "
+                f"p95={r['p95_ms']:8.2f}ms  p99={r['p99_ms']:8.2f}ms  errors={r['errors']}"
+            )
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds measured per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--n8n-latency", type=float, default=0.2)
+    parser.add_argument("--n8n-error-rate", type=float, default=0.0)
+    parser.add_argument("--vocab-latency", type=float, default=0.005)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--output", default=None, help="write results JSON here")
+    parser.add_argument("--baseline", default=None, help="results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    n8n_app = create_n8n_stub(latency=args.n8n_latency, error_rate=args.n8n_error_rate)
+    with tempfile.TemporaryDirectory() as tmp, \
+            StubServer(n8n_app) as n8n, \
+            StubServer(create_vocab_stub(latency=args.vocab_latency)) as vocab:
+        env = {
+            "DATABASE_URL": args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            "N8N_WEBHOOK_URL": f"{n8n.url}/webhook/validate-sentence",
+            "VOCAB_API_URL": vocab.url
+        }
+        with BackendProcess(env) as backend:
+            scenarios = asyncio.run(_run_scenarios(backend.url, args))
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")}
+        },
+        "scenarios": scenarios
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(json.load(f), results, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Validation latency by difficulty with a single webhook, with per-difficulty
+routing (Beginner words to a fast model, the rest to a strong one) and with
+routing plus hedging against a backup of the same tier. Every local n8n
+stub has a latency tail: --slow-rate of its calls take --slow-latency
+longer. Hedging at p95 only helps while that tail is under 5%.
+
+    cd backend && python -m benchmarks.bench_model_routing --requests 600
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from benchmarks.load import percentile
+from benchmarks.stubs import WORDS, StubServer, create_n8n_stub
+from services.ai_service import AIService
+from services.http_client import http_clients
+
+
+async def _run(urls: dict, requests: int, concurrency: int, hedge: bool, seed: int) -> tuple:
+    service = AIService()
+    service.webhook_url = urls["strong"]
+    if urls.get("fast"):
+        service.router.routes["Beginner"].url = urls["fast"]
+    for difficulty, route in service.router.routes.items():
+        backup = urls["fast_backup"] if difficulty == "Beginner" and urls.get("fast") else urls["backup"]
+        route.backup_url = backup if hedge else None
+
+    rng = random.Random(seed)
+    # Half of all practice is on Beginner words.
+    words = [WORDS[0] if rng.random() < 0.5 else rng.choice(WORDS[1:]) for _ in range(requests)]
+    latencies = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(n: int, word: dict):
+        async with semaphore:
+            start = time.perf_counter()
+            await service.validate_sentence(
+                word["word"], word["definition"], f"I used {word['word']} in sentence {n}.",
+                difficulty=word["difficulty_level"]
+            )
+            latencies.setdefault(word["difficulty_level"], []).append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(n, word) for n, word in enumerate(words)))
+    await http_clients.shutdown()
+    return latencies, service.router.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--fast-latency", type=float, default=0.05)
+    parser.add_argument("--strong-latency", type=float, default=0.25)
+    parser.add_argument("--slow-rate", type=float, default=0.04)
+    parser.add_argument("--slow-latency", type=float, default=1.0)
+    args = parser.parse_args()
+
+    tail = {"slow_rate": args.slow_rate, "slow_latency": args.slow_latency}
+    with StubServer(create_n8n_stub(args.fast_latency, seed=1, **tail)) as fast, \
+            StubServer(create_n8n_stub(args.strong_latency, seed=2, **tail)) as strong, \
+            StubServer(create_n8n_stub(args.strong_latency, seed=3, **tail)) as backup, \
+            StubServer(create_n8n_stub(args.fast_latency, seed=5, **tail)) as fast_backup:
+        path = "/webhook/validate-sentence"
+        urls = {
+            "fast": fast.url + path,
+            "strong": strong.url + path,
+            "backup": backup.url + path,
+            "fast_backup": fast_backup.url + path
+        }
+        runs = {
+            "single webhook": ({**urls, "fast": None}, False),
+            "routed": (urls, False),
+            "routed+hedged": (urls, True),
+        }
+        for name, (run_urls, hedge) in runs.items():
+            latencies, routes = asyncio.run(_run(run_urls, args.requests, args.concurrency, hedge, seed=4))
+            print(name)
+            for difficulty in ("Beginner", "Intermediate", "Advanced"):
+                samples = latencies.get(difficulty, [])
+                route = routes[difficulty.lower()]
+                print(
+                    f"  {difficulty:<13} n={len(samples):<4} p50={percentile(samples, 50) * 1000:7.1f}ms  "
+                    f"p95={percentile(samples, 95) * 1000:7.1f}ms  p99={percentile(samples, 99) * 1000:7.1f}ms  "
+                    f"hedged={route['hedged']:<3} won={route['hedge_win_rate']:.0%}"
+                )
+
+
+if __name__ == "__main__":
+    main()
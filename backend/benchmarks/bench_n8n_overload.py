@@ -0,0 +1,62 @@
+"""
+Drive a burst of distinct validations at a saturating n8n stub, with and
+without the AIService concurrency limiter, and report latency of the
+requests that were served.
+
+    cd backend && python -m benchmarks.bench_n8n_overload --burst 400
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.bench_http_client import _report
+from benchmarks.stubs import StubServer, create_n8n_stub
+from services.ai_service import AIService
+from services.concurrency import ConcurrencyLimiter, OverloadedError
+from services.http_client import http_clients
+
+
+async def _burst(url: str, burst: int, limiter: ConcurrencyLimiter) -> tuple:
+    service = AIService()
+    service.webhook_url = url
+    service.limiter = limiter
+
+    async def one(i: int):
+        start = time.perf_counter()
+        try:
+            await service.validate_sentence("apple", "A fruit", f"I eat apple number {i}.")
+        except OverloadedError:
+            return None
+        return time.perf_counter() - start
+
+    results = await asyncio.gather(*(one(i) for i in range(burst)))
+    await http_clients.shutdown()
+    served = [r for r in results if r is not None]
+    return served, burst - len(served)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--burst", type=int, default=400)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--capacity", type=int, default=8)
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--max-queue", type=int, default=32)
+    args = parser.parse_args()
+
+    with StubServer(create_n8n_stub(args.latency, args.capacity)) as stub:
+        url = f"{stub.url}/webhook/validate-sentence"
+        runs = {
+            "unlimited": ConcurrencyLimiter("n8n", args.burst, args.burst),
+            "limited": ConcurrencyLimiter(
+                "n8n", args.max_concurrency, args.max_queue, queue_timeout=10.0, retry_after=2.0
+            ),
+        }
+        for name, limiter in runs.items():
+            served, rejected = asyncio.run(_burst(url, args.burst, limiter))
+            _report(name, served)
+            print(f"{'':<14} served={len(served)} rejected_503={rejected}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Page latency of the session history query at increasing depth: keyset
+(seek on practiced_at, id) versus the OFFSET it replaces. Seeds a throwaway
+SQLite database; point --database-url at a Postgres copy for real numbers.
+
+    cd backend && python -m benchmarks.bench_session_history --rows 500000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from db.database import Base, async_database_url
+from db.models import PracticeSession
+from services.practice_service import PracticeService
+
+PAGE = 50
+
+
+async def _seed(factory, rows: int) -> None:
+    start = datetime(2024, 1, 1)
+    async with factory() as db:
+        for offset in range(0, rows, 10000):
+            await db.execute(insert(PracticeSession), [
+                {
+                    "word_id": i % 500,
+                    "user_sentence": f"Sentence {i}.",
+                    "score": float(i % 11),
+                    "cefr_level": ("A1", "A2", "B1", "B2", "C1", "C2")[i % 6],
+                    "feedback": "ok",
+                    "practiced_at": start + timedelta(seconds=i),
+                    "status": "completed"
+                }
+                for i in range(offset, min(offset + 10000, rows))
+            ])
+        await db.commit()
+
+
+async def _keyset(factory, depth: int) -> float:
+    # Find the cursor a client would hold after `depth` pages, then time one page.
+    async with factory() as db:
+        last = (await db.execute(
+            select(PracticeSession.practiced_at, PracticeSession.id)
+            .where(PracticeSession.status == "completed")
+            .order_by(PracticeSession.practiced_at.desc(), PracticeSession.id.desc())
+            .offset(depth * PAGE - 1)
+            .limit(1)
+        )).one() if depth else None
+        start = time.perf_counter()
+        await PracticeService(db).get_sessions_page(limit=PAGE, after=tuple(last) if last else None)
+        return time.perf_counter() - start
+
+
+async def _offset(factory, depth: int) -> float:
+    async with factory() as db:
+        start = time.perf_counter()
+        result = await db.execute(
+            select(PracticeSession)
+            .where(PracticeSession.status == "completed")
+            .order_by(PracticeSession.practiced_at.desc(), PracticeSession.id.desc())
+            .offset(depth * PAGE)
+            .limit(PAGE)
+        )
+        list(result.scalars())
+        return time.perf_counter() - start
+
+
+async def _run(database_url: str, rows: int, seed: bool) -> None:
+    engine = create_async_engine(async_database_url(database_url))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    if seed:
+        await _seed(factory, rows)
+
+    for depth in (0, 10, 100, 1000, rows // PAGE - 1):
+        keyset = min([await _keyset(factory, depth) for _ in range(5)])
+        offset = min([await _offset(factory, depth) for _ in range(5)])
+        print(f"page {depth + 1:>7}  keyset={keyset * 1000:7.2f}ms  offset={offset * 1000:8.2f}ms")
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        asyncio.run(_run(database_url, args.rows, seed=args.database_url is None))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Near-duplicate index: lookup latency (exact-normalized hit, near hit, miss)
+with --per-word graded sentences per word, the share of typical resubmission
+edits that would reuse a verdict at --threshold, and rebuild time from
+--rows sessions in a throwaway SQLite database.
+
+    cd backend && python -m benchmarks.bench_similar_sentences --per-word 1000 --rows 50000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from benchmarks.load import percentile
+from db.database import Base
+from db.models import PracticeSession
+from services.similar_sentences import SimilarSentenceIndex
+
+SUBJECTS = ["I", "You", "We", "They", "My sister", "Our teacher", "The children", "He", "She", "My friend"]
+VERBS = ["eat", "buy", "want", "like", "share", "pick", "wash", "cut", "find", "bring"]
+ARTICLES = ["an", "the", "that", "a fresh", "a green", "the red"]
+TAILS = ["every morning", "after school", "for lunch", "at the market", "on Sundays", "with my family",
+         "before dinner", "in the garden", "when I am hungry", "during the break"]
+VERDICT = {"score": 8.0, "cefr_level": "B1", "is_correct": True, "feedback": "Nice.", "corrected_sentence": None}
+
+
+def sentence(rng: random.Random) -> str:
+    return f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(ARTICLES)} apple {rng.choice(TAILS)}."
+
+
+def edits(text: str, rng: random.Random) -> dict:
+    words = text[:-1].split()
+    swapped = list(words)
+    # The determiner right after the (one or two word) subject and verb.
+    slot = next(i for i, word in enumerate(words) if i > 1 and word in ("a", "an", "the", "that"))
+    swapped[slot] = rng.choice([a for a in ("a", "an", "the") if a != words[slot]])
+    return {
+        "trailing space": text + " ",
+        "punctuation": text[:-1] + "!",
+        "lowercase": text.lower(),
+        "changed article": " ".join(swapped) + ".",
+        "extra word": " ".join(words + ["today"]) + ".",
+    }
+
+
+def _timed_lookups(index, queries, rounds: int = 5):
+    samples = []
+    for _ in range(rounds):
+        for word_id, text in queries:
+            start = time.perf_counter()
+            index.lookup(word_id, text)
+            samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def _rebuild(rows: int, threshold: float) -> tuple:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        rng = random.Random(2)
+        async with engine.begin() as conn:
+            for start in range(0, rows, 10000):
+                await conn.execute(insert(PracticeSession), [{
+                    "word_id": rng.randrange(1, 51),
+                    "user_sentence": sentence(rng),
+                    "score": 8.0,
+                    "cefr_level": "B1",
+                    "feedback": "Nice.",
+                    "status": "completed"
+                } for _ in range(min(10000, rows - start))])
+        index = SimilarSentenceIndex(async_sessionmaker(engine, expire_on_commit=False))
+        index.threshold = threshold
+        started = time.perf_counter()
+        loaded = await index.rebuild()
+        elapsed = time.perf_counter() - started
+        await engine.dispose()
+        return loaded, elapsed, index.stats()["entries"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--per-word", type=int, default=1000)
+    parser.add_argument("--words", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    index = SimilarSentenceIndex()
+    index.enabled, index.threshold, index.max_per_word = True, args.threshold, args.per_word
+    graded = {word_id: [sentence(rng) for _ in range(args.per_word)] for word_id in range(1, args.words + 1)}
+    started = time.perf_counter()
+    for word_id, sentences in graded.items():
+        for text in sentences:
+            index.add(word_id, text, VERDICT)
+    add_us = (time.perf_counter() - started) / (args.words * args.per_word) * 1e6
+    print(f"add        {add_us:7.1f}us per sentence, {index.stats()['entries']} entries")
+
+    samples = [(word_id, rng.choice(sentences)) for word_id, sentences in graded.items() for _ in range(50)]
+    scenarios = {
+        "exact hit": [(w, s.upper() + " ") for w, s in samples],
+        "near": [(w, edits(s, rng)["changed article"]) for w, s in samples],
+        "miss": [(w, f"Completely different text number {n} about something else.") for n, (w, _) in enumerate(samples)],
+    }
+    for name, queries in scenarios.items():
+        latencies = _timed_lookups(index, queries)
+        print(
+            f"lookup {name:<10} p50={percentile(latencies, 50) * 1e6:7.1f}us  "
+            f"p99={percentile(latencies, 99) * 1e6:7.1f}us"
+        )
+
+    fresh = SimilarSentenceIndex()
+    fresh.enabled, fresh.threshold = True, args.threshold
+    reused = {}
+    for n in range(500):
+        original = sentence(rng)
+        fresh.add(10_000 + n, original, VERDICT)
+        for kind, variant in edits(original, rng).items():
+            reused.setdefault(kind, []).append(fresh.lookup(10_000 + n, variant) is not None)
+    print("reused at threshold %.2f: %s" % (args.threshold, ", ".join(
+        f"{kind} {sum(hits) / len(hits):.0%}" for kind, hits in reused.items()
+    )))
+
+    loaded, elapsed, entries = asyncio.run(_rebuild(args.rows, args.threshold))
+    print(f"rebuild    {loaded} sessions -> {entries} entries in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
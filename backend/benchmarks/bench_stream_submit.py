@@ -0,0 +1,62 @@
+"""
+Time to first byte and to completion of POST /api/practice/submit versus
+POST /api/practice/submit/stream, against a local n8n stub that streams its
+answer like an LLM (assessment after --n8n-latency, then feedback chunks
+every --chunk-delay). The backend runs as a real uvicorn subprocess.
+
+    cd backend && python -m benchmarks.bench_stream_submit --requests 20
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.bench_load import BackendProcess
+from benchmarks.stubs import WORDS, StubServer, create_n8n_stub, create_vocab_stub
+
+
+def _measure(client: httpx.Client, path: str, n: int) -> tuple:
+    word = WORDS[n % len(WORDS)]
+    body = {"word_id": word["id"], "user_sentence": f"I used the word {word['word']} in sentence {n}."}
+    start = time.perf_counter()
+    first = None
+    with client.stream("POST", path, json=body) as response:
+        response.raise_for_status()
+        for _ in response.iter_raw():
+            if first is None:
+                first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--n8n-latency", type=float, default=0.5, help="seconds until the stub knows the score")
+    parser.add_argument("--chunk-delay", type=float, default=0.1, help="seconds between feedback chunks")
+    args = parser.parse_args()
+
+    n8n_app = create_n8n_stub(latency=args.n8n_latency, chunk_delay=args.chunk_delay)
+    with tempfile.TemporaryDirectory() as tmp, \
+            StubServer(n8n_app) as n8n, \
+            StubServer(create_vocab_stub()) as vocab:
+        env = {
+            "DATABASE_URL": f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            "N8N_WEBHOOK_URL": f"{n8n.url}/webhook/validate-sentence",
+            "N8N_STREAM_WEBHOOK_URL": f"{n8n.url}/webhook/validate-sentence-stream",
+            "VOCAB_API_URL": vocab.url
+        }
+        with BackendProcess(env) as backend, httpx.Client(base_url=backend.url, timeout=60) as client:
+            for name, path in (("submit", "/api/practice/submit"), ("submit/stream", "/api/practice/submit/stream")):
+                # Offset sentence numbers so the validation cache never answers.
+                offset = 0 if name == "submit" else args.requests
+                samples = [_measure(client, path, offset + n) for n in range(args.requests)]
+                ttfb = statistics.median(first for first, _ in samples)
+                total = statistics.median(done for _, done in samples)
+                print(f"{name:<14} ttfb p50={ttfb * 1000:8.1f}ms  complete p50={total * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
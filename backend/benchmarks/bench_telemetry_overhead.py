@@ -0,0 +1,99 @@
+"""
+Cost of the request instrumentation: raw histogram/counter operations, and
+per-request overhead of TimingMiddleware on a trivial route driven straight
+through ASGI (the worst case, since real handlers take milliseconds).
+
+    cd backend && python -m benchmarks.bench_telemetry_overhead --requests 20000
+"""
+import argparse
+import asyncio
+import time
+import timeit
+
+from fastapi import FastAPI
+
+from middleware.timing import TimingMiddleware
+from services.telemetry import Registry, timed
+
+
+def _app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+    if instrumented:
+        app.add_middleware(TimingMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    return app
+
+
+async def _per_request(app: FastAPI, requests: int) -> float:
+    # Drive the ASGI app directly: an HTTP client would add far more noise
+    # than the middleware costs.
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    def scope(i: int) -> dict:
+        return {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": f"/items/{i}",
+            "raw_path": f"/items/{i}".encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+            "server": ("bench", 80),
+            "client": ("127.0.0.1", 1234)
+        }
+
+    for i in range(200):
+        await app(scope(i), receive, send)
+    start = time.perf_counter()
+    for i in range(requests):
+        await app(scope(i), receive, send)
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    registry = Registry()
+    histogram = registry.histogram("bench_seconds", "Bench.", ("method", "route"))
+    counter = registry.counter("bench_total", "Bench.", ("method", "route", "status"))
+    n = 1_000_000
+    observe = timeit.timeit(lambda: histogram.observe(0.012, "GET", "/items/{item_id}"), number=n) / n
+    inc = timeit.timeit(lambda: counter.inc("GET", "/items/{item_id}", "200"), number=n) / n
+
+    def span():
+        with timed(histogram, "GET", "/span"):
+            pass
+
+    span_cost = timeit.timeit(span, number=n) / n
+    print(f"histogram.observe  {observe * 1e9:7.0f}ns")
+    print(f"counter.inc        {inc * 1e9:7.0f}ns")
+    print(f"timed() span       {span_cost * 1e9:7.0f}ns")
+
+    # Interleave rounds so drift (thermal, GC) hits both variants alike.
+    bare, instrumented = [], []
+    for _ in range(args.rounds):
+        bare.append(asyncio.run(_per_request(_app(False), args.requests)))
+        instrumented.append(asyncio.run(_per_request(_app(True), args.requests)))
+    bare_best, instrumented_best = min(bare), min(instrumented)
+    overhead = instrumented_best - bare_best
+    print(f"request bare       {bare_best * 1e6:7.1f}us")
+    print(f"request timed      {instrumented_best * 1e6:7.1f}us")
+    print(f"middleware cost    {overhead * 1e6:7.1f}us/request ({overhead / bare_best:5.1%} of a no-op route)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+════════════════════════════════════════════════════════════════
+Closed-loop load driver and result comparison for the benchmarks
+════════════════════════════════════════════════════════════════
+"""
+import asyncio
+import statistics
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+
+def percentile(samples: List[float], p: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))]
+
+
+def summarize(samples: List[float], statuses: Counter, elapsed: float) -> Dict:
+    """Throughput and latency figures in the shape saved to the results JSON."""
+
+    requests = sum(statuses.values())
+    errors = sum(n for status, n in statuses.items() if status >= 500 or status == 0)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "error_rate": round(errors / requests, 4) if requests else 0.0,
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.mean(samples) * 1000, 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "status_counts": {str(status): n for status, n in sorted(statuses.items())}
+    }
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    method: str,
+    path: str,
+    concurrency: int,
+    duration: float,
+    body: Optional[Callable[[int], dict]] = None
+) -> Dict:
+    """Keep ``concurrency`` requests outstanding for ``duration`` seconds.
+
+    Closed loop: each worker sends its next request as soon as the previous
+    one finishes, so throughput is what the server sustains at that
+    concurrency. Transport errors are counted as status 0.
+    """
+    samples: List[float] = []
+    statuses: Counter = Counter()
+    deadline = time.perf_counter() + duration
+    sequence = iter(range(10 ** 9))
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            n = next(sequence)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body(n) if body else None)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = 0
+            samples.append(time.perf_counter() - start)
+            statuses[status] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples, statuses, time.perf_counter() - start)
+
+
+def compare(baseline: Dict, current: Dict, tolerance: float) -> List[str]:
+    """Regressions of ``current`` against ``baseline``: p95/p99 or
+    throughput worse by more than ``tolerance`` (0.1 = 10%), or an error
+    rate up by more than a tenth of it (one point at 10%)."""
+
+    regressions = []
+    for name, before in baseline.get("scenarios", {}).items():
+        after = current.get("scenarios", {}).get(name)
+        if after is None:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if before[metric] and after[metric] > before[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {before[metric]} -> {after[metric]}")
+        if after["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput_rps {before['throughput_rps']} -> {after['throughput_rps']}")
+        if after["error_rate"] > before["error_rate"] + tolerance / 10:
+            regressions.append(f"{name}: error_rate {before['error_rate']} -> {after['error_rate']}")
+    return regressions
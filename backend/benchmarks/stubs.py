@@ -0,0 +1,164 @@
+"""
+════════════════════════════════════════════════════════════════
+Local stand-ins for n8n and worddee_api used by the benchmarks
+════════════════════════════════════════════════════════════════
+"""
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+
+import uvicorn
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+
+
+WORDS = [
+    {"id": 1, "word": "apple", "definition": "A round fruit with red, green, or yellow skin", "difficulty_level": "Beginner"},
+    {"id": 11, "word": "ambitious", "definition": "Having a strong desire to succeed", "difficulty_level": "Intermediate"},
+    {"id": 30, "word": "ephemeral", "definition": "Lasting for a very short time", "difficulty_level": "Advanced"},
+]
+
+
+STREAM_FEEDBACK = (
+    "Good use of the word. The sentence is grammatically correct and natural. "
+    "To reach a higher level, try adding a subordinate clause or a more precise verb."
+)
+
+
+def create_n8n_stub(
+    latency: float = 0.0,
+    capacity: int = None,
+    error_rate: float = 0.0,
+    seed: int = 0,
+    chunk_delay: float = 0.0,
+    slow_rate: float = 0.0,
+    slow_latency: float = 0.0
+) -> FastAPI:
+    """With ``capacity`` set, latency grows with requests in flight beyond it,
+    the way a saturated n8n/LLM backend degrades. ``error_rate`` is the
+    fraction of calls answered with a 500, and ``slow_rate`` the fraction of
+    plain webhook calls that take ``slow_latency`` longer, a latency tail
+    (both seeded, so runs are repeatable).
+
+    The streaming webhook answers like an LLM: the assessment after
+    ``latency``, then the feedback a few words per NDJSON line every
+    ``chunk_delay`` seconds. The plain webhook waits for the whole thing.
+    """
+
+    app = FastAPI()
+    state = {"in_flight": 0}
+    rng = random.Random(seed)
+
+    words = STREAM_FEEDBACK.split(" ")
+    chunks = [" ".join(words[i:i + 4]) + " " for i in range(0, len(words), 4)]
+    chunks[-1] = chunks[-1].rstrip()
+
+    @app.post("/webhook/validate-sentence")
+    async def validate(payload: dict):
+        state["in_flight"] += 1
+        try:
+            delay = latency + chunk_delay * len(chunks)
+            if slow_rate and rng.random() < slow_rate:
+                delay += slow_latency
+            if capacity and state["in_flight"] > capacity:
+                delay *= state["in_flight"] / capacity
+            if delay:
+                await asyncio.sleep(delay)
+        finally:
+            state["in_flight"] -= 1
+        if error_rate and rng.random() < error_rate:
+            raise HTTPException(status_code=500, detail="Stub failure")
+        return [{
+            "score": 8.0,
+            "cefr_level": "B1",
+            "is_correct": True,
+            "feedback": STREAM_FEEDBACK if chunk_delay else "Stub feedback.",
+            "corrected_sentence": payload.get("sentence"),
+        }]
+
+    @app.post("/webhook/validate-sentence-stream")
+    async def validate_stream(payload: dict):
+
+        async def lines():
+            if latency:
+                await asyncio.sleep(latency)
+            yield json.dumps({"score": 8.0, "cefr_level": "B1", "is_correct": True}) + "\n"
+            for chunk in chunks:
+                if chunk_delay:
+                    await asyncio.sleep(chunk_delay)
+                yield json.dumps({"delta": chunk}) + "\n"
+            yield json.dumps({"corrected_sentence": payload.get("sentence")}) + "\n"
+
+        if error_rate and rng.random() < error_rate:
+            raise HTTPException(status_code=500, detail="Stub failure")
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.post("/webhook/validate-batch")
+    async def validate_batch(payload: dict):
+        if latency:
+            await asyncio.sleep(latency)
+        if error_rate and rng.random() < error_rate:
+            raise HTTPException(status_code=500, detail="Stub failure")
+        return [{
+            "score": 8.0,
+            "cefr_level": "B1",
+            "is_correct": True,
+            "feedback": "Stub feedback.",
+            "corrected_sentence": item.get("sentence"),
+        } for item in payload.get("items", [])]
+
+    return app
+
+
+def create_vocab_stub(latency: float = 0.0) -> FastAPI:
+
+    app = FastAPI()
+    by_id = {w["id"]: w for w in WORDS}
+
+    @app.get("/api/random")
+    async def random_word(difficulty: str = None):
+        if latency:
+            await asyncio.sleep(latency)
+        candidates = [w for w in WORDS if not difficulty or w["difficulty_level"] == difficulty]
+        return candidates[int(time.monotonic() * 1000) % len(candidates)]
+
+    @app.get("/api/words/{word_id}")
+    async def word_by_id(word_id: int):
+        if latency:
+            await asyncio.sleep(latency)
+        if word_id not in by_id:
+            raise HTTPException(status_code=404, detail="Word not found")
+        return by_id[word_id]
+
+    return app
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StubServer:
+    """Runs an ASGI app with uvicorn on a background thread."""
+
+    def __init__(self, app: FastAPI, port: int = None):
+        self.port = port or _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self._server.should_exit = True
+        self._thread.join()
@@ -0,0 +1,168 @@
+"""
+Apply pending database/migrations/*.sql, once per deploy rather than on
+every worker boot:
+
+    cd backend && python -m db.migrate                 # apply pending migrations
+    cd backend && python -m db.migrate --status        # list applied and pending
+    cd backend && python -m db.migrate --baseline 005  # adopt a database created before schema_migrations
+
+On Postgres each file runs through psql (ON_ERROR_STOP, autocommit), since
+some migrations manage their own transaction or build indexes CONCURRENTLY,
+and its version is recorded in ``schema_migrations``. An empty database
+gets database/init.sql, which already includes every migration. SQLite,
+used for local runs and the benchmarks, gets the schema from the models.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Optional, Tuple
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Connection, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from db.database import DATABASE_URL, Base
+
+DATABASE_DIR = os.getenv(
+    "DATABASE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "database")
+)
+MIGRATIONS_DIR = os.path.join(DATABASE_DIR, "migrations")
+INIT_SQL = os.path.join(DATABASE_DIR, "init.sql")
+
+# Any table from init.sql; its absence means the schema was never created.
+SENTINEL_TABLE = "practice_sessions"
+
+
+class MigrationError(Exception):
+    pass
+
+
+def discover(directory: str = MIGRATIONS_DIR) -> List[Tuple[str, str]]:
+    """``(version, path)`` for every ``NNN_name.sql``, in version order."""
+
+    migrations = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".sql") and "_" in name:
+            migrations.append((name.split("_", 1)[0], os.path.join(directory, name)))
+    return migrations
+
+
+def pending(available: List[Tuple[str, str]], applied: set) -> List[Tuple[str, str]]:
+    return [(version, path) for version, path in available if version not in applied]
+
+
+def _applied(conn: Connection) -> set:
+    return set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+
+def _record(conn: Connection, versions: List[str]) -> None:
+    conn.execute(
+        text("INSERT INTO schema_migrations (version) VALUES (:version) ON CONFLICT DO NOTHING"),
+        [{"version": version} for version in versions]
+    )
+
+
+def _psql(url: str, path: str) -> None:
+    # psql wants a plain libpq URL, without SQLAlchemy's +driver suffix.
+    plain = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+    result = subprocess.run(["psql", plain, "-X", "-q", "-v", "ON_ERROR_STOP=1", "-f", path])
+    if result.returncode != 0:
+        raise MigrationError(f"{os.path.basename(path)} failed (psql exit {result.returncode})")
+
+
+def migrate(url: str = DATABASE_URL, baseline: Optional[str] = None, directory: str = MIGRATIONS_DIR) -> List[str]:
+    """Bring the database at ``url`` up to date and return what was applied."""
+
+    engine = create_engine(url)
+    try:
+        if engine.dialect.name != "postgresql":
+            import db.models  # noqa: F401  (registers the tables on Base)
+            existing = set(inspect(engine).get_table_names())
+            Base.metadata.create_all(bind=engine)
+            return [name for name in Base.metadata.tables if name not in existing]
+
+        available = discover(directory)
+        with engine.begin() as conn:
+            tables = set(inspect(conn).get_table_names())
+            if "schema_migrations" not in tables and SENTINEL_TABLE not in tables:
+                fresh = True
+            elif "schema_migrations" not in tables:
+                if baseline is None:
+                    raise MigrationError(
+                        "Database has a schema but no schema_migrations table; "
+                        "rerun with --baseline <last applied version>"
+                    )
+                fresh = False
+                conn.execute(text(
+                    "CREATE TABLE schema_migrations ("
+                    "version VARCHAR(32) PRIMARY KEY, "
+                    "applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                ))
+                _record(conn, [version for version, _ in available if version <= baseline])
+            else:
+                fresh = False
+
+        applied = []
+        if fresh:
+            _psql(url, INIT_SQL)
+            applied.append("init.sql")
+
+        with engine.connect() as conn:
+            todo = pending(available, _applied(conn))
+        for version, path in todo:
+            _psql(url, path)
+            with engine.begin() as conn:
+                _record(conn, [version])
+            applied.append(os.path.basename(path))
+        return applied
+    finally:
+        engine.dispose()
+
+
+def status(url: str = DATABASE_URL, directory: str = MIGRATIONS_DIR) -> List[Tuple[str, bool]]:
+
+    engine = create_engine(url)
+    try:
+        if engine.dialect.name != "postgresql":
+            return []
+        with engine.connect() as conn:
+            if not inspect(conn).has_table("schema_migrations"):
+                applied = set()
+            else:
+                applied = _applied(conn)
+        return [(os.path.basename(path), version in applied) for version, path in discover(directory)]
+    finally:
+        engine.dispose()
+
+
+async def check_schema(engine: AsyncEngine) -> None:
+    """Readiness check: the schema exists, i.e. ``db.migrate`` has run."""
+
+    async with engine.connect() as conn:
+        exists = await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(SENTINEL_TABLE))
+    if not exists:
+        raise MigrationError(f"Table {SENTINEL_TABLE} is missing; run python -m db.migrate")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--status", action="store_true", help="list migrations and whether they have run")
+    parser.add_argument("--baseline", default=None, help="mark versions up to this one as already applied")
+    args = parser.parse_args()
+
+    try:
+        if args.status:
+            for name, done in status():
+                print(f"{'applied' if done else 'pending':<8} {name}")
+            return
+        applied = migrate(baseline=args.baseline)
+    except MigrationError as e:
+        print(f"Migration failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Applied: {', '.join(applied)}" if applied else "Database is up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Date, DateTime, Numeric, JSON, Index, text
 from db.database import Base
 from datetime import datetime
 
@@ -13,7 +13,129 @@ class PracticeSession(Base):
     cefr_level = Column(String(10))
     feedback = Column(Text)
     corrected_sentence = Column(Text)
-    practiced_at = Column(DateTime, default=datetime.utcnow, index=True)
+    # On Postgres the table is range-partitioned by month on practiced_at and its
+    # primary key is (id, practiced_at); ids are still unique (one sequence), so
+    # the ORM keeps identifying rows by id alone.
+    practiced_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    # pending -> processing -> completed | failed; synchronous submits are written as completed
+    status = Column(String(20), nullable=False, default="completed", server_default="completed")
+    # When a worker claimed the row; 'processing' rows older than the lease are claimed again
+    claimed_at = Column(DateTime)
+    
+    # Keyset pagination for the history API seeks on (practiced_at, id) over
+    # completed rows, optionally behind an equality filter on word or level.
+    __table_args__ = (
+        Index(
+            "idx_sessions_history",
+            practiced_at.desc(), id.desc(),
+            postgresql_where=text("status = 'completed'"),
+            sqlite_where=text("status = 'completed'")
+        ),
+        Index(
+            "idx_sessions_word_history",
+            word_id, practiced_at.desc(), id.desc(),
+            postgresql_where=text("status = 'completed'"),
+            sqlite_where=text("status = 'completed'")
+        ),
+        Index(
+            "idx_sessions_level_history",
+            cefr_level, practiced_at.desc(), id.desc(),
+            postgresql_where=text("status = 'completed'"),
+            sqlite_where=text("status = 'completed'")
+        )
+    )
     
     def __repr__(self):
-        return f"<PracticeSession(id={self.id}, word_id={self.word_id}, score={self.score})>"
\ No newline at end of file
+        return f"<PracticeSession(id={self.id}, word_id={self.word_id}, score={self.score})>"
+
+
+class ValidationCacheEntry(Base):
+
+    __tablename__ = "validation_cache"
+    
+    key = Column(String(64), primary_key=True)
+    word = Column(String(100), nullable=False)
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<ValidationCacheEntry(key={self.key}, word={self.word})>"
+
+
+class PracticeStats(Base):
+    """Running totals over completed sessions, kept in step by every insert."""
+
+    __tablename__ = "practice_stats"
+    
+    id = Column(Integer, primary_key=True, default=1)
+    total_sessions = Column(BigInteger, nullable=False, default=0)
+    scored_sessions = Column(BigInteger, nullable=False, default=0)
+    score_sum = Column(Numeric(14, 1), nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+class PracticeLevelCount(Base):
+
+    __tablename__ = "practice_level_counts"
+    
+    cefr_level = Column(String(10), primary_key=True)
+    sessions = Column(BigInteger, nullable=False, default=0)
+
+
+class WordScoreDaily(Base):
+    """Completed, scored sessions per day, word, CEFR level and exact score.
+
+    Scores have one decimal place, so keying on the score keeps the full
+    distribution (exact percentiles) in at most 101 rows per word and level.
+    """
+
+    __tablename__ = "word_score_daily"
+    
+    day = Column(Date, primary_key=True)
+    word_id = Column(Integer, primary_key=True)
+    cefr_level = Column(String(10), primary_key=True)
+    score = Column(Numeric(3, 1), primary_key=True)
+    sessions = Column(BigInteger, nullable=False, default=0)
+
+
+class WordScoreTotal(Base):
+    """All-time rollup with the same shape, so unbounded queries skip the daily rows."""
+
+    __tablename__ = "word_score_totals"
+    
+    word_id = Column(Integer, primary_key=True)
+    cefr_level = Column(String(10), primary_key=True)
+    score = Column(Numeric(3, 1), primary_key=True)
+    sessions = Column(BigInteger, nullable=False, default=0)
+
+
+class IdempotencyKey(Base):
+    """Response stored for an ``Idempotency-Key``. ``response`` is NULL while
+    the first request is still running; ``expires_at`` is then its lock
+    timeout, and after completion the replay TTL."""
+
+    __tablename__ = "idempotency_keys"
+    
+    key = Column(String(300), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer)
+    response = Column(JSON)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (Index("idx_idempotency_keys_expires", expires_at),)
+
+
+class Word(Base):
+    """The vocab API's words table, which lives in the same database.
+
+    Mapped read-only so analytics can join difficulty in SQL; the vocab API
+    owns the rows and the schema (``difficulty_level`` is an enum there).
+    """
+
+    __tablename__ = "words"
+    
+    id = Column(Integer, primary_key=True)
+    word = Column(String(100), nullable=False)
+    definition = Column(Text, nullable=False)
+    difficulty_level = Column(String(20), nullable=False)
@@ -1,18 +1,55 @@
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routes import practice, dashboard
-from db.database import engine, Base
+from fastapi.responses import JSONResponse
+from middleware.timing import TimingMiddleware
+from routes import practice, dashboard, metrics
+from db.database import async_engine, warm_pool
+from db.migrate import check_schema
+from services.http_client import http_clients
+from services.invalidation import invalidation_bus
+from services.readiness import readiness
 
 
-Base.metadata.create_all(bind=engine)
+# Schema changes are applied by `python -m db.migrate`, not at import, so
+# importing the app never touches the database.
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    
+    await http_clients.startup()
+    readiness.register("database", warm_pool)
+    readiness.register("schema", lambda: check_schema(async_engine))
+    await readiness.start()
+    await invalidation_bus.start()
+    await practice.word_pool.start()
+    await practice.ai_service.similar.start()
+    await practice.session_writer.start()
+    await practice.submit_workers.start()
+    await dashboard.partition_manager.start()
+    await dashboard.stats_reconciler.start()
+    try:
+        yield
+    finally:
+        await dashboard.stats_reconciler.stop()
+        await dashboard.partition_manager.stop()
+        await practice.submit_workers.stop()
+        await practice.session_writer.stop()
+        await practice.ai_service.similar.stop()
+        await practice.word_pool.stop()
+        await invalidation_bus.stop()
+        await readiness.stop()
+        await http_clients.shutdown()
+        await async_engine.dispose()
+
 
 app = FastAPI(
     title="Worddee.ai Backend",
     description="AI-powered English sentence practice platform",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 
@@ -23,10 +60,12 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(TimingMiddleware)
 
 
 app.include_router(practice.router)
 app.include_router(dashboard.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -50,6 +89,13 @@ async def health_check():
     return {"status": "healthy", "service": "worddee-backend"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    
+    stats = readiness.stats()
+    return JSONResponse(status_code=200 if stats["ready"] else 503, content=stats)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,41 @@
+
+import time
+from services.telemetry import http_request_duration, http_requests_in_flight, http_requests_total
+
+
+class TimingMiddleware:
+    """Records latency, status and in-flight count for every HTTP request.
+
+    Plain ASGI rather than ``BaseHTTPMiddleware``: no extra task or body
+    buffering per request, and streaming responses (SSE, exports) are timed
+    to their last byte. Latency is labelled by route template
+    (``/api/practice/sessions/{session_id}``), never the raw path, so label
+    cardinality stays bounded; unmatched paths share one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            template = route.path if route is not None else "unmatched"
+            http_request_duration.observe(time.perf_counter() - start, scope["method"], template)
+            http_requests_total.inc(scope["method"], template, str(status))
@@ -1,42 +1,166 @@
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from db.database import get_db
-from schemas.practice import DashboardStats, PracticeResponse
+import base64
+import binascii
+from datetime import datetime
+from typing import Dict, Literal, Optional, Tuple
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import AsyncSessionLocal, get_db
+from db.models import PracticeSession
+from schemas.practice import DashboardStats, PracticeResponse, SessionHistoryPage, WordAnalyticsResponse
+from services.dashboard_cache import dashboard_cache, etag_matches
 from services.practice_service import PracticeService
+from services.partition_manager import PartitionManager
+from services.session_export import MEDIA_TYPES, ExportUnavailableError, export_sessions
+from services.stats_aggregates import StatsReconciler
+from services.word_analytics import WordAnalyticsService
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
+stats_reconciler = StatsReconciler()
+partition_manager = PartitionManager(reconciler=stats_reconciler)
+
 
 @router.get("/stats", response_model=DashboardStats)
-async def get_dashboard_stats(db: Session = Depends(get_db)):
+async def get_dashboard_stats(if_none_match: Optional[str] = Header(None)):
 
-    practice_service = PracticeService(db)
-    
-    
-    stats = practice_service.get_statistics()
+    # Answered from the cached ETag alone: no session, no query, no serialization.
+    if dashboard_cache.not_modified_since(if_none_match):
+        return _not_modified(dashboard_cache.etag)
     
+    cached = await dashboard_cache.get(_build_dashboard_stats)
+    if etag_matches(cached.etag, if_none_match):
+        return _not_modified(cached.etag)
     
-    recent_sessions = practice_service.get_recent_sessions(limit=10)
+    return Response(
+        content=cached.body,
+        media_type="application/json",
+        headers={"ETag": cached.etag, "Cache-Control": "no-cache"}
+    )
+
+
+def _not_modified(etag: str) -> Response:
+
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+async def _build_dashboard_stats() -> bytes:
+
+    async with AsyncSessionLocal() as db:
+        practice_service = PracticeService(db)
+        stats = await practice_service.get_statistics()
+        recent_sessions = await practice_service.get_recent_sessions(limit=10)
     
     
-    recent_sessions_data = [
-        PracticeResponse(
-            session_id=session.id,
-            word_id=session.word_id,
-            user_sentence=session.user_sentence,
-            score=session.score,
-            cefr_level=session.cefr_level,
-            feedback=session.feedback,
-            corrected_sentence=session.corrected_sentence,
-            practiced_at=session.practiced_at.isoformat()
-        )
-        for session in recent_sessions
-    ]
+    recent_sessions_data = [_to_response(session) for session in recent_sessions]
     
     return DashboardStats(
         total_sessions=stats["total_sessions"],
         average_score=stats["average_score"],
         most_common_level=stats["most_common_level"],
         recent_sessions=recent_sessions_data
+    ).model_dump_json().encode()
+
+
+
+def _history_filters(
+    word_id: Optional[int] = None,
+    cefr_level: Optional[str] = None,
+    min_score: Optional[float] = Query(None, ge=0, le=10),
+    max_score: Optional[float] = Query(None, ge=0, le=10),
+    since: Optional[datetime] = Query(None, description="Inclusive lower bound on practiced_at"),
+    until: Optional[datetime] = Query(None, description="Exclusive upper bound on practiced_at")
+) -> Dict:
+
+    return {
+        "word_id": word_id,
+        "cefr_level": cefr_level,
+        "min_score": min_score,
+        "max_score": max_score,
+        "since": since,
+        "until": until
+    }
+
+
+@router.get("/sessions", response_model=SessionHistoryPage)
+async def list_sessions(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    filters: Dict = Depends(_history_filters),
+    db: AsyncSession = Depends(get_db)
+):
+
+    sessions, has_more = await PracticeService(db).get_sessions_page(
+        limit=limit,
+        after=_decode_cursor(cursor) if cursor else None,
+        **filters
+    )
+    
+    return SessionHistoryPage(
+        items=[_to_response(session) for session in sessions],
+        next_cursor=_encode_cursor(sessions[-1]) if has_more else None
     )
+
+
+@router.get("/export")
+async def export_practice_sessions(
+    format: Literal["ndjson", "csv", "parquet"] = "ndjson",
+    gzip: bool = Query(False, description="gzip the stream as it is produced"),
+    filters: Dict = Depends(_history_filters)
+):
+
+    # The body outlives this handler, so the export opens its own session
+    # rather than borrowing the request-scoped one.
+    try:
+        chunks = await export_sessions(format, gzip=gzip, **filters)
+    except ExportUnavailableError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    filename = f"practice_sessions.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if gzip else MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/words", response_model=WordAnalyticsResponse)
+async def get_word_analytics(
+    days: Optional[int] = Query(None, ge=1, le=3650, description="Only the last N days; omit for all history"),
+    word_id: Optional[int] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+
+    return await WordAnalyticsService(db).summary(days=days, word_id=word_id, limit=limit)
+
+
+def _to_response(session: PracticeSession) -> PracticeResponse:
+
+    return PracticeResponse(
+        session_id=session.id,
+        word_id=session.word_id,
+        user_sentence=session.user_sentence,
+        score=session.score,
+        cefr_level=session.cefr_level,
+        feedback=session.feedback,
+        corrected_sentence=session.corrected_sentence,
+        practiced_at=session.practiced_at.isoformat()
+    )
+
+
+def _encode_cursor(session: PracticeSession) -> str:
+
+    raw = f"{session.practiced_at.isoformat()}|{session.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        practiced_at, session_id = raw.split("|")
+        return datetime.fromisoformat(practiced_at), int(session_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
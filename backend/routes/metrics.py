@@ -0,0 +1,43 @@
+"""
+════════════════════════════════════════════════════════════════
+Metrics Routes - Cache, limiter and breaker state for operators
+════════════════════════════════════════════════════════════════
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from services.telemetry import registry
+from services.dashboard_cache import dashboard_cache
+from services.invalidation import invalidation_bus
+from routes.practice import vocab_service, ai_service, word_pool, submit_workers, session_writer, idempotency_store
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/caches")
+async def get_cache_metrics():
+
+    return {
+        "vocab": vocab_service.cache_stats(),
+        "word_pool": word_pool.stats(),
+        "validation": ai_service.cache.stats(),
+        "similar_sentences": ai_service.similar.stats(),
+        "dashboard": dashboard_cache.stats(),
+        "idempotency": idempotency_store.stats()
+    }
+
+
+@router.get("/upstreams")
+async def get_upstream_metrics():
+
+    return {
+        "n8n": ai_service.upstream_stats(),
+        "submit_workers": submit_workers.stats(),
+        "session_writer": session_writer.stats(),
+        "cache_invalidation": invalidation_bus.stats()
+    }
@@ -3,25 +3,59 @@
 Practice Routes - Handle vocabulary practice and validation
 ════════════════════════════════════════════════════════════════
 """
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from db.database import get_db
-from schemas.practice import PracticeSubmit, PracticeResponse
+import json
+import asyncio
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import AsyncSessionLocal, get_db
+from schemas.practice import (
+    PracticeSubmit,
+    PracticeResponse,
+    PracticeBatchSubmit,
+    PracticeBatchItem,
+    PracticeBatchResponse,
+    PracticeJobAccepted,
+    PracticeJobStatus
+)
 from services.vocab_service import VocabService
 from services.ai_service import AIService
+from services.concurrency import OverloadedError
+from services.idempotency import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyReused,
+    create_idempotency_store,
+    request_fingerprint
+)
 from services.practice_service import PracticeService
+from services.session_writer import SessionWriteBuffer
+from services.submit_queue import SessionNotifier, create_submit_queue
+from services.submit_worker import SubmitWorkerPool
+from services.telemetry import submit_phase_duration, timed
+from services.word_pool import WordPool
 
 router = APIRouter(prefix="/api/practice", tags=["practice"])
 
 vocab_service = VocabService()
 ai_service = AIService()
+word_pool = WordPool(vocab_service)
+session_notifier = SessionNotifier()
+session_writer = SessionWriteBuffer()
+submit_workers = SubmitWorkerPool(create_submit_queue(), vocab_service, ai_service, session_notifier)
+idempotency_store = create_idempotency_store()
+
+TERMINAL_STATUSES = ("completed", "failed")
 
 
 @router.get("/word")
-async def get_random_word(difficulty: str = None):
+async def get_random_word(request: Request, difficulty: str = None):
 
     try:
-        word = await vocab_service.get_random_word(difficulty)
+        caller = request.headers.get("X-Client-Id") or (request.client.host if request.client else None)
+        word = word_pool.take(difficulty, caller)
+        if word is None:
+            word = await vocab_service.get_random_word(difficulty)
         if not word:
             raise HTTPException(status_code=404, detail="No words found")
         return word
@@ -29,35 +63,89 @@ async def get_random_word(difficulty: str = None):
         raise HTTPException(status_code=500, detail=f"Failed to fetch word: {str(e)}")
 
 
-@router.post("/submit", response_model=PracticeResponse)
+@router.post(
+    "/submit",
+    response_model=PracticeResponse,
+    responses={202: {"model": PracticeJobAccepted}}
+)
 async def submit_practice(
     submission: PracticeSubmit,
-    db: Session = Depends(get_db)
+    mode: str = Query("sync", pattern="^(sync|async)$"),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    db: AsyncSession = Depends(get_db)
 ):
+    """With an ``Idempotency-Key`` header, retries of the same submission
+    do not validate or save it again: a retry while the first request is
+    running waits for its response, a later one gets the stored response
+    (marked ``Idempotent-Replayed: true``). Reusing a key for a different
+    submission is a 422."""
+    
+    if not idempotency_key:
+        return await _submit(submission, mode, db)
+    
+    async def submit_once():
+        # Retries on the same key share this task, which can outlive this
+        # request, so it opens its own session instead of the request-scoped one.
+        async with AsyncSessionLocal() as own_db:
+            response = await _submit(submission, mode, own_db)
+        if isinstance(response, JSONResponse):
+            return response.status_code, json.loads(response.body)
+        return 200, response.model_dump(mode="json")
+    
+    try:
+        status_code, body, replayed = await idempotency_store.run(
+            f"submit:{idempotency_key}",
+            request_fingerprint({"mode": mode, **submission.model_dump()}),
+            submit_once
+        )
+    except IdempotencyKeyReused as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IdempotencyKeyInProgress as e:
+        raise HTTPException(
+            status_code=409,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(e.retry_after)))}
+        )
+    
+    return JSONResponse(
+        status_code=status_code,
+        content=body,
+        headers={"Idempotent-Replayed": "true"} if replayed else None
+    )
+
+
+async def _submit(submission: PracticeSubmit, mode: str, db: AsyncSession):
     
     try:
         
-        word = await vocab_service.get_word_by_id(submission.word_id)
+        with timed(submit_phase_duration, "vocab_lookup"):
+            word = await vocab_service.get_word_by_id(submission.word_id)
         if not word:
             raise HTTPException(status_code=404, detail="Word not found")
         
+        if mode == "async":
+            return await _submit_async(submission, db)
         
-        validation_result = await ai_service.validate_sentence(
-            word=word["word"],
-            definition=word["definition"],
-            sentence=submission.user_sentence
-        )
+        with timed(submit_phase_duration, "validation"):
+            validation_result = await ai_service.validate_sentence(
+                word=word["word"],
+                definition=word["definition"],
+                sentence=submission.user_sentence,
+                word_id=submission.word_id,
+                difficulty=word.get("difficulty_level")
+            )
         
         
-        practice_service = PracticeService(db)
-        session = practice_service.save_session(
-            word_id=submission.word_id,
-            user_sentence=submission.user_sentence,
-            score=validation_result["score"],
-            cefr_level=validation_result["cefr_level"],
-            feedback=validation_result["feedback"],
-            corrected_sentence=validation_result.get("corrected_sentence")
-        )
+        practice_service = PracticeService(db, writer=session_writer)
+        with timed(submit_phase_duration, "db_save"):
+            session = await practice_service.save_session(
+                word_id=submission.word_id,
+                user_sentence=submission.user_sentence,
+                score=validation_result["score"],
+                cefr_level=validation_result["cefr_level"],
+                feedback=validation_result["feedback"],
+                corrected_sentence=validation_result.get("corrected_sentence")
+            )
         
         return PracticeResponse(
             session_id=session.id,
@@ -72,5 +160,252 @@ async def submit_practice(
     
     except HTTPException:
         raise
+    except OverloadedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Validation service is busy, please retry shortly",
+            headers={"Retry-After": str(max(1, round(e.retry_after)))}
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to process submission: {str(e)}")
+
+
+
+@router.post(
+    "/submit/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}}
+)
+async def submit_practice_stream(submission: PracticeSubmit):
+    """Server-Sent Events variant of ``/submit``: ``assessment`` with the
+    score and CEFR level as soon as n8n knows them, ``feedback`` deltas as
+    the text is generated, then ``result`` (a ``PracticeResponse``) once the
+    session is saved, or ``error`` if the stream could not be completed."""
+    
+    try:
+        word = await vocab_service.get_word_by_id(submission.word_id)
+        if not word:
+            raise HTTPException(status_code=404, detail="Word not found")
+        
+        events = ai_service.stream_validation(
+            word=word["word"],
+            definition=word["definition"],
+            sentence=submission.user_sentence,
+            word_id=submission.word_id,
+            difficulty=word.get("difficulty_level")
+        )
+        # Wait for the first event here so a full limiter is still a 503,
+        # not an error event inside a 200.
+        first = await events.__anext__()
+    
+    except HTTPException:
+        raise
+    except OverloadedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Validation service is busy, please retry shortly",
+            headers={"Retry-After": str(max(1, round(e.retry_after)))}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to process submission: {str(e)}")
+    
+    return StreamingResponse(
+        _stream_submit_events(submission, first, events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _stream_submit_events(submission: PracticeSubmit, first, events):
+
+    validation = None
+    try:
+        event, data = first
+        while True:
+            if event == "result":
+                validation = data
+            else:
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+            try:
+                event, data = await events.__anext__()
+            except StopAsyncIteration:
+                break
+        
+        # The request's own session is closed once the response starts, so
+        # saving at the end of the stream opens its own.
+        async with AsyncSessionLocal() as db:
+            session = await PracticeService(db, writer=session_writer).save_session(
+                word_id=submission.word_id,
+                user_sentence=submission.user_sentence,
+                score=validation["score"],
+                cefr_level=validation["cefr_level"],
+                feedback=validation["feedback"],
+                corrected_sentence=validation.get("corrected_sentence")
+            )
+        result = PracticeResponse(
+            session_id=session.id,
+            word_id=submission.word_id,
+            user_sentence=submission.user_sentence,
+            score=validation["score"],
+            cefr_level=validation["cefr_level"],
+            feedback=validation["feedback"],
+            corrected_sentence=validation.get("corrected_sentence"),
+            practiced_at=session.practiced_at.isoformat()
+        )
+        yield f"event: result\ndata: {result.model_dump_json()}\n\n"
+    
+    except Exception as e:
+        error = {"detail": f"Failed to process submission: {str(e)}"}
+        yield f"event: error\ndata: {json.dumps(error)}\n\n"
+    finally:
+        await events.aclose()
+
+
+@router.post("/submit/batch", response_model=PracticeBatchResponse)
+async def submit_practice_batch(
+    batch: PracticeBatchSubmit,
+    db: AsyncSession = Depends(get_db)
+):
+    
+    try:
+        words = await vocab_service.get_words_by_ids(item.word_id for item in batch.items)
+        
+        results = [PracticeBatchItem(index=i, status_code=200) for i in range(len(batch.items))]
+        to_validate = []
+        for index, item in enumerate(batch.items):
+            word = words.get(item.word_id)
+            if not word:
+                results[index].status_code = 404
+                results[index].error = "Word not found"
+                continue
+            to_validate.append((index, item, word))
+        
+        validations = await ai_service.validate_batch([
+            {
+                "word": word["word"],
+                "definition": word["definition"],
+                "sentence": item.user_sentence,
+                "word_id": item.word_id,
+                "difficulty": word.get("difficulty_level")
+            }
+            for _, item, word in to_validate
+        ])
+        
+        to_save = []
+        for (index, item, _), validation in zip(to_validate, validations):
+            if isinstance(validation, OverloadedError):
+                results[index].status_code = 503
+                results[index].error = "Validation service is busy, please retry shortly"
+                continue
+            to_save.append((index, {
+                "word_id": item.word_id,
+                "user_sentence": item.user_sentence,
+                "score": validation["score"],
+                "cefr_level": validation["cefr_level"],
+                "feedback": validation["feedback"],
+                "corrected_sentence": validation.get("corrected_sentence")
+            }))
+        
+        if to_save:
+            sessions = await PracticeService(db).save_sessions([data for _, data in to_save])
+            for (index, _), session in zip(to_save, sessions):
+                results[index].result = PracticeResponse(
+                    session_id=session.id,
+                    word_id=session.word_id,
+                    user_sentence=session.user_sentence,
+                    score=session.score,
+                    cefr_level=session.cefr_level,
+                    feedback=session.feedback,
+                    corrected_sentence=session.corrected_sentence,
+                    practiced_at=session.practiced_at.isoformat()
+                )
+        
+        return PracticeBatchResponse(results=results)
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to process batch submission: {str(e)}")
+
+
+async def _submit_async(submission: PracticeSubmit, db: AsyncSession) -> JSONResponse:
+
+    practice_service = PracticeService(db)
+    session = await practice_service.create_pending_session(
+        word_id=submission.word_id,
+        user_sentence=submission.user_sentence
+    )
+    await submit_workers.queue.put(session.id)
+    
+    accepted = PracticeJobAccepted(
+        session_id=session.id,
+        status=session.status,
+        status_url=f"{router.prefix}/sessions/{session.id}",
+        stream_url=f"{router.prefix}/sessions/{session.id}/stream"
+    )
+    return JSONResponse(status_code=202, content=accepted.model_dump())
+
+
+def _job_status(session) -> PracticeJobStatus:
+
+    status = PracticeJobStatus(session_id=session.id, status=session.status)
+    if session.status == "completed":
+        status.result = PracticeResponse(
+            session_id=session.id,
+            word_id=session.word_id,
+            user_sentence=session.user_sentence,
+            score=session.score,
+            cefr_level=session.cefr_level,
+            feedback=session.feedback,
+            corrected_sentence=session.corrected_sentence,
+            practiced_at=session.practiced_at.isoformat()
+        )
+    elif session.status == "failed":
+        status.error = session.feedback
+    return status
+
+
+async def _load_job_status(session_id: int):
+
+    async with AsyncSessionLocal() as db:
+        session = await PracticeService(db).get_session(session_id)
+        return _job_status(session) if session else None
+
+
+@router.get("/sessions/{session_id}", response_model=PracticeJobStatus)
+async def get_session_status(session_id: int, db: AsyncSession = Depends(get_db)):
+
+    session = await PracticeService(db).get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return _job_status(session)
+
+
+@router.get("/sessions/{session_id}/stream")
+async def stream_session_status(session_id: int, timeout: float = Query(120.0, gt=0, le=600)):
+
+    status = await _load_job_status(session_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    async def events():
+        current = status
+        deadline = asyncio.get_running_loop().time() + timeout
+        yield f"event: status\ndata: {current.model_dump_json()}\n\n"
+        while current.status not in TERMINAL_STATUSES:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                yield f"event: timeout\ndata: {json.dumps({'session_id': session_id})}\n\n"
+                return
+            # Local workers wake us immediately; the poll covers jobs finished on other replicas.
+            await session_notifier.wait(session_id, min(remaining, 1.0))
+            latest = await _load_job_status(session_id)
+            if latest is None:
+                return
+            if latest.status != current.status:
+                current = latest
+                yield f"event: status\ndata: {current.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
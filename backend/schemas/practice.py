@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
-from typing import Optional
-from datetime import datetime
+from typing import Dict, Optional
+from datetime import date, datetime
 
 
 
@@ -21,6 +21,12 @@ class PracticeSubmit(BaseModel):
 
 
 
+class PracticeBatchSubmit(BaseModel):
+    
+    items: list[PracticeSubmit] = Field(..., min_length=1, max_length=100, description="Submissions to grade together")
+
+
+
 class ValidationResult(BaseModel):
     
     score: float = Field(..., ge=0, le=10, description="Score from 0-10")
@@ -64,6 +70,17 @@ class PracticeResponse(BaseModel):
             }
         }
 
+class PracticeBatchItem(BaseModel):
+    
+    index: int
+    status_code: int = Field(..., description="HTTP status this item would have had as a single submit")
+    result: Optional[PracticeResponse] = None
+    error: Optional[str] = None
+
+class PracticeBatchResponse(BaseModel):
+    
+    results: list[PracticeBatchItem]
+
 class DashboardStats(BaseModel):
     
     total_sessions: int
@@ -79,4 +96,88 @@ class DashboardStats(BaseModel):
                 "most_common_level": "B1",
                 "recent_sessions": []
             }
-        }
\ No newline at end of file
+        }
+
+class SessionHistoryPage(BaseModel):
+    
+    items: list[PracticeResponse]
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page; null on the last page")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [],
+                "next_cursor": "MjAyNS0xMi0xMlQxMDowMDowMHwxMjM"
+            }
+        }
+
+class WordAnalytics(BaseModel):
+    
+    word_id: int
+    word: Optional[str] = None
+    difficulty_level: str
+    attempts: int
+    average_score: float
+    p50_score: Optional[float]
+    p90_score: Optional[float]
+    cefr_distribution: Dict[str, int]
+
+class DifficultyAnalytics(BaseModel):
+    
+    difficulty_level: str
+    words: int
+    attempts: int
+    average_score: float
+    p50_score: Optional[float]
+    p90_score: Optional[float]
+    cefr_distribution: Dict[str, int]
+
+class WordAnalyticsResponse(BaseModel):
+    
+    since: Optional[date] = Field(None, description="First day included; null means all history")
+    words: list[WordAnalytics] = Field(..., description="Lowest average score first")
+    difficulties: list[DifficultyAnalytics]
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "since": "2025-12-01",
+                "words": [
+                    {
+                        "word_id": 12,
+                        "word": "ubiquitous",
+                        "difficulty_level": "Advanced",
+                        "attempts": 40,
+                        "average_score": 5.9,
+                        "p50_score": 6.0,
+                        "p90_score": 8.0,
+                        "cefr_distribution": {"A2": 9, "B1": 25, "B2": 6}
+                    }
+                ],
+                "difficulties": []
+            }
+        }
+
+class PracticeJobAccepted(BaseModel):
+    
+    session_id: int
+    status: str
+    status_url: str
+    stream_url: str
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "session_id": 124,
+                "status": "pending",
+                "status_url": "/api/practice/sessions/124",
+                "stream_url": "/api/practice/sessions/124/stream"
+            }
+        }
+
+class PracticeJobStatus(BaseModel):
+    
+    session_id: int
+    status: str = Field(..., description="pending, processing, completed or failed")
+    result: Optional[PracticeResponse] = None
+    error: Optional[str] = None
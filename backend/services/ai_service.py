@@ -1,8 +1,20 @@
 
 import os
+import json
+import time
 import httpx
+import asyncio
 import logging
-from typing import Dict
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+from services.cache import SingleFlight
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.concurrency import ConcurrencyLimiter, OverloadedError
+from services.http_client import http_clients
+from services.latency import AdaptiveTimeout, LatencyTracker
+from services.model_router import ModelRouter
+from services.prevalidator import PreValidator
+from services.similar_sentences import SimilarSentenceIndex
+from services.validation_cache import ValidationCache, validation_key
 
 logger = logging.getLogger(__name__)
 
@@ -14,15 +26,65 @@ class AIService:
             "N8N_WEBHOOK_URL",
             "http://n8n:5678/webhook/validate-sentence"
         )
-        self.timeout = 60.0
+        # Per-difficulty webhooks and hedging; unrouted calls use webhook_url.
+        self.router = ModelRouter()
+        self.timeout = http_clients.config("n8n").timeout
+        self.cache = ValidationCache()
+        # Clear failures are scored locally and never reach n8n (or the cache).
+        self.prevalidator = PreValidator()
+        # Near-duplicates of graded sentences reuse their verdict (needs word_id).
+        self.similar = SimilarSentenceIndex()
+        self._inflight = SingleFlight()
+        self.limiter = ConcurrencyLimiter(
+            "n8n",
+            max_concurrency=int(os.getenv("N8N_MAX_CONCURRENCY", 8)),
+            max_queue=int(os.getenv("N8N_MAX_QUEUE", 32)),
+            queue_timeout=float(os.getenv("N8N_QUEUE_TIMEOUT", 10.0)),
+            retry_after=float(os.getenv("N8N_RETRY_AFTER", 2.0))
+        )
+        self.breaker = CircuitBreaker(
+            "n8n",
+            failure_threshold=int(os.getenv("N8N_BREAKER_FAILURES", 5)),
+            recovery_timeout=float(os.getenv("N8N_BREAKER_RECOVERY", 30.0))
+        )
+        self.latency = LatencyTracker()
+        # self.timeout is now the ceiling; the effective timeout follows p99 of recent calls.
+        self.adaptive_timeout = AdaptiveTimeout(
+            self.latency,
+            minimum=float(os.getenv("N8N_TIMEOUT_MIN", 5.0)),
+            maximum=self.timeout,
+            multiplier=float(os.getenv("N8N_TIMEOUT_P99_MULTIPLIER", 3.0))
+        )
+        # Optional webhook taking {"items": [...]} and answering with results in the same order.
+        self.batch_webhook_url = os.getenv("N8N_BATCH_WEBHOOK_URL")
+        self.batch_size = int(os.getenv("N8N_BATCH_SIZE", 10))
+        self.batch_parallelism = int(os.getenv("N8N_BATCH_PARALLELISM", 4))
+        # Optional webhook answering with NDJSON chunks as the LLM generates them.
+        self.stream_webhook_url = os.getenv("N8N_STREAM_WEBHOOK_URL")
     
     async def validate_sentence(
         self,
         word: str,
         definition: str,
-        sentence: str
+        sentence: str,
+        word_id: Optional[int] = None,
+        difficulty: Optional[str] = None
     ) -> Dict:
         
+        rejected = self.prevalidator.check(word, sentence)
+        if rejected is not None:
+            return self._to_validation(rejected, sentence)
+        
+        key = validation_key(word, sentence)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            logger.info(f"Validation cache hit: {key[:12]}")
+            return self._to_validation(cached, sentence)
+        
+        similar = self._similar(word_id, sentence)
+        if similar is not None:
+            return self._to_validation(similar, sentence)
+        
         payload = {
             "word": word,
             "definition": definition,
@@ -32,41 +94,374 @@ class AIService:
         logger.info(f"Sending to n8n: {payload}")
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    self.webhook_url,
-                    json=payload
-                )
-                
-                logger.info(f"n8n response status: {response.status_code}")
-                response.raise_for_status()
-                data = response.json()
-                logger.info(f"n8n response data: {data}")
-                
-                if isinstance(data, list) and len(data) > 0:
-                    result = data[0]
+            # Identical in-flight validations share one webhook call.
+            result = await self._inflight.do(key, lambda: self._fetch_validation(key, word, payload, difficulty))
+            if word_id is not None:
+                self.similar.add(word_id, sentence, result)
+            return self._to_validation(result, sentence)
+        
+        except OverloadedError:
+            raise
+        
+        except Exception as e:
+            return self._fallback_for(e, sentence)
+    
+    async def validate_batch(self, items: List[Dict]) -> List[Union[Dict, OverloadedError]]:
+        """Validate many ``{"word", "definition", "sentence"}`` items (plus
+        an optional ``word_id`` for near-duplicate reuse and ``difficulty``
+        for routing).
+
+        Results come back in input order. Pre-validator rejections, cache
+        hits and near-duplicates are answered locally, repeated sentences
+        are sent once, and the rest go upstream in micro-batches of ``batch_size`` with at most ``batch_parallelism``
+        batches in flight. An item that could not get a webhook slot gets
+        the ``OverloadedError`` in its position instead of a result.
+        """
+        
+        results: List = [None] * len(items)
+        pending: Dict[str, List[int]] = {}
+        for index, item in enumerate(items):
+            rejected = self.prevalidator.check(item["word"], item["sentence"])
+            if rejected is not None:
+                results[index] = self._to_validation(rejected, item["sentence"])
+                continue
+            key = validation_key(item["word"], item["sentence"])
+            cached = await self.cache.get(key)
+            if cached is None:
+                cached = self._similar(item.get("word_id"), item["sentence"])
+            if cached is not None:
+                results[index] = self._to_validation(cached, item["sentence"])
+            else:
+                pending.setdefault(key, []).append(index)
+        
+        keys = list(pending)
+        chunks = [keys[i:i + self.batch_size] for i in range(0, len(keys), self.batch_size)]
+        semaphore = asyncio.Semaphore(self.batch_parallelism)
+        
+        async def run(chunk: List[str]) -> None:
+            async with semaphore:
+                jobs = [(key, items[pending[key][0]]) for key in chunk]
+                if self.batch_webhook_url:
+                    try:
+                        outcomes = await self._fetch_batch(jobs)
+                    except Exception as e:
+                        outcomes = [e] * len(jobs)
                 else:
-                    result = data
-                
-                return {
-                    "score": float(result.get("score", 7.0)),
-                    "cefr_level": str(result.get("cefr_level", "B1")).strip(),
-                    "is_correct": bool(result.get("is_correct", True)),
-                    "feedback": str(result.get("feedback", "Good attempt!")),
-                    "corrected_sentence": result.get("corrected_sentence") or sentence
-                }
-        
-        except httpx.TimeoutException as e:
-            logger.error(f"n8n timeout: {e}")
+                    outcomes = await asyncio.gather(*(
+                        self._inflight.do(key, lambda key=key, item=item: self._fetch_validation(
+                            key, item["word"], self._payload(item), item.get("difficulty")
+                        ))
+                        for key, item in jobs
+                    ), return_exceptions=True)
+            
+            for key, outcome in zip(chunk, outcomes):
+                for index in pending[key]:
+                    sentence = items[index]["sentence"]
+                    if isinstance(outcome, OverloadedError):
+                        results[index] = outcome
+                    elif isinstance(outcome, BaseException):
+                        results[index] = self._fallback_for(outcome, sentence)
+                    else:
+                        results[index] = self._to_validation(outcome, sentence)
+                        if items[index].get("word_id") is not None:
+                            self.similar.add(items[index]["word_id"], sentence, outcome)
+        
+        await asyncio.gather(*(run(chunk) for chunk in chunks))
+        return results
+    
+    async def stream_validation(
+        self,
+        word: str,
+        definition: str,
+        sentence: str,
+        word_id: Optional[int] = None,
+        difficulty: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        """Validate ``sentence`` as ``(event, data)`` pairs: one ``assessment``
+        (score, CEFR level, is_correct) as soon as it is known, ``feedback``
+        text deltas as they are generated, and a final ``result`` with the
+        complete validation.
+
+        Only calls that reach n8n with ``stream_webhook_url`` set actually
+        stream; pre-validator rejections, cache hits, near-duplicates and
+        plain webhook calls are replayed as the same three events. Failures before the
+        assessment fall back like ``validate_sentence``; a failure after it
+        is raised, since part of the answer has already been sent.
+        """
+        
+        validation = self.prevalidator.check(word, sentence)
+        key = validation_key(word, sentence)
+        if validation is None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                logger.info(f"Validation cache hit: {key[:12]}")
+                validation = cached
+            else:
+                validation = self._similar(word_id, sentence)
+        
+        payload = {
+            "word": word,
+            "definition": definition,
+            "sentence": sentence
+        }
+        
+        if validation is None and self.stream_webhook_url:
+            async for event in self._fetch_stream(key, word, payload, sentence, word_id):
+                yield event
+            return
+        
+        if validation is None:
+            try:
+                validation = await self._inflight.do(
+                    key, lambda: self._fetch_validation(key, word, payload, difficulty)
+                )
+                if word_id is not None:
+                    self.similar.add(word_id, sentence, validation)
+            except OverloadedError:
+                raise
+            except Exception as e:
+                validation = self._fallback_for(e, sentence)
+        
+        for event in self._as_events(self._to_validation(validation, sentence)):
+            yield event
+    
+    async def _fetch_stream(
+        self,
+        key: str,
+        word: str,
+        payload: Dict,
+        sentence: str,
+        word_id: Optional[int]
+    ) -> AsyncIterator[Tuple[str, Dict]]:
+        
+        fields: Dict = {}
+        feedback: List[str] = []
+        assessed = False
+        async with self.limiter.acquire():
+            try:
+                self.breaker.before_call()
+                started = time.perf_counter()
+                try:
+                    async for chunk in self._call_stream_webhook(payload, self.adaptive_timeout.current()):
+                        delta = chunk.pop("delta", None)
+                        fields.update(chunk)
+                        if not assessed and "score" in fields and "cefr_level" in fields:
+                            assessed = True
+                            yield "assessment", self._assessment(self._parse_result(fields))
+                        if delta:
+                            feedback.append(delta)
+                            if assessed:
+                                yield "feedback", {"delta": delta}
+                except (GeneratorExit, asyncio.CancelledError):
+                    # The client went away; n8n did nothing wrong, but a half-open
+                    # probe must not stay claimed forever.
+                    self.breaker.release_probe()
+                    raise
+                except Exception:
+                    self.breaker.record_failure()
+                    raise
+            except Exception as e:
+                if assessed:
+                    raise
+                for event in self._as_events(self._fallback_for(e, sentence)):
+                    yield event
+                return
+            elapsed = time.perf_counter() - started
+            self.breaker.record_success()
+            self.latency.record(elapsed)
+            self.cache.record_upstream_latency(elapsed)
+        
+        if feedback:
+            fields["feedback"] = "".join(feedback)
+        result = self._parse_result(fields)
+        await self.cache.set(key, word, result)
+        if word_id is not None:
+            self.similar.add(word_id, sentence, result)
+        
+        if not assessed:
+            # Nothing was streamed (e.g. an upstream that answers in one chunk).
+            for event in self._as_events(self._to_validation(result, sentence)):
+                yield event
+            return
+        yield "result", self._to_validation(result, sentence)
+    
+    async def _call_stream_webhook(self, payload: Dict, timeout: float) -> AsyncIterator[Dict]:
+        """POST to the streaming webhook and yield its NDJSON chunks. Each
+        chunk may carry any of ``score``, ``cefr_level``, ``is_correct`` and
+        ``corrected_sentence``, and ``delta`` with the next piece of feedback."""
+        
+        client = http_clients.get("n8n")
+        async with client.stream(
+            "POST",
+            self.stream_webhook_url,
+            json=payload,
+            timeout=httpx.Timeout(timeout, connect=http_clients.config("n8n").connect_timeout)
+        ) as response:
+            logger.info(f"n8n stream response status: {response.status_code}")
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line.strip():
+                    yield json.loads(line)
+    
+    def _assessment(self, result: Dict) -> Dict:
+        
+        return {
+            "score": result["score"],
+            "cefr_level": result["cefr_level"],
+            "is_correct": result["is_correct"]
+        }
+    
+    def _as_events(self, validation: Dict) -> List[Tuple[str, Dict]]:
+        
+        return [
+            ("assessment", self._assessment(validation)),
+            ("feedback", {"delta": validation["feedback"]}),
+            ("result", validation)
+        ]
+    
+    async def _fetch_validation(self, key: str, word: str, payload: Dict, difficulty: Optional[str] = None) -> Dict:
+        
+        async with self.limiter.acquire():
+            self.breaker.before_call()
+            started = time.perf_counter()
+            timeout = self.adaptive_timeout.current()
+            try:
+                result = await self.router.call(
+                    difficulty,
+                    lambda url: self._call_webhook(payload, timeout, url),
+                    self.webhook_url
+                )
+            except BaseException:
+                self.breaker.record_failure()
+                raise
+            elapsed = time.perf_counter() - started
+            self.breaker.record_success()
+            self.latency.record(elapsed)
+            self.cache.record_upstream_latency(elapsed)
+        
+        await self.cache.set(key, word, result)
+        return result
+    
+    async def _fetch_batch(self, jobs: List) -> List[Dict]:
+        
+        async with self.limiter.acquire():
+            self.breaker.before_call()
+            try:
+                results = await self._call_batch_webhook([self._payload(item) for _, item in jobs])
+            except BaseException:
+                self.breaker.record_failure()
+                raise
+            self.breaker.record_success()
+        
+        for (key, item), result in zip(jobs, results):
+            await self.cache.set(key, item["word"], result)
+        return results
+    
+    async def _call_batch_webhook(self, payloads: List[Dict]) -> List[Dict]:
+        
+        client = http_clients.get("n8n")
+        response = await client.post(
+            self.batch_webhook_url,
+            json={"items": payloads},
+            timeout=httpx.Timeout(self.timeout, connect=http_clients.config("n8n").connect_timeout)
+        )
+        
+        logger.info(f"n8n batch response status: {response.status_code} ({len(payloads)} items)")
+        response.raise_for_status()
+        data = response.json()
+        if isinstance(data, dict):
+            data = data.get("results", [])
+        if not isinstance(data, list) or len(data) != len(payloads):
+            raise ValueError(f"batch webhook returned {len(data) if isinstance(data, list) else 'no'} results for {len(payloads)} items")
+        
+        return [self._parse_result(result) for result in data]
+    
+    def _payload(self, item: Dict) -> Dict:
+        
+        return {
+            "word": item["word"],
+            "definition": item["definition"],
+            "sentence": item["sentence"]
+        }
+    
+    async def _call_webhook(self, payload: Dict, timeout: float, url: Optional[str] = None) -> Dict:
+        
+        client = http_clients.get("n8n")
+        response = await client.post(
+            url or self.webhook_url,
+            json=payload,
+            timeout=httpx.Timeout(timeout, connect=http_clients.config("n8n").connect_timeout)
+        )
+        
+        logger.info(f"n8n response status: {response.status_code}")
+        response.raise_for_status()
+        data = response.json()
+        logger.info(f"n8n response data: {data}")
+        
+        if isinstance(data, list) and len(data) > 0:
+            result = data[0]
+        else:
+            result = data
+        
+        return self._parse_result(result)
+    
+    def _parse_result(self, result: Dict) -> Dict:
+        
+        return {
+            "score": float(result.get("score", 7.0)),
+            "cefr_level": str(result.get("cefr_level", "B1")).strip(),
+            "is_correct": bool(result.get("is_correct", True)),
+            "feedback": str(result.get("feedback", "Good attempt!")),
+            "corrected_sentence": result.get("corrected_sentence") or None
+        }
+    
+    def _similar(self, word_id: Optional[int], sentence: str) -> Optional[Dict]:
+        
+        if word_id is None:
+            return None
+        found = self.similar.lookup(word_id, sentence)
+        if found is None:
+            return None
+        result, similarity = found
+        logger.info(f"Reusing verdict of a near-duplicate sentence (word {word_id}, similarity {similarity})")
+        return result
+    
+    def _to_validation(self, result: Dict, sentence: str) -> Dict:
+        
+        return {
+            **result,
+            "corrected_sentence": result.get("corrected_sentence") or sentence
+        }
+    
+    def upstream_stats(self) -> Dict:
+        
+        return {
+            "limiter": self.limiter.stats(),
+            "coalesced": self._inflight.coalesced,
+            "in_flight": self._inflight.in_flight(),
+            "breaker": self.breaker.stats(),
+            "latency": self.latency.stats(),
+            "timeout": self.adaptive_timeout.current(),
+            "routes": self.router.stats(),
+            "prevalidator": self.prevalidator.stats(self.latency.percentile(50))
+        }
+    
+    def _fallback_for(self, error: BaseException, sentence: str) -> Dict:
+        
+        if isinstance(error, CircuitOpenError):
+            logger.warning(f"{error}, using fallback")
+            return self._get_mock_validation(sentence, "service unavailable")
+        
+        if isinstance(error, httpx.TimeoutException):
+            logger.error(f"n8n timeout: {error}")
             return self._get_mock_validation(sentence, "timeout")
         
-        except httpx.HTTPStatusError as e:
-            logger.error(f"n8n HTTP error: {e.response.status_code}")
-            return self._get_mock_validation(sentence, f"error {e.response.status_code}")
+        if isinstance(error, httpx.HTTPStatusError):
+            logger.error(f"n8n HTTP error: {error.response.status_code}")
+            return self._get_mock_validation(sentence, f"error {error.response.status_code}")
         
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            return self._get_mock_validation(sentence, "system error")
+        logger.error(f"Unexpected error: {error}")
+        return self._get_mock_validation(sentence, "system error")
     
     def _get_mock_validation(self, sentence: str, error_msg: str = None) -> Dict:
         
@@ -81,5 +476,3 @@ class AIService:
             "feedback": feedback,
             "corrected_sentence": sentence
         }
-
-ai_service = AIService()
\ No newline at end of file
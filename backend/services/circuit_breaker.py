@@ -0,0 +1,102 @@
+
+import time
+import logging
+from collections import Counter, deque
+from datetime import datetime
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose breaker is open."""
+
+
+class CircuitBreaker:
+    """Closed / open / half-open circuit breaker for one upstream.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    ``before_call`` raises ``CircuitOpenError`` without touching the
+    network. Once ``recovery_timeout`` has passed it lets up to
+    ``half_open_max_calls`` probes through; a successful probe closes it,
+    a failed one opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self.short_circuited = 0
+        self.transitions: Counter = Counter()
+        self.recent_transitions = deque(maxlen=20)
+
+    def before_call(self) -> None:
+        if self.state == OPEN:
+            if self._clock() - self._opened_at < self.recovery_timeout:
+                self.short_circuited += 1
+                raise CircuitOpenError(f"{self.name} circuit is open")
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probes >= self.half_open_max_calls:
+                self.short_circuited += 1
+                raise CircuitOpenError(f"{self.name} circuit is half-open")
+            self._probes += 1
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe whose call ended without an outcome."""
+        if self.state == HALF_OPEN and self._probes > 0:
+            self._probes -= 1
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        if self.state != CLOSED:
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        previous, self.state = self.state, state
+        self._probes = 0
+        if state == OPEN:
+            self._opened_at = self._clock()
+
+        self.transitions[f"{previous}->{state}"] += 1
+        self.recent_transitions.append({
+            "from": previous,
+            "to": state,
+            "at": datetime.utcnow().isoformat()
+        })
+        logger.warning(f"{self.name} circuit breaker: {previous} -> {state}")
+
+    def stats(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "short_circuited": self.short_circuited,
+            "transitions": dict(self.transitions),
+            "recent_transitions": list(self.recent_transitions)
+        }
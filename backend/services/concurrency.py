@@ -0,0 +1,76 @@
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+
+class OverloadedError(Exception):
+    """Raised when a limiter's wait queue is full; callers should answer 503."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is overloaded, retry after {retry_after:g}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """Caps concurrent calls to an upstream with a bounded wait queue.
+
+    Up to ``max_concurrency`` callers run at once and up to ``max_queue``
+    more wait for a slot. Anyone beyond that, or anyone who waits longer
+    than ``queue_timeout``, gets ``OverloadedError`` straight away instead
+    of piling up another coroutine.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: Optional[float] = None,
+        retry_after: float = 1.0
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        if not self._semaphore.locked():
+            # A free slot is taken synchronously, so a burst cannot slip past
+            # the queue check while acquisitions are still pending.
+            await self._semaphore.acquire()
+        elif self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise OverloadedError(self.name, self.retry_after)
+        else:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise OverloadedError(self.name, self.retry_after)
+            finally:
+                self.waiting -= 1
+
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> Dict:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "rejected": self.rejected
+        }
@@ -0,0 +1,139 @@
+
+import os
+import time
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional
+from services.cache import SingleFlight
+from services.invalidation import invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    return etag in tags or "*" in tags
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    version: int
+    etag: str
+    body: bytes
+    built_at: float
+
+
+class DashboardCache:
+    """Versioned cache of the serialized ``/api/dashboard/stats`` body.
+
+    Every committed session write publishes a ``dashboard`` invalidation,
+    which bumps ``version`` here and, through the invalidation bus, on
+    every other worker. The ETag is a hash of the body, so every worker
+    serving the same stats hands out the same ETag, and a poll whose
+    ``If-None-Match`` matches the current body is answered without touching
+    the database or the serializer, whichever worker it lands on.
+
+    After an invalidation the previous body is still served for up to
+    ``stale_ttl`` seconds while a single background rebuild runs
+    (stale-while-revalidate); past that, callers wait on the same rebuild
+    instead of each querying the database. ``max_age`` bounds how long a
+    body is trusted without any local invalidation, which covers writes
+    made by other replicas if the bus is down or disabled.
+    """
+
+    def __init__(
+        self,
+        stale_ttl: Optional[float] = None,
+        max_age: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.stale_ttl = stale_ttl if stale_ttl is not None else float(os.getenv("DASHBOARD_STALE_TTL", 2.0))
+        self.max_age = max_age if max_age is not None else float(os.getenv("DASHBOARD_CACHE_MAX_AGE", 30.0))
+        self._clock = clock
+        self.version = 0
+        self._invalidated_at = 0.0
+        self._entry: Optional[CachedBody] = None
+        self._rebuild = SingleFlight()
+        self.hits = 0
+        self.stale_hits = 0
+        self.builds = 0
+        self.not_modified = 0
+
+    @staticmethod
+    def etag_for(body: bytes) -> str:
+        return f'W/"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self._entry.etag if self._entry is not None else None
+
+    def invalidate(self) -> None:
+        self.version += 1
+        self._invalidated_at = self._clock()
+
+    def _fresh(self, entry: Optional[CachedBody]) -> bool:
+        return (
+            entry is not None
+            and entry.version == self.version
+            and self._clock() - entry.built_at < self.max_age
+        )
+
+    def not_modified_since(self, if_none_match: Optional[str]) -> bool:
+        """True when the client's ETag is still current; no DB work needed."""
+
+        entry = self._entry
+        if self._fresh(entry) and etag_matches(entry.etag, if_none_match):
+            self.not_modified += 1
+            return True
+        return False
+
+    async def get(self, build: Callable[[], Awaitable[bytes]]) -> CachedBody:
+
+        entry = self._entry
+        if self._fresh(entry):
+            self.hits += 1
+            return entry
+
+        if entry is not None and entry.version != self.version and self._clock() - self._invalidated_at < self.stale_ttl:
+            self.stale_hits += 1
+            task = asyncio.ensure_future(self._rebuild.do("stats", lambda: self._build(build)))
+            task.add_done_callback(self._log_failure)
+            return entry
+
+        return await self._rebuild.do("stats", lambda: self._build(build))
+
+    async def _build(self, build: Callable[[], Awaitable[bytes]]) -> CachedBody:
+
+        # Capture the version first: a write that lands mid-build bumps it
+        # again, so this body is never mistaken for the newer state.
+        version = self.version
+        body = await build()
+        self.builds += 1
+        entry = CachedBody(version, self.etag_for(body), body, self._clock())
+        if self._entry is None or self._entry.version <= version:
+            self._entry = entry
+        return entry
+
+    @staticmethod
+    def _log_failure(task: asyncio.Future) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Dashboard stats rebuild failed: {task.exception()}")
+
+    def stats(self) -> Dict:
+
+        return {
+            "version": self.version,
+            "cached_version": self._entry.version if self._entry else None,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "not_modified": self.not_modified,
+            "builds": self.builds
+        }
+
+
+dashboard_cache = DashboardCache()
+invalidation_bus.register("dashboard", lambda key: dashboard_cache.invalidate())
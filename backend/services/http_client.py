@@ -0,0 +1,109 @@
+
+import os
+import logging
+from dataclasses import dataclass
+from typing import Dict
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class UpstreamConfig:
+    """Connection settings for one upstream, read from ``<PREFIX>_HTTP_*`` env vars."""
+
+    name: str
+    timeout: float
+    connect_timeout: float = 5.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+
+    @classmethod
+    def from_env(cls, name: str, prefix: str, timeout: float) -> "UpstreamConfig":
+        return cls(
+            name=name,
+            timeout=float(os.getenv(f"{prefix}_HTTP_TIMEOUT", timeout)),
+            connect_timeout=float(os.getenv(f"{prefix}_HTTP_CONNECT_TIMEOUT", 5.0)),
+            max_connections=int(os.getenv(f"{prefix}_HTTP_MAX_CONNECTIONS", 100)),
+            max_keepalive_connections=int(os.getenv(f"{prefix}_HTTP_MAX_KEEPALIVE", 20)),
+            keepalive_expiry=float(os.getenv(f"{prefix}_HTTP_KEEPALIVE_EXPIRY", 30.0)),
+            http2=_env_bool(f"{prefix}_HTTP2", True),
+        )
+
+    def build_client(self) -> httpx.AsyncClient:
+        http2 = self.http2 and _http2_available()
+        if self.http2 and not http2:
+            logger.warning(f"h2 not installed, {self.name} client falls back to HTTP/1.1")
+
+        return httpx.AsyncClient(
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            http2=http2,
+        )
+
+
+class HTTPClientManager:
+    """Holds one long-lived ``httpx.AsyncClient`` per upstream.
+
+    Clients are opened by the app lifespan (``startup``) and closed on
+    shutdown. ``get`` also creates a client lazily so services keep working
+    when used outside the app, e.g. from scripts and tests.
+    """
+
+    def __init__(self):
+        self._configs: Dict[str, UpstreamConfig] = {}
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def register(self, config: UpstreamConfig) -> None:
+        self._configs[config.name] = config
+
+    def config(self, name: str) -> UpstreamConfig:
+        return self._configs[name]
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._configs[name].build_client()
+            self._clients[name] = client
+        return client
+
+    def set(self, name: str, client: httpx.AsyncClient) -> None:
+        """Install a pre-built client, e.g. one with a mock transport in tests."""
+        self._clients[name] = client
+
+    async def startup(self) -> None:
+        for name in self._configs:
+            self.get(name)
+        logger.info(f"HTTP clients ready: {', '.join(self._clients)}")
+
+    async def shutdown(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+http_clients = HTTPClientManager()
+http_clients.register(UpstreamConfig.from_env("n8n", "N8N", timeout=60.0))
+http_clients.register(UpstreamConfig.from_env("vocab", "VOCAB", timeout=10.0))
@@ -0,0 +1,278 @@
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import AsyncSessionLocal
+from db.models import IdempotencyKey
+from services.cache import MISSING, TTLCache
+
+logger = logging.getLogger(__name__)
+
+# (status_code, JSON body) of the response to replay.
+Response = Tuple[int, Dict]
+
+
+class IdempotencyKeyReused(Exception):
+    """The key was already used for a different request."""
+
+
+class IdempotencyKeyInProgress(Exception):
+    """The first request with this key is still running on another worker."""
+
+    def __init__(self, retry_after: float):
+        super().__init__("A request with this Idempotency-Key is still in progress")
+        self.retry_after = retry_after
+
+
+def request_fingerprint(body: Dict) -> str:
+    return hashlib.sha256(json.dumps(body, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class _IdempotencyStore(ABC):
+    """Runs each key's request once and replays its response.
+
+    A retry that arrives while the first request is still running in this
+    process awaits the same task; one that arrives later gets the stored
+    response. Only successful responses are stored: if the request raises,
+    the key is released and the next retry runs it again. Reusing a key for
+    a different request body raises ``IdempotencyKeyReused``.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self._inflight: Dict[str, Tuple[str, asyncio.Future]] = {}
+        self.executed = 0
+        self.replayed = 0
+        self.attached = 0
+        self.reused = 0
+
+    async def run(self, key: str, fingerprint: str, fn: Callable[[], Awaitable[Response]]) -> Tuple[int, Dict, bool]:
+        """``(status_code, body, replayed)`` for the request behind ``key``."""
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._check(inflight[0], fingerprint)
+            self.attached += 1
+            status_code, body, _ = await asyncio.shield(inflight[1])
+            return status_code, body, True
+
+        future = asyncio.ensure_future(self._execute(key, fingerprint, fn))
+        self._inflight[key] = (fingerprint, future)
+        future.add_done_callback(lambda f: self._forget(key, f))
+        return await asyncio.shield(future)
+
+    def _check(self, stored: str, fingerprint: str) -> None:
+
+        if stored != fingerprint:
+            self.reused += 1
+            raise IdempotencyKeyReused("Idempotency-Key was already used for a different request")
+
+    def _forget(self, key: str, future: asyncio.Future) -> None:
+
+        if self._inflight.get(key, (None, None))[1] is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()
+
+    @abstractmethod
+    async def _execute(self, key: str, fingerprint: str, fn: Callable[[], Awaitable[Response]]) -> Tuple[int, Dict, bool]:
+        ...
+
+    def stats(self) -> Dict:
+
+        return {
+            "backend": self.name,
+            "in_flight": len(self._inflight),
+            "executed": self.executed,
+            "replayed": self.replayed,
+            "attached": self.attached,
+            "reused": self.reused
+        }
+
+
+class InMemoryIdempotencyStore(_IdempotencyStore):
+    """Process-local store; retries that land on another worker run again."""
+
+    name = "memory"
+
+    def __init__(self, ttl: float = 24 * 3600, maxsize: int = 10000):
+        super().__init__()
+        self._responses = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def _execute(self, key: str, fingerprint: str, fn: Callable[[], Awaitable[Response]]) -> Tuple[int, Dict, bool]:
+
+        stored = self._responses.get(key)
+        if stored is not MISSING:
+            self._check(stored[0], fingerprint)
+            self.replayed += 1
+            return stored[1], stored[2], True
+
+        status_code, body = await fn()
+        self._responses.set(key, (fingerprint, status_code, body))
+        self.executed += 1
+        return status_code, body, False
+
+    def stats(self) -> Dict:
+        return {**super().stats(), "stored": len(self._responses)}
+
+
+def _insert(db: AsyncSession):
+    return (postgresql if db.get_bind().dialect.name == "postgresql" else sqlite).insert
+
+
+class PostgresIdempotencyStore(_IdempotencyStore):
+    """Store backed by the ``idempotency_keys`` table, shared by all workers.
+
+    The first request claims the key by inserting a row without a response,
+    which expires after ``lock_timeout`` so a worker that died mid-request
+    does not hold the key forever. Retries on other workers poll the row
+    every ``poll_interval`` seconds for up to ``wait_timeout`` seconds, then
+    get ``IdempotencyKeyInProgress``. Completed rows are replayed for
+    ``ttl`` seconds. Table errors are logged and the request runs without
+    protection, as it would have before.
+    """
+
+    name = "postgres"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        ttl: float = 24 * 3600,
+        lock_timeout: float = 120.0,
+        wait_timeout: float = 30.0,
+        poll_interval: float = 0.25,
+        purge_interval: float = 300.0
+    ):
+        super().__init__()
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.purge_interval = purge_interval
+        self._purged_at = time.monotonic()
+        self.errors = 0
+
+    async def _execute(self, key: str, fingerprint: str, fn: Callable[[], Awaitable[Response]]) -> Tuple[int, Dict, bool]:
+
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            try:
+                if await self._claim(key, fingerprint):
+                    break
+                row = await self._load(key)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Idempotency store unavailable, running request unprotected: {e}")
+                status_code, body = await fn()
+                return status_code, body, False
+            if row is None:
+                continue
+            self._check(row.request_hash, fingerprint)
+            if row.response is not None:
+                self.replayed += 1
+                return row.status_code, row.response, True
+            if time.monotonic() >= deadline:
+                raise IdempotencyKeyInProgress(retry_after=self.poll_interval * 4)
+            await asyncio.sleep(self.poll_interval)
+
+        try:
+            status_code, body = await fn()
+        except BaseException:
+            await self._release(key)
+            raise
+        await self._complete(key, status_code, body)
+        self.executed += 1
+        return status_code, body, False
+
+    async def _claim(self, key: str, fingerprint: str) -> bool:
+
+        now = datetime.utcnow()
+        async with self.session_factory() as db:
+            if time.monotonic() - self._purged_at >= self.purge_interval:
+                self._purged_at = time.monotonic()
+                await db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= now))
+            else:
+                await db.execute(
+                    delete(IdempotencyKey)
+                    .where(IdempotencyKey.key == key, IdempotencyKey.expires_at <= now)
+                )
+            result = await db.execute(
+                _insert(db)(IdempotencyKey)
+                .values(
+                    key=key,
+                    request_hash=fingerprint,
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=self.lock_timeout)
+                )
+                .on_conflict_do_nothing(index_elements=["key"])
+            )
+            await db.commit()
+            return result.rowcount == 1
+
+    async def _load(self, key: str) -> Optional[IdempotencyKey]:
+
+        async with self.session_factory() as db:
+            return (await db.execute(
+                select(IdempotencyKey)
+                .where(IdempotencyKey.key == key, IdempotencyKey.expires_at > datetime.utcnow())
+            )).scalar_one_or_none()
+
+    async def _complete(self, key: str, status_code: int, body: Dict) -> None:
+
+        try:
+            async with self.session_factory() as db:
+                await db.execute(
+                    update(IdempotencyKey)
+                    .where(IdempotencyKey.key == key)
+                    .values(
+                        status_code=status_code,
+                        response=body,
+                        expires_at=datetime.utcnow() + timedelta(seconds=self.ttl)
+                    )
+                )
+                await db.commit()
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Failed to store idempotent response for {key}: {e}")
+
+    async def _release(self, key: str) -> None:
+
+        try:
+            async with self.session_factory() as db:
+                await db.execute(
+                    delete(IdempotencyKey)
+                    .where(IdempotencyKey.key == key, IdempotencyKey.response.is_(None))
+                )
+                await db.commit()
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Failed to release idempotency key {key}: {e}")
+
+    def stats(self) -> Dict:
+        return {**super().stats(), "errors": self.errors}
+
+
+def create_idempotency_store(backend: Optional[str] = None):
+    backend = backend or os.getenv("IDEMPOTENCY_BACKEND", "memory")
+    ttl = float(os.getenv("IDEMPOTENCY_TTL", 24 * 3600))
+    if backend == "postgres":
+        return PostgresIdempotencyStore(
+            ttl=ttl,
+            lock_timeout=float(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT", 120.0)),
+            wait_timeout=float(os.getenv("IDEMPOTENCY_WAIT_TIMEOUT", 30.0)),
+            poll_interval=float(os.getenv("IDEMPOTENCY_POLL_INTERVAL", 0.25))
+        )
+    if backend == "memory":
+        return InMemoryIdempotencyStore(ttl=ttl, maxsize=int(os.getenv("IDEMPOTENCY_MAX_KEYS", 10000)))
+    raise ValueError(f"Unknown IDEMPOTENCY_BACKEND: {backend}")
@@ -0,0 +1,328 @@
+
+import os
+import json
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+from sqlalchemy.engine import make_url
+from db.database import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache_invalidation"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_PAYLOAD = 7900
+
+# (cache name, key); a key of None flushes the whole cache.
+Invalidation = Tuple[str, Optional[Hashable]]
+
+
+class LocalHub:
+    """In-process stand-in for a Postgres channel, shared by the
+    ``LocalTransport`` of several buses (one per simulated worker)."""
+
+    def __init__(self):
+        self._listeners: List["LocalTransport"] = []
+        self.sent: List[str] = []
+
+    def notify(self, payload: str) -> None:
+        self.sent.append(payload)
+        for transport in list(self._listeners):
+            transport.on_payload(payload)
+
+    def drop(self) -> None:
+        """Break every connection, like a Postgres restart."""
+        for transport in list(self._listeners):
+            transport.terminate()
+
+
+class LocalTransport:
+
+    name = "local"
+
+    def __init__(self, hub: Optional[LocalHub] = None):
+        self.hub = hub or LocalHub()
+        self.on_payload: Callable[[str], None] = lambda payload: None
+        self._on_lost: Callable[[], None] = lambda: None
+        self.connected = False
+
+    async def connect(self, on_payload: Callable[[str], None], on_lost: Callable[[], None]) -> None:
+        self.on_payload, self._on_lost = on_payload, on_lost
+        self.hub._listeners.append(self)
+        self.connected = True
+
+    def terminate(self) -> None:
+        if self.connected:
+            self.connected = False
+            self.hub._listeners.remove(self)
+            self._on_lost()
+
+    async def send(self, payload: str) -> None:
+        if not self.connected:
+            raise ConnectionError("local transport is disconnected")
+        self.hub.notify(payload)
+
+    async def ping(self) -> None:
+        if not self.connected:
+            raise ConnectionError("local transport is disconnected")
+
+    async def close(self) -> None:
+        if self.connected:
+            self.connected = False
+            self.hub._listeners.remove(self)
+
+
+class PostgresTransport:
+    """``LISTEN``/``NOTIFY`` on one dedicated asyncpg connection, outside the
+    SQLAlchemy pool so a listener never holds a pooled connection."""
+
+    name = "postgres"
+
+    def __init__(self, url: str = DATABASE_URL, channel: str = CHANNEL):
+        self.dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self._conn = None
+
+    async def connect(self, on_payload: Callable[[str], None], on_lost: Callable[[], None]) -> None:
+        import asyncpg
+
+        self._conn = await asyncpg.connect(self.dsn, timeout=float(os.getenv("DB_CONNECT_TIMEOUT", 10.0)))
+        self._conn.add_termination_listener(lambda conn: on_lost())
+        await self._conn.add_listener(self.channel, lambda conn, pid, channel, payload: on_payload(payload))
+
+    async def send(self, payload: str) -> None:
+        await self._conn.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+
+    async def ping(self) -> None:
+        await self._conn.execute("SELECT 1")
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            try:
+                await asyncio.wait_for(conn.close(), 5.0)
+            except Exception:
+                conn.terminate()
+
+
+class InvalidationBus:
+    """Keeps in-process caches coherent across workers and replicas.
+
+    Caches ``register`` a handler taking a key (None means flush
+    everything). ``publish`` runs the local handler at once and queues the
+    invalidation for every other worker; a background task sends what is
+    queued, de-duplicated, as one ``NOTIFY`` payload after the write that
+    caused it has committed, and applies what other workers send.
+
+    Invalidations that arrive while the connection is down are lost, so
+    after every reconnect each registered cache is flushed in full. While
+    disconnected, local invalidations keep queueing (up to ``max_pending``;
+    past that the next send flushes every cache instead) and go out once
+    the connection is back. The connection is checked every
+    ``ping_interval`` seconds, and a dropped connection is noticed at once.
+
+    Only the dashboard cache is registered: it is the one whose source of
+    truth (the database) every worker writes to. Word lookups and verdicts
+    have no writer in this service and expire by TTL; the near-duplicate
+    index and the in-memory idempotency store are per worker by design
+    (``IDEMPOTENCY_BACKEND=postgres`` is the shared one).
+    """
+
+    def __init__(self, transport=None):
+        self.transport = transport
+        self.origin = uuid.uuid4().hex[:12]
+        self.ping_interval = float(os.getenv("CACHE_INVALIDATION_PING_INTERVAL", 10.0))
+        self.reconnect_delay = float(os.getenv("CACHE_INVALIDATION_RECONNECT_DELAY", 1.0))
+        self.max_pending = int(os.getenv("CACHE_INVALIDATION_MAX_PENDING", 1000))
+        self._handlers: Dict[str, Callable[[Optional[Hashable]], None]] = {}
+        self._pending: "OrderedDict[Invalidation, None]" = OrderedDict()
+        self._overflowed = False
+        self._wakeup = asyncio.Event()
+        self._lost = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+        self.published = 0
+        self.sent = 0
+        self.received = 0
+        self.reconnects = 0
+        self.full_flushes = 0
+
+    def register(self, cache: str, handler: Callable[[Optional[Hashable]], None]) -> None:
+        self._handlers[cache] = handler
+
+    def publish(self, cache: str, key: Optional[Hashable] = None) -> None:
+        """Invalidate ``key`` of ``cache`` here and on every other worker."""
+
+        self.published += 1
+        self._apply(cache, key)
+        if self._task is None:
+            return
+        if len(self._pending) >= self.max_pending:
+            self._overflowed = True
+            self._pending.clear()
+        if not self._overflowed:
+            self._pending[(cache, key)] = None
+        self._wakeup.set()
+
+    def _apply(self, cache: str, key: Optional[Hashable]) -> None:
+
+        handler = self._handlers.get(cache)
+        if handler is None:
+            return
+        try:
+            handler(key)
+        except Exception as e:
+            logger.error(f"Invalidating {cache} {key!r} failed: {e}")
+
+    def flush_all(self) -> None:
+
+        self.full_flushes += 1
+        for cache in self._handlers:
+            self._apply(cache, None)
+
+    def _on_payload(self, payload: str) -> None:
+
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed invalidation payload: {payload[:100]}")
+            return
+        if message.get("origin") == self.origin:
+            return
+        self.received += 1
+        for cache, key in message.get("items", []):
+            self._apply(cache, key)
+
+    def _on_lost(self) -> None:
+
+        self._lost.set()
+        self._wakeup.set()
+
+    def _payloads(self, items: List[Invalidation]) -> List[str]:
+        """Serialize ``items`` into payloads under ``MAX_PAYLOAD`` bytes."""
+
+        # json.dumps escapes non-ASCII, so string length is byte length.
+        head = f'{{"origin": {json.dumps(self.origin)}, "items": ['
+        payloads, batch, size = [], [], len(head) + 2
+        for item in items:
+            encoded = json.dumps(list(item), default=str)
+            if batch and size + len(encoded) + 2 > MAX_PAYLOAD:
+                payloads.append(head + ", ".join(batch) + "]}")
+                batch, size = [], len(head) + 2
+            batch.append(encoded)
+            size += len(encoded) + 2
+        if batch:
+            payloads.append(head + ", ".join(batch) + "]}")
+        return payloads
+
+    async def _send_pending(self) -> None:
+
+        if self._overflowed:
+            items = [(cache, None) for cache in self._handlers]
+        else:
+            items = list(self._pending)
+        if not items:
+            return
+        for payload in self._payloads(items):
+            await self.transport.send(payload)
+        self.sent += len(items)
+        # Only what was sent is dropped; publishes made during the send stay queued.
+        for item in items:
+            self._pending.pop(item, None)
+        self._overflowed = False
+
+    async def start(self) -> None:
+
+        if self.transport is None:
+            self.transport = create_transport()
+        if self.transport is None:
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+
+        if self._task is not None and self.connected:
+            # Send what the last writes published before going away.
+            try:
+                await asyncio.wait_for(self._send_pending(), 2.0)
+            except Exception as e:
+                logger.warning(f"Could not send final cache invalidations: {e}")
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.transport is not None:
+            await self.transport.close()
+        self.connected = False
+
+    async def _run(self) -> None:
+
+        missed = False
+        while True:
+            try:
+                self._lost.clear()
+                await self.transport.connect(self._on_payload, self._on_lost)
+                self.connected = True
+                if missed:
+                    # Whatever other workers published while we were away is lost.
+                    self.reconnects += 1
+                    self.flush_all()
+                    logger.info("Cache invalidation bus reconnected; flushed local caches")
+                await self._serve()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation bus disconnected: {e}")
+            missed = True
+            self.connected = False
+            try:
+                await self.transport.close()
+            except Exception:
+                pass
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _serve(self) -> None:
+
+        while True:
+            await self._send_pending()
+            self._wakeup.clear()
+            if self._lost.is_set():
+                raise ConnectionError("connection lost")
+            if self._pending or self._overflowed:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.ping_interval)
+            except asyncio.TimeoutError:
+                await self.transport.ping()
+
+    def stats(self) -> Dict:
+
+        return {
+            "transport": getattr(self.transport, "name", None),
+            "connected": self.connected,
+            "caches": list(self._handlers),
+            "pending": len(self._pending),
+            "published": self.published,
+            "sent": self.sent,
+            "received": self.received,
+            "reconnects": self.reconnects,
+            "full_flushes": self.full_flushes
+        }
+
+
+def create_transport(backend: Optional[str] = None):
+    """``CACHE_INVALIDATION_BACKEND``: ``postgres`` (the default when the
+    database is Postgres) or ``none`` for a single worker."""
+
+    default = "postgres" if make_url(DATABASE_URL).get_backend_name() == "postgresql" else "none"
+    backend = backend or os.getenv("CACHE_INVALIDATION_BACKEND", default)
+    if backend == "postgres":
+        return PostgresTransport()
+    if backend == "none":
+        return None
+    raise ValueError(f"Unknown CACHE_INVALIDATION_BACKEND: {backend}")
+
+
+invalidation_bus = InvalidationBus()
@@ -0,0 +1,60 @@
+
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class LatencyTracker:
+    """Sliding window of recent upstream latencies (seconds)."""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self.count += 1
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def stats(self) -> Dict:
+        return {
+            "samples": len(self._samples),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99)
+        }
+
+
+class AdaptiveTimeout:
+    """Timeout of ``p99 * multiplier`` over recent successes, clamped to
+    ``[minimum, maximum]``. Until ``min_samples`` successes have been seen
+    the ceiling is used, which is the old fixed timeout.
+    """
+
+    def __init__(
+        self,
+        tracker: LatencyTracker,
+        minimum: float,
+        maximum: float,
+        multiplier: float = 3.0,
+        min_samples: int = 20
+    ):
+        self.tracker = tracker
+        self.minimum = minimum
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+
+    def current(self) -> float:
+        if len(self.tracker) < self.min_samples:
+            return self.maximum
+        return min(self.maximum, max(self.minimum, self.tracker.percentile(99) * self.multiplier))
+
@@ -0,0 +1,178 @@
+
+import os
+import time
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+from services.latency import LatencyTracker
+from services.telemetry import registry
+
+logger = logging.getLogger(__name__)
+
+# Mirrors difficulty_enum in database/init.sql.
+DIFFICULTIES = ("Beginner", "Intermediate", "Advanced")
+
+route_duration = registry.histogram(
+    "n8n_route_duration_seconds",
+    "Validation webhook latency by route, including any hedged request.",
+    ("route",)
+)
+hedged_requests_total = registry.counter(
+    "n8n_hedged_requests_total",
+    "Validation calls that were hedged, by route and which request answered first.",
+    ("route", "winner")
+)
+
+
+class Route:
+    """One validation endpoint and the backup it may be hedged against.
+
+    ``url`` None means the service's default webhook. ``latency`` is what
+    callers saw (hedge included); ``primary_latency`` is the primary alone
+    and sets the hedge delay.
+    """
+
+    def __init__(self, name: str, url: Optional[str], backup_url: Optional[str]):
+        self.name = name
+        self.url = url
+        self.backup_url = backup_url
+        self.latency = LatencyTracker()
+        self.primary_latency = LatencyTracker()
+        self.calls = 0
+        self.errors = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def stats(self, hedge_delay: Optional[float]) -> Dict:
+
+        return {
+            "url": self.url,
+            "backup_url": self.backup_url,
+            "calls": self.calls,
+            "errors": self.errors,
+            "latency": self.latency.stats(),
+            "hedge_delay": hedge_delay,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_win_rate": round(self.hedge_wins / self.hedged, 4) if self.hedged else 0.0
+        }
+
+
+class ModelRouter:
+    """Sends each validation to the webhook for the word's difficulty, and
+    optionally hedges slow calls against a backup webhook.
+
+    ``N8N_WEBHOOK_URL_<DIFFICULTY>`` (e.g. a small fast model for Beginner
+    words, a stronger one for Advanced) overrides the default webhook for
+    that difficulty; words without a known difficulty use the default.
+
+    With ``N8N_HEDGE_WEBHOOK_URL`` (or ``N8N_HEDGE_WEBHOOK_URL_<DIFFICULTY>``)
+    set, a call still unanswered after its route's p95 primary latency is
+    also sent to the backup. The first successful answer wins and the other
+    request is cancelled. Hedging waits for ``hedge_min_samples`` primary
+    latencies, and at most ``max_hedge_ratio`` of a route's calls are hedged,
+    so a primary that is slow across the board does not double the load.
+    """
+
+    def __init__(self):
+        self.hedge_percentile = float(os.getenv("N8N_HEDGE_PERCENTILE", 95))
+        self.hedge_min_samples = int(os.getenv("N8N_HEDGE_MIN_SAMPLES", 20))
+        self.max_hedge_ratio = float(os.getenv("N8N_HEDGE_MAX_RATIO", 0.1))
+        backup = os.getenv("N8N_HEDGE_WEBHOOK_URL") or None
+        self.routes: Dict[str, Route] = {
+            difficulty: Route(
+                difficulty.lower(),
+                os.getenv(f"N8N_WEBHOOK_URL_{difficulty.upper()}") or None,
+                os.getenv(f"N8N_HEDGE_WEBHOOK_URL_{difficulty.upper()}") or backup
+            )
+            for difficulty in DIFFICULTIES
+        }
+        self.default = Route("default", None, backup)
+
+    def route(self, difficulty: Optional[str]) -> Route:
+        return self.routes.get(difficulty, self.default)
+
+    def hedge_delay(self, route: Route) -> Optional[float]:
+        """Seconds to wait for the primary before hedging, None when this
+        route does not hedge (yet)."""
+
+        if not route.backup_url or len(route.primary_latency) < self.hedge_min_samples:
+            return None
+        return route.primary_latency.percentile(self.hedge_percentile)
+
+    async def call(
+        self,
+        difficulty: Optional[str],
+        send: Callable[[str], Awaitable[Dict]],
+        default_url: str
+    ) -> Dict:
+        """``send(url)`` to the route for ``difficulty``, hedged if due."""
+
+        route = self.route(difficulty)
+        route.calls += 1
+        started = time.perf_counter()
+        try:
+            delay = self.hedge_delay(route)
+            if delay is None:
+                result = await send(route.url or default_url)
+                route.primary_latency.record(time.perf_counter() - started)
+            else:
+                result = await self._hedged(route, send, route.url or default_url, delay, started)
+        except BaseException:
+            route.errors += 1
+            raise
+        elapsed = time.perf_counter() - started
+        route.latency.record(elapsed)
+        route_duration.observe(elapsed, route.name)
+        return result
+
+    async def _hedged(
+        self,
+        route: Route,
+        send: Callable[[str], Awaitable[Dict]],
+        url: str,
+        delay: float,
+        started: float
+    ) -> Dict:
+
+        primary = asyncio.ensure_future(send(url))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if done or route.hedged >= self.max_hedge_ratio * route.calls:
+                result = await primary
+                route.primary_latency.record(time.perf_counter() - started)
+                return result
+
+            route.hedged += 1
+            backup = asyncio.ensure_future(send(route.backup_url))
+            tasks.add(backup)
+            error: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    if task is backup:
+                        route.hedge_wins += 1
+                    hedged_requests_total.inc(route.name, "backup" if task is backup else "primary")
+                    # When the backup wins the primary is cancelled and its
+                    # true latency is unknown; the time it had already taken
+                    # is a lower bound that keeps p95 (the hedge delay) from
+                    # drifting down as hedges win.
+                    route.primary_latency.record(time.perf_counter() - started)
+                    return task.result()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict:
+
+        return {
+            route.name: route.stats(self.hedge_delay(route))
+            for route in (*self.routes.values(), self.default)
+        }
@@ -0,0 +1,207 @@
+
+import os
+import asyncio
+import logging
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+PARENT = "practice_sessions"
+ARCHIVE_SCHEMA = "archive"
+# pg_try_advisory_xact_lock key; only one worker runs a maintenance pass at a time.
+ADVISORY_LOCK_KEY = 0x70617274
+
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_y{month.year}m{month.month:02d}"
+
+
+def parse_partition_month(name: str) -> Optional[date]:
+    prefix = f"{PARENT}_y"
+    if not name.startswith(prefix):
+        return None
+    try:
+        year, month = name[len(prefix):].split("m")
+        return date(int(year), int(month), 1)
+    except ValueError:
+        return None
+
+
+def expired_partitions(names: List[str], today: date, retention_months: int) -> List[Tuple[str, date]]:
+    """Monthly partitions whose whole range is older than the retention window."""
+
+    if retention_months <= 0:
+        return []
+    cutoff = add_months(month_start(today), -retention_months)
+    expired = []
+    for name in names:
+        month = parse_partition_month(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            expired.append((name, month))
+    return sorted(expired, key=lambda item: item[1])
+
+
+class PartitionManager:
+    """Keeps monthly ``practice_sessions`` partitions ahead of the clock and
+    applies the retention policy.
+
+    Creates the current month plus ``months_ahead`` future partitions, so
+    inserts never fall through to the default partition. When
+    ``retention_months`` is set, partitions entirely older than that are
+    detached and then dropped, or moved to the ``archive`` schema
+    (``SESSION_RETENTION_MODE=archive``) where they stay queryable but out
+    of every index and scan on the live table. No-op unless the table is
+    actually partitioned (Postgres after migration 005).
+
+    Every worker runs the pass on its own timer, so each pass first takes
+    an advisory lock and is skipped when another worker holds it. Retired
+    rows are still counted in ``practice_stats`` and the score rollups, so
+    a pass that retires anything runs ``reconciler`` afterwards.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession] = AsyncSessionLocal, reconciler=None):
+        self.session_factory = session_factory
+        # StatsReconciler to run after retention, so /stats agrees with /sessions.
+        self.reconciler = reconciler
+        self.months_ahead = int(os.getenv("PARTITION_MONTHS_AHEAD", 3))
+        self.retention_months = int(os.getenv("SESSION_RETENTION_MONTHS", 0))
+        self.retention_mode = os.getenv("SESSION_RETENTION_MODE", "drop")
+        self.interval = float(os.getenv("PARTITION_MAINTENANCE_INTERVAL", 86400.0))
+        if self.retention_mode not in ("drop", "archive"):
+            raise ValueError(f"Unknown SESSION_RETENTION_MODE: {self.retention_mode}")
+        self._task: Optional[asyncio.Task] = None
+        self.created: List[str] = []
+        self.retired: List[str] = []
+        self.skipped = 0
+
+    async def start(self) -> None:
+
+        try:
+            await self.run_once()
+        except Exception as e:
+            logger.error(f"Partition maintenance failed: {e}")
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Partition maintenance failed: {e}")
+
+    async def run_once(self, today: Optional[date] = None) -> Dict:
+
+        today = today or datetime.utcnow().date()
+        async with self.session_factory() as lock_db:
+            if not await self._is_partitioned(lock_db):
+                return {"partitioned": False}
+            # Held by lock_db's open transaction until it closes; the DDL commits
+            # on its own session in between.
+            if not await self._try_lock(lock_db):
+                self.skipped += 1
+                logger.info("Partition maintenance is running on another worker; skipped")
+                return {"partitioned": True, "skipped": True}
+            async with self.session_factory() as db:
+                created = await self._ensure_partitions(db, today)
+                retired = await self._apply_retention(db, today)
+        if retired and self.reconciler is not None:
+            # Waits for a reconcile already running elsewhere, which may predate the drop.
+            await self.reconciler.run_once(wait=True)
+        return {"partitioned": True, "created": created, "retired": retired}
+
+    async def _is_partitioned(self, db: AsyncSession) -> bool:
+
+        if db.get_bind().dialect.name != "postgresql":
+            return False
+        relkind = (await db.execute(
+            text("SELECT relkind FROM pg_class WHERE oid = to_regclass(:name)"),
+            {"name": PARENT}
+        )).scalar()
+        return relkind == "p"
+
+    async def _try_lock(self, db: AsyncSession) -> bool:
+
+        return bool((await db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"),
+            {"key": ADVISORY_LOCK_KEY}
+        )).scalar())
+
+    async def _partitions(self, db: AsyncSession) -> List[str]:
+
+        return list((await db.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.oid = to_regclass(:name)"
+        ), {"name": PARENT})).scalars())
+
+    async def _ensure_partitions(self, db: AsyncSession, today: date) -> List[str]:
+
+        existing = set(await self._partitions(db))
+        created = []
+        first = month_start(today)
+        for offset in range(self.months_ahead + 1):
+            month = add_months(first, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            # Names and bounds come from date arithmetic, never from input.
+            await db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            ))
+            await db.commit()
+            created.append(name)
+            logger.info(f"Created partition {name}")
+        self.created.extend(created)
+        return created
+
+    async def _apply_retention(self, db: AsyncSession, today: date) -> List[str]:
+
+        retired = []
+        for name, _ in expired_partitions(await self._partitions(db), today, self.retention_months):
+            await db.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+            if self.retention_mode == "archive":
+                await db.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+                await db.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+            else:
+                await db.execute(text(f"DROP TABLE {name}"))
+            await db.commit()
+            retired.append(name)
+            logger.info(f"Retired partition {name} ({self.retention_mode})")
+        self.retired.extend(retired)
+        return retired
+
+    def stats(self) -> Dict:
+
+        return {
+            "months_ahead": self.months_ahead,
+            "retention_months": self.retention_months,
+            "retention_mode": self.retention_mode,
+            "created": self.created[-12:],
+            "retired": self.retired[-12:],
+            "skipped": self.skipped
+        }
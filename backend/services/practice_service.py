@@ -1,18 +1,47 @@
 
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, and_, func, or_, select, tuple_, update
 from db.models import PracticeSession
-from typing import Dict, List, Optional
-from datetime import datetime
+from services.invalidation import invalidation_bus
+from services.stats_aggregates import read_statistics, record_sessions
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from datetime import datetime, timedelta
+
+
+def history_conditions(
+    word_id: Optional[int] = None,
+    cefr_level: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> List:
+    
+    conditions = [PracticeSession.status == "completed"]
+    if word_id is not None:
+        conditions.append(PracticeSession.word_id == word_id)
+    if cefr_level is not None:
+        conditions.append(PracticeSession.cefr_level == cefr_level)
+    if min_score is not None:
+        conditions.append(PracticeSession.score >= min_score)
+    if max_score is not None:
+        conditions.append(PracticeSession.score <= max_score)
+    if since is not None:
+        conditions.append(PracticeSession.practiced_at >= since)
+    if until is not None:
+        conditions.append(PracticeSession.practiced_at < until)
+    return conditions
 
 
 class PracticeService:
     
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, writer=None):
         self.db = db
+        # Optional SessionWriteBuffer; when enabled, save_session goes through it.
+        self.writer = writer
     
-    def save_session(
+    async def save_session(
         self,
         word_id: int,
         user_sentence: str,
@@ -29,42 +58,209 @@ class PracticeService:
             cefr_level=cefr_level,
             feedback=feedback,
             corrected_sentence=corrected_sentence,
+            practiced_at=datetime.utcnow(),
+            status="completed"
+        )
+        
+        if self.writer is not None and self.writer.enabled:
+            return await self.writer.write(session)
+        
+        # ids come back from the INSERT and every other column is set here, so
+        # with expire_on_commit=False no refresh round trip is needed.
+        self.db.add(session)
+        await record_sessions(self.db, [session])
+        await self.db.commit()
+        invalidation_bus.publish("dashboard")
+        
+        return session
+    
+    async def save_sessions(self, sessions: List[Dict]) -> List[PracticeSession]:
+        
+        rows = [
+            PracticeSession(
+                word_id=item["word_id"],
+                user_sentence=item["user_sentence"],
+                score=item["score"],
+                cefr_level=item["cefr_level"],
+                feedback=item["feedback"],
+                corrected_sentence=item.get("corrected_sentence"),
+                practiced_at=datetime.utcnow(),
+                status="completed"
+            )
+            for item in sessions
+        ]
+        
+        # One transaction; the flush batches the INSERTs and fetches ids via RETURNING,
+        # and expire_on_commit=False means no per-row refresh afterwards.
+        self.db.add_all(rows)
+        await record_sessions(self.db, rows)
+        await self.db.commit()
+        invalidation_bus.publish("dashboard")
+        
+        return rows
+    
+    async def create_pending_session(self, word_id: int, user_sentence: str) -> PracticeSession:
+        
+        session = PracticeSession(
+            word_id=word_id,
+            user_sentence=user_sentence,
+            status="pending",
             practiced_at=datetime.utcnow()
         )
         
         self.db.add(session)
-        self.db.commit()
-        self.db.refresh(session)
+        await self.db.commit()
         
         return session
     
-    def get_recent_sessions(self, limit: int = 10) -> List[PracticeSession]:
+    async def get_session(self, session_id: int) -> Optional[PracticeSession]:
+        
+        return await self.db.get(PracticeSession, session_id)
     
-        return (
-            self.db.query(PracticeSession)
+    async def claim_pending_session(self, lease: float = 300.0) -> Optional[int]:
+        
+        # A claim is a lease: a row left in 'processing' by a worker that died or
+        # was redeployed is picked up again once it is ``lease`` seconds old.
+        now = datetime.utcnow()
+        claimable = or_(
+            PracticeSession.status == "pending",
+            and_(
+                PracticeSession.status == "processing",
+                PracticeSession.claimed_at < now - timedelta(seconds=lease)
+            )
+        )
+        # SKIP LOCKED lets every worker on every replica claim a different row.
+        next_pending = (
+            select(PracticeSession.id)
+            .where(claimable)
+            .order_by(PracticeSession.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        session_id = (await self.db.execute(
+            update(PracticeSession)
+            .where(PracticeSession.id == next_pending)
+            .values(status="processing", claimed_at=now)
+            .returning(PracticeSession.id)
+        )).scalar()
+        await self.db.commit()
+        
+        return session_id
+    
+    async def complete_session(
+        self,
+        session_id: int,
+        score: float,
+        cefr_level: str,
+        feedback: str,
+        corrected_sentence: Optional[str] = None
+    ) -> Optional[PracticeSession]:
+        
+        # Locked, so a worker finishing a session whose lease was taken over
+        # cannot count it in the aggregates a second time.
+        session = await self.db.get(PracticeSession, session_id, with_for_update=True)
+        if session is None or session.status == "completed":
+            return session
+        
+        session.score = score
+        session.cefr_level = cefr_level
+        session.feedback = feedback
+        session.corrected_sentence = corrected_sentence
+        session.status = "completed"
+        await record_sessions(self.db, [session])
+        await self.db.commit()
+        invalidation_bus.publish("dashboard")
+        
+        return session
+    
+    async def fail_session(self, session_id: int, reason: str) -> None:
+        
+        await self.db.execute(
+            update(PracticeSession)
+            .where(PracticeSession.id == session_id, PracticeSession.status != "completed")
+            .values(status="failed", feedback=reason)
+        )
+        await self.db.commit()
+    
+    async def get_recent_sessions(self, limit: int = 10) -> List[PracticeSession]:
+    
+        result = await self.db.execute(
+            select(PracticeSession)
+            .where(PracticeSession.status == "completed")
             .order_by(PracticeSession.practiced_at.desc())
             .limit(limit)
-            .all()
         )
+        return list(result.scalars())
     
-    def get_statistics(self) -> Dict:
+    async def get_sessions_page(
+        self,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, int]] = None,
+        **filters
+    ) -> Tuple[List[PracticeSession], bool]:
+        
+        # Keyset pagination: seek past the last (practiced_at, id) seen instead of
+        # OFFSET, so page 10,000 costs the same index range scan as page 1.
+        query = select(PracticeSession).where(*history_conditions(**filters))
+        if after is not None:
+            query = query.where(
+                tuple_(PracticeSession.practiced_at, PracticeSession.id) < tuple_(*after),
+                # Redundant with the row comparison, but lets Postgres prune newer partitions.
+                PracticeSession.practiced_at <= after[0]
+            )
+        
+        result = await self.db.execute(
+            query.order_by(PracticeSession.practiced_at.desc(), PracticeSession.id.desc()).limit(limit + 1)
+        )
+        rows = list(result.scalars())
+        return rows[:limit], len(rows) > limit
     
+    async def stream_sessions(self, columns: Sequence, batch_size: int = 5000, **filters) -> AsyncIterator[List[Row]]:
+        
+        # Server-side cursor: yield_per keeps at most batch_size rows in memory,
+        # however many match. Plain column rows skip ORM identity-map overhead.
+        result = await self.db.stream(
+            select(*columns)
+            .where(*history_conditions(**filters))
+            .order_by(PracticeSession.practiced_at, PracticeSession.id)
+            .execution_options(yield_per=batch_size)
+        )
+        async for partition in result.partitions():
+            yield partition
     
-        total_sessions = self.db.query(func.count(PracticeSession.id)).scalar() or 0
+    async def get_statistics(self) -> Dict:
         
+        stats = await read_statistics(self.db)
+        if stats is not None:
+            return stats
+        return await self.compute_statistics()
+    
+    async def compute_statistics(self) -> Dict:
+    
+    
+        completed = PracticeSession.status == "completed"
         
-        avg_score = self.db.query(func.avg(PracticeSession.score)).scalar() or 0.0
+        total_sessions = (await self.db.execute(
+            select(func.count(PracticeSession.id)).where(completed)
+        )).scalar() or 0
         
         
-        most_common = (
-            self.db.query(
+        avg_score = (await self.db.execute(
+            select(func.avg(PracticeSession.score)).where(completed)
+        )).scalar() or 0.0
+        
+        
+        most_common = (await self.db.execute(
+            select(
                 PracticeSession.cefr_level,
                 func.count(PracticeSession.cefr_level).label("count")
             )
+            .where(completed)
             .group_by(PracticeSession.cefr_level)
             .order_by(func.count(PracticeSession.cefr_level).desc())
-            .first()
-        )
+            .limit(1)
+        )).first()
         
         most_common_level = most_common[0] if most_common else "N/A"
         
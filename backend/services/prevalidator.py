@@ -0,0 +1,204 @@
+
+import os
+import re
+from collections import Counter
+from typing import Dict, Iterable, Optional, Set
+from services.telemetry import registry
+
+prevalidation_total = registry.counter(
+    "prevalidation_total",
+    "Sentences seen by the local pre-validator, by outcome (passed or the rejection reason).",
+    ("outcome",)
+)
+
+TOKEN = re.compile(r"[A-Za-z]+(?:['’][A-Za-z]+)*")
+VOWELS = set("aeiouy")
+
+# Common irregular forms; regular inflections are generated in inflections().
+IRREGULAR = {
+    "be": {"am", "is", "are", "was", "were", "been", "being"},
+    "have": {"has", "had", "having"},
+    "do": {"does", "did", "done", "doing"},
+    "go": {"goes", "went", "gone", "going"},
+    "eat": {"ate", "eaten"},
+    "run": {"ran", "running"},
+    "write": {"wrote", "written"},
+    "read": {"reads", "reading"},
+    "see": {"saw", "seen"},
+    "take": {"took", "taken"},
+    "give": {"gave", "given"},
+    "come": {"came"},
+    "make": {"made"},
+    "know": {"knew", "known"},
+    "think": {"thought"},
+    "buy": {"bought"},
+    "bring": {"brought"},
+    "teach": {"taught"},
+    "catch": {"caught"},
+    "find": {"found"},
+    "feel": {"felt"},
+    "leave": {"left"},
+    "meet": {"met"},
+    "sleep": {"slept"},
+    "speak": {"spoke", "spoken"},
+    "break": {"broke", "broken"},
+    "choose": {"chose", "chosen"},
+    "drive": {"drove", "driven"},
+    "fly": {"flew", "flown", "flies"},
+    "swim": {"swam", "swum"},
+    "sing": {"sang", "sung"},
+    "drink": {"drank", "drunk"},
+    "begin": {"began", "begun"},
+    "forget": {"forgot", "forgotten"},
+    "get": {"got", "gotten"},
+    "grow": {"grew", "grown"},
+    "hold": {"held"},
+    "keep": {"kept"},
+    "lose": {"lost"},
+    "pay": {"paid"},
+    "say": {"said"},
+    "sell": {"sold"},
+    "send": {"sent"},
+    "sit": {"sat"},
+    "stand": {"stood"},
+    "tell": {"told"},
+    "understand": {"understood"},
+    "wear": {"wore", "worn"},
+    "win": {"won"},
+    "child": {"children"},
+    "person": {"people"},
+    "man": {"men"},
+    "woman": {"women"},
+    "mouse": {"mice"},
+    "foot": {"feet"},
+    "tooth": {"teeth"},
+    "good": {"better", "best"},
+    "bad": {"worse", "worst"},
+}
+
+REJECTIONS = {
+    "empty": (0.0, "Please write a sentence using the word."),
+    "too_long": (2.0, "Please write a single sentence rather than a paragraph."),
+    "not_text": (0.0, "Your answer should be an English sentence made of words."),
+    "too_short": (1.0, "That is too short to be a sentence. Try writing a complete sentence with a subject and a verb."),
+    "gibberish": (0.0, "Your answer does not look like English words. Try writing a real sentence."),
+    "missing_word": (2.0, "Your sentence does not use the target word \"{word}\". Try again and include it."),
+}
+
+
+def tokenize(text: str) -> list:
+    return [token.lower().replace("’", "'") for token in TOKEN.findall(text)]
+
+
+def inflections(word: str) -> Set[str]:
+    """Regular English inflections of ``word`` plus known irregular forms."""
+
+    w = word.lower()
+    forms = {w, w + "s", w + "es", w + "ed", w + "ing", w + "er", w + "est", w + "ly", w + "'s"}
+    forms |= IRREGULAR.get(w, set())
+    if w.endswith("e"):
+        forms |= {w + "d", w[:-1] + "ing", w + "r", w + "st", w[:-1] + "y"}
+    if w.endswith("y") and len(w) > 2 and w[-2] not in VOWELS:
+        forms |= {w[:-1] + "ies", w[:-1] + "ied", w[:-1] + "ier", w[:-1] + "iest", w[:-1] + "ily"}
+    if w.endswith("le"):
+        forms.add(w[:-1] + "y")
+    if len(w) >= 3 and w[-1] not in VOWELS | {"w", "x"} and w[-2] in VOWELS and w[-3] not in VOWELS:
+        forms |= {w + w[-1] + "ed", w + w[-1] + "ing", w + w[-1] + "er", w + w[-1] + "est"}
+    if w.endswith("ic"):
+        forms |= {w + "ally", w + "ked", w + "king"}
+    return forms
+
+
+def _matches(target: str, tokens: Iterable[str]) -> bool:
+    forms = inflections(target)
+    for token in tokens:
+        if token in forms:
+            return True
+        # Generous fallback: shared stem with a short suffix (ambition/ambitious-ly,
+        # happi-ness). A false pass only costs one LLM call; a false reject
+        # would wrongly fail a student.
+        if len(target) >= 5 and token.startswith(target[:-2]) and 0 <= len(token) - len(target) <= 5:
+            return True
+    return False
+
+
+class PreValidator:
+    """Rule-based gate in front of the LLM.
+
+    ``check`` returns a deterministic low-score validation for sentences
+    that clearly fail (empty, not text, too short, gibberish, or missing
+    the target word in any inflected form) and None for anything plausible,
+    which then goes to n8n as before. Rules err towards passing: the LLM is
+    still the judge of every sentence that might be right.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None):
+        if enabled is None:
+            enabled = os.getenv("PREVALIDATE", "true").lower() == "true"
+        self.enabled = enabled
+        self.min_words = int(os.getenv("PREVALIDATE_MIN_WORDS", 2))
+        self.max_chars = int(os.getenv("PREVALIDATE_MAX_CHARS", 500))
+        self.checked = 0
+        self.rejected: Counter = Counter()
+
+    def check(self, word: str, sentence: str) -> Optional[Dict]:
+
+        if not self.enabled:
+            return None
+        self.checked += 1
+        reason = self._reason(word, sentence)
+        prevalidation_total.inc(reason or "passed")
+        if reason is None:
+            return None
+
+        self.rejected[reason] += 1
+        score, feedback = REJECTIONS[reason]
+        return {
+            "score": score,
+            "cefr_level": "A1",
+            "is_correct": False,
+            "feedback": feedback.format(word=word),
+            "corrected_sentence": None
+        }
+
+    def _reason(self, word: str, sentence: str) -> Optional[str]:
+
+        text = sentence.strip()
+        if not text:
+            return "empty"
+        if len(text) > self.max_chars:
+            return "too_long"
+
+        visible = [c for c in text if not c.isspace()]
+        letters = sum(1 for c in visible if c.isascii() and c.isalpha())
+        if letters / len(visible) < 0.5:
+            return "not_text"
+
+        tokens = tokenize(text)
+        if len(tokens) < self.min_words:
+            return "too_short"
+
+        long_tokens = [t for t in tokens if len(t) > 3]
+        implausible = [
+            t for t in long_tokens
+            if not VOWELS & set(t) or re.search(r"(.)\1\1", t) or re.search(r"[^aeiouy']{5,}", t)
+        ]
+        if long_tokens and len(implausible) * 2 > len(long_tokens):
+            return "gibberish"
+
+        if not all(_matches(part, tokens) for part in tokenize(word)):
+            return "missing_word"
+        return None
+
+    def stats(self, upstream_p50: Optional[float] = None) -> Dict:
+
+        rejected = sum(self.rejected.values())
+        return {
+            "enabled": self.enabled,
+            "checked": self.checked,
+            "rejected": rejected,
+            "passed": self.checked - rejected,
+            "rejection_rate": round(rejected / self.checked, 4) if self.checked else 0.0,
+            "by_reason": dict(self.rejected),
+            "estimated_saved_seconds": round(rejected * upstream_p50, 2) if upstream_p50 else None
+        }
@@ -0,0 +1,86 @@
+
+import os
+import time
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """Startup checks behind ``/ready``, kept apart from ``/health``.
+
+    ``/health`` only says the process is serving. ``/ready`` turns true once
+    every registered check (database reachable, schema migrated, pool
+    warmed) has passed. Checks that fail at startup do not stop the app from
+    booting; they are retried every ``retry_interval`` seconds until they
+    pass, so a replica started before its database comes up recovers on its
+    own.
+    """
+
+    def __init__(self):
+        self.timeout = float(os.getenv("READINESS_CHECK_TIMEOUT", 10.0))
+        self.retry_interval = float(os.getenv("READINESS_RETRY_INTERVAL", 5.0))
+        self._checks: Dict[str, Callable[[], Awaitable]] = {}
+        self._results: Dict[str, Dict] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.ready_after: Optional[float] = None
+        self._started_at = time.perf_counter()
+
+    def register(self, name: str, check: Callable[[], Awaitable]) -> None:
+        self._checks[name] = check
+
+    @property
+    def ready(self) -> bool:
+        return all(self._results.get(name, {}).get("ok") for name in self._checks)
+
+    async def start(self) -> None:
+
+        self._started_at = time.perf_counter()
+        await self._run_failed()
+        if not self.ready and self.retry_interval > 0:
+            self._task = asyncio.create_task(self._retry())
+
+    async def stop(self) -> None:
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _retry(self) -> None:
+
+        while not self.ready:
+            await asyncio.sleep(self.retry_interval)
+            await self._run_failed()
+
+    async def _run_failed(self) -> None:
+
+        # Checks run in registration order: later ones may rely on earlier ones.
+        for name, check in self._checks.items():
+            if self._results.get(name, {}).get("ok"):
+                continue
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(check(), self.timeout)
+                self._results[name] = {"ok": True, "seconds": round(time.perf_counter() - started, 4)}
+            except Exception as e:
+                error = str(e) or type(e).__name__
+                self._results[name] = {"ok": False, "error": error}
+                logger.warning(f"Readiness check {name} failed: {error}")
+                break
+        if self.ready and self.ready_after is None:
+            self.ready_after = round(time.perf_counter() - self._started_at, 4)
+            logger.info(f"Ready after {self.ready_after}s")
+
+    def stats(self) -> Dict:
+
+        return {
+            "ready": self.ready,
+            "ready_after_seconds": self.ready_after,
+            "checks": {name: self._results.get(name, {"ok": False, "error": "not run"}) for name in self._checks}
+        }
+
+
+readiness = Readiness()
@@ -0,0 +1,186 @@
+
+import io
+import os
+import csv
+import json
+import zlib
+import logging
+from decimal import Decimal
+from typing import AsyncIterator, Callable, Dict, List, Optional
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import AsyncSessionLocal
+from db.models import PracticeSession
+from services.practice_service import PracticeService
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = (
+    PracticeSession.id,
+    PracticeSession.word_id,
+    PracticeSession.user_sentence,
+    PracticeSession.score,
+    PracticeSession.cefr_level,
+    PracticeSession.feedback,
+    PracticeSession.corrected_sentence,
+    PracticeSession.practiced_at
+)
+FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet"
+}
+
+
+class ExportUnavailableError(Exception):
+    """The requested export format needs an optional dependency that is not installed."""
+
+
+def _plain(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+class NDJSONEncoder:
+
+    def encode(self, rows: List[Row]) -> bytes:
+        return "".join(
+            json.dumps({field: _plain(value) for field, value in zip(FIELDS, row)}) + "\n"
+            for row in rows
+        ).encode()
+
+    def close(self) -> bytes:
+        return b""
+
+
+class CSVEncoder:
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        self._writer.writerow(FIELDS)
+
+    def encode(self, rows: List[Row]) -> bytes:
+        self._writer.writerows([_plain(value) for value in row] for row in rows)
+        return self._drain()
+
+    def close(self) -> bytes:
+        return self._drain()
+
+    def _drain(self) -> bytes:
+        data = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+
+class _ByteSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+class ParquetEncoder:
+    """One row group per fetched batch, written out as soon as it is encoded."""
+
+    def __init__(self):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ExportUnavailableError("Parquet export requires pyarrow")
+        self._pa = pa
+        self._schema = pa.schema([
+            ("id", pa.int64()),
+            ("word_id", pa.int64()),
+            ("user_sentence", pa.string()),
+            ("score", pa.float64()),
+            ("cefr_level", pa.string()),
+            ("feedback", pa.string()),
+            ("corrected_sentence", pa.string()),
+            ("practiced_at", pa.timestamp("us"))
+        ])
+        self._sink = _ByteSink()
+        self._writer = pq.ParquetWriter(self._sink, self._schema, compression="snappy")
+
+    def encode(self, rows: List[Row]) -> bytes:
+        columns = list(zip(*rows))
+        columns[FIELDS.index("score")] = [None if v is None else float(v) for v in columns[FIELDS.index("score")]]
+        self._writer.write_table(self._pa.Table.from_arrays(
+            [self._pa.array(values, type=field.type) for values, field in zip(columns, self._schema)],
+            schema=self._schema
+        ))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+ENCODERS: Dict[str, Callable] = {
+    "ndjson": NDJSONEncoder,
+    "csv": CSVEncoder,
+    "parquet": ParquetEncoder
+}
+
+
+async def export_sessions(
+    fmt: str,
+    gzip: bool = False,
+    session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+    batch_size: Optional[int] = None,
+    **filters
+) -> AsyncIterator[bytes]:
+    """Stream completed sessions matching ``filters`` as encoded chunks.
+
+    Rows come off a server-side cursor ``batch_size`` at a time and are
+    encoded (and optionally gzipped) before the next batch is fetched, so
+    memory stays flat however large the export is. The encoder is built
+    before the first yield, so an unavailable format fails fast.
+    """
+    encoder = ENCODERS[fmt]()
+    batch_size = batch_size or int(os.getenv("EXPORT_BATCH_SIZE", 5000))
+    return _stream(encoder, gzip, session_factory, batch_size, filters)
+
+
+async def _stream(encoder, gzip: bool, session_factory, batch_size: int, filters: Dict) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    exported = 0
+
+    async with session_factory() as db:
+        async for rows in PracticeService(db).stream_sessions(EXPORT_COLUMNS, batch_size, **filters):
+            exported += len(rows)
+            chunk = encoder.encode(rows)
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+
+    tail = encoder.close()
+    if compressor is not None:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
+    logger.info(f"Exported {exported} practice sessions")
@@ -0,0 +1,154 @@
+
+import os
+import asyncio
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import AsyncSessionLocal
+from db.models import PracticeSession
+from services.invalidation import invalidation_bus
+from services.stats_aggregates import record_sessions
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = (
+    "word_id",
+    "user_sentence",
+    "score",
+    "cefr_level",
+    "feedback",
+    "corrected_sentence",
+    "practiced_at",
+    "status"
+)
+
+
+class SessionWriteBuffer:
+    """Write-behind buffer for practice sessions.
+
+    ``write`` parks the row in memory and waits; a background flusher
+    inserts everything buffered with one multi-row ``INSERT ... RETURNING``
+    when ``batch_size`` rows are waiting or every ``flush_interval``
+    seconds, then hands each waiter its id. At most ``capacity`` rows may
+    be buffered; further writers wait for a flush (backpressure). ``stop``
+    flushes whatever is left, so a graceful shutdown loses nothing.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal
+    ):
+        if enabled is None:
+            enabled = os.getenv("SESSION_WRITE_BEHIND", "false").lower() == "true"
+        self.enabled = enabled
+        self.batch_size = int(os.getenv("SESSION_WRITE_BATCH_SIZE", 100))
+        self.flush_interval = float(os.getenv("SESSION_WRITE_FLUSH_INTERVAL", 0.05))
+        self.capacity = int(os.getenv("SESSION_WRITE_CAPACITY", 1000))
+        self.session_factory = session_factory
+
+        self._buffer: List[Tuple[Dict, asyncio.Future]] = []
+        self._space: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._closing = False
+        self.flushes = 0
+        self.rows_written = 0
+
+    async def start(self) -> None:
+
+        if not self.enabled or self._flusher is not None:
+            return
+        self._closing = False
+        self._space = asyncio.Semaphore(self.capacity)
+        self._wakeup = asyncio.Event()
+        self._flusher = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+
+        if self._flusher is None:
+            return
+        self._closing = True
+        self._wakeup.set()
+        await self._flusher
+        self._flusher = None
+
+    async def write(self, session: PracticeSession) -> PracticeSession:
+
+        if self._flusher is None:
+            await self.start()
+        if self._closing:
+            raise RuntimeError("session writer is shutting down")
+
+        row = {column: getattr(session, column) for column in COLUMNS}
+        # Column defaults are not applied to explicit NULLs in an executemany.
+        row["status"] = row["status"] or "completed"
+
+        await self._space.acquire()
+        future = asyncio.get_running_loop().create_future()
+        if self._closing:
+            # stop() began while we waited for space; the flusher may already
+            # have drained its last batch, so nothing would pick this row up.
+            await self._flush([(row, future)])
+        else:
+            self._buffer.append((row, future))
+            if len(self._buffer) >= self.batch_size:
+                self._wakeup.set()
+
+        session.id = await future
+        return session
+
+    async def _run(self) -> None:
+
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            while self._buffer:
+                batch, self._buffer = self._buffer[:self.batch_size], self._buffer[self.batch_size:]
+                await self._flush(batch)
+
+            if self._closing:
+                return
+
+    async def _flush(self, batch: List[Tuple[Dict, asyncio.Future]]) -> None:
+
+        try:
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    insert(PracticeSession).returning(PracticeSession.id, sort_by_parameter_order=True),
+                    [row for row, _ in batch]
+                )
+                ids = list(result.scalars())
+                await record_sessions(db, [row for row, _ in batch])
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Write-behind flush of {len(batch)} sessions failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            invalidation_bus.publish("dashboard")
+            self.flushes += 1
+            self.rows_written += len(batch)
+            for (_, future), session_id in zip(batch, ids):
+                if not future.done():
+                    future.set_result(session_id)
+        finally:
+            for _ in batch:
+                self._space.release()
+
+    def stats(self) -> Dict:
+
+        return {
+            "enabled": self.enabled,
+            "buffered": len(self._buffer),
+            "capacity": self.capacity,
+            "flushes": self.flushes,
+            "rows_written": self.rows_written,
+            "avg_batch": round(self.rows_written / self.flushes, 2) if self.flushes else 0.0
+        }
@@ -0,0 +1,283 @@
+
+import os
+import re
+import time
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+from zlib import crc32
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import AsyncSessionLocal
+from db.models import PracticeSession
+
+logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 2
+NUM_PERM = 32
+BANDS = 8
+ROWS = NUM_PERM // BANDS
+# Candidates must share this many bands. At J=0.9 a pair shares ~5 of 8, and
+# the odds of sharing fewer than 2 are ~0.4%; most unrelated pairs share one.
+MIN_BAND_HITS = 2
+# crc32 // NUM_PERM stays below 2**27; borrowed values are offset past that.
+EMPTY = 1 << 40
+OFFSET = 1 << 27
+
+PUNCTUATION = re.compile(r"[^\w\s']")
+# Swapping one article for another is the most common resubmission, so all
+# three shingle as the same token.
+ARTICLES = frozenset(("a", "an", "the"))
+ARTICLE = "<det>"
+
+
+def normalize(sentence: str) -> str:
+    """Case, whitespace and punctuation-insensitive form of a sentence."""
+
+    text = sentence.casefold().replace("’", "'")
+    return " ".join(PUNCTUATION.sub(" ", text).split())
+
+
+def shingles(text: str, fold_articles: bool = True) -> FrozenSet[str]:
+    """Word bigrams of a normalized sentence, padded so the first and last
+    words count as much as the rest."""
+
+    tokens = text.split()
+    if fold_articles:
+        tokens = [ARTICLE if token in ARTICLES else token for token in tokens]
+    tokens = ["<s>"] + tokens + ["</s>"]
+    return frozenset(" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """One-permutation MinHash: a single hash per shingle, split into
+    ``num_bins`` bins by its low bits, keeping the minimum per bin. Empty
+    bins borrow from the next non-empty bin (rotation densification), so
+    the bins behave like ``num_bins`` independent MinHash values at the cost
+    of one hash per shingle instead of ``num_bins``."""
+
+    def __init__(self, num_bins: int = NUM_PERM):
+        self.num_bins = num_bins
+
+    def signature(self, shingle_set: FrozenSet[str]) -> Tuple[int, ...]:
+        bins = self.num_bins
+        mins = [EMPTY] * bins
+        for shingle in shingle_set:
+            h = crc32(shingle.encode("utf-8"))
+            b, v = h % bins, h // bins
+            if v < mins[b]:
+                mins[b] = v
+        if EMPTY in mins and any(v != EMPTY for v in mins):
+            dense = list(mins)
+            for b in range(bins):
+                if mins[b] == EMPTY:
+                    step = 1
+                    while mins[(b + step) % bins] == EMPTY:
+                        step += 1
+                    dense[b] = mins[(b + step) % bins] + step * OFFSET
+            mins = dense
+        return tuple(mins)
+
+
+def bands(signature: Tuple[int, ...]) -> List[Tuple]:
+    return [(band, signature[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+
+class _WordIndex:
+    """Entries for one word, keyed by normalized sentence, plus LSH buckets."""
+
+    def __init__(self):
+        self.entries: "OrderedDict[str, Tuple[FrozenSet[str], Tuple, Dict]]" = OrderedDict()
+        self.buckets: Dict[Tuple, set] = {}
+
+    def add(self, text: str, shingle_set: FrozenSet[str], signature: Tuple, result: Dict, limit: int) -> None:
+
+        if text in self.entries:
+            self.entries.move_to_end(text)
+            self.entries[text] = (shingle_set, signature, result)
+            return
+        self.entries[text] = (shingle_set, signature, result)
+        for band in bands(signature):
+            self.buckets.setdefault(band, set()).add(text)
+        while len(self.entries) > limit:
+            evicted, (_, old_signature, _) = self.entries.popitem(last=False)
+            for band in bands(old_signature):
+                bucket = self.buckets.get(band)
+                if bucket is not None:
+                    bucket.discard(evicted)
+                    if not bucket:
+                        del self.buckets[band]
+
+    def candidates(self, signature: Tuple) -> List[str]:
+
+        hits: Counter = Counter()
+        for band in bands(signature):
+            bucket = self.buckets.get(band)
+            if bucket:
+                hits.update(bucket)
+        return [text for text, n in hits.items() if n >= MIN_BAND_HITS]
+
+
+class SimilarSentenceIndex:
+    """Reuses verdicts for near-duplicate sentences of the same word.
+
+    Each word_id has a MinHash/LSH index over word bigrams of the normalized
+    sentence (case, whitespace and punctuation removed), with a, an and the
+    folded into one token unless ``SIMILAR_SENTENCE_FOLD_ARTICLES=false``.
+    LSH (8 bands of 4 rows, at least 2 shared) only proposes candidates; a
+    candidate is reused when its exact shingle Jaccard similarity is at
+    least ``threshold``.
+
+    At the default 0.9, formatting variants and article swaps are reused,
+    while changing, adding or dropping any other word breaks two bigrams and
+    falls well below it. Folding articles means "a apple" reuses the verdict
+    for "an apple"; that is the trade-off the article swap asks for.
+    Entries come from graded sentences as they are validated, and
+    ``rebuild`` reloads the most recent completed sessions at startup.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession] = AsyncSessionLocal):
+        self.session_factory = session_factory
+        self.enabled = os.getenv("SIMILAR_SENTENCE_REUSE", "true").lower() == "true"
+        self.threshold = float(os.getenv("SIMILAR_SENTENCE_THRESHOLD", 0.9))
+        self.fold_articles = os.getenv("SIMILAR_SENTENCE_FOLD_ARTICLES", "true").lower() == "true"
+        self.max_per_word = int(os.getenv("SIMILAR_SENTENCE_MAX_PER_WORD", 1000))
+        self.rebuild_rows = int(os.getenv("SIMILAR_SENTENCE_REBUILD_ROWS", 50000))
+        self.hasher = MinHasher()
+        self._words: Dict[int, _WordIndex] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.lookups = 0
+        self.hits = 0
+        self.rebuilt_rows = 0
+        self.rebuild_seconds: Optional[float] = None
+
+    def add(self, word_id: int, sentence: str, result: Dict) -> None:
+
+        if not self.enabled:
+            return
+        text = normalize(sentence)
+        corrected = result.get("corrected_sentence")
+        entry = {
+            "score": result["score"],
+            "cefr_level": result["cefr_level"],
+            "is_correct": result.get("is_correct", True),
+            "feedback": result["feedback"],
+            # "No correction" must not hand the old sentence back as one.
+            "corrected_sentence": corrected if corrected and normalize(corrected) != text else None
+        }
+        shingle_set = shingles(text, self.fold_articles)
+        index = self._words.setdefault(word_id, _WordIndex())
+        index.add(text, shingle_set, self.hasher.signature(shingle_set), entry, self.max_per_word)
+
+    def lookup(self, word_id: int, sentence: str) -> Optional[Tuple[Dict, float]]:
+        """The verdict of the most similar graded sentence and its similarity,
+        or None when nothing reaches ``threshold``."""
+
+        if not self.enabled:
+            return None
+        self.lookups += 1
+        index = self._words.get(word_id)
+        if index is None:
+            return None
+
+        text = normalize(sentence)
+        exact = index.entries.get(text)
+        if exact is not None:
+            self.hits += 1
+            return dict(exact[2]), 1.0
+
+        shingle_set = shingles(text, self.fold_articles)
+        best, best_similarity = None, self.threshold
+        for candidate in index.candidates(self.hasher.signature(shingle_set)):
+            similarity = jaccard(shingle_set, index.entries[candidate][0])
+            if similarity >= best_similarity:
+                best, best_similarity = candidate, similarity
+        if best is None:
+            return None
+        self.hits += 1
+        return dict(index.entries[best][2]), round(best_similarity, 4)
+
+    async def start(self) -> None:
+
+        if self.enabled and self.rebuild_rows > 0:
+            self._task = asyncio.create_task(self._rebuild_logged())
+
+    async def stop(self) -> None:
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _rebuild_logged(self) -> None:
+
+        try:
+            await self.rebuild()
+        except Exception as e:
+            logger.error(f"Similar sentence index rebuild failed: {e}")
+
+    async def rebuild(self, batch_size: int = 5000) -> int:
+        """Load the ``rebuild_rows`` most recent graded sessions, oldest first
+        so the newest verdicts win and survive per-word eviction."""
+
+        started = time.perf_counter()
+        columns = (
+            PracticeSession.word_id,
+            PracticeSession.user_sentence,
+            PracticeSession.score,
+            PracticeSession.cefr_level,
+            PracticeSession.feedback,
+            PracticeSession.corrected_sentence
+        )
+        async with self.session_factory() as db:
+            rows = []
+            result = await db.stream(
+                select(*columns)
+                .where(PracticeSession.status == "completed")
+                # Fallback verdicts were never graded by the model.
+                .where(PracticeSession.feedback.not_like("[Mock%"))
+                .order_by(PracticeSession.practiced_at.desc(), PracticeSession.id.desc())
+                .limit(self.rebuild_rows)
+                .execution_options(yield_per=batch_size)
+            )
+            async for partition in result.partitions():
+                rows.extend(partition)
+                await asyncio.sleep(0)
+
+        for n, (word_id, sentence, score, cefr_level, feedback, corrected) in enumerate(reversed(rows)):
+            if n % 1000 == 0:
+                # ~40ms of hashing per thousand rows; let requests run in between.
+                await asyncio.sleep(0)
+            self.add(word_id, sentence, {
+                "score": float(score),
+                "cefr_level": cefr_level,
+                # Not stored per session; a sentence that needed no correction was correct.
+                "is_correct": not corrected or normalize(corrected) == normalize(sentence),
+                "feedback": feedback,
+                "corrected_sentence": corrected
+            })
+        self.rebuilt_rows = len(rows)
+        self.rebuild_seconds = round(time.perf_counter() - started, 3)
+        logger.info(f"Similar sentence index rebuilt from {len(rows)} sessions in {self.rebuild_seconds}s")
+        return len(rows)
+
+    def stats(self) -> Dict:
+
+        return {
+            "enabled": self.enabled,
+            "threshold": self.threshold,
+            "words": len(self._words),
+            "entries": sum(len(index.entries) for index in self._words.values()),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "rebuilt_rows": self.rebuilt_rows,
+            "rebuild_seconds": self.rebuild_seconds
+        }
@@ -0,0 +1,325 @@
+
+import os
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, Optional, Tuple
+from sqlalchemy import Date, and_, delete, func, select, text, type_coerce
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import AsyncSessionLocal
+from db.models import PracticeLevelCount, PracticeSession, PracticeStats, WordScoreDaily, WordScoreTotal
+from services.invalidation import invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+# pg_try_advisory_xact_lock key; only one worker reconciles at a time.
+ADVISORY_LOCK_KEY = 0x73746174
+
+
+def _insert(db: AsyncSession):
+    dialect = db.get_bind().dialect.name
+    return (postgresql if dialect == "postgresql" else sqlite).insert
+
+
+def _field(session, name: str):
+    return session[name] if isinstance(session, dict) else getattr(session, name)
+
+
+async def record_sessions(db: AsyncSession, sessions: Iterable) -> None:
+    """Fold newly completed sessions into the summary tables.
+
+    Runs inside the caller's transaction, so the aggregates commit or roll
+    back together with the rows. ``sessions`` are objects or dicts with
+    ``word_id``, ``score``, ``cefr_level`` and ``practiced_at``. Locks are
+    always taken stats row first, then every other table in sorted key
+    order, matching ``reconcile``.
+    """
+    total = scored = 0
+    score_sum = Decimal(0)
+    levels: Counter = Counter()
+    daily: Counter = Counter()
+    for session in sessions:
+        score = _field(session, "score")
+        level = _field(session, "cefr_level")
+        total += 1
+        if score is not None:
+            scored += 1
+            score_sum += Decimal(str(score))
+        if level is not None:
+            levels[level] += 1
+        if score is not None and level is not None:
+            practiced_at = _field(session, "practiced_at") or datetime.utcnow()
+            key_score = Decimal(str(score)).quantize(Decimal("0.1"))
+            daily[(practiced_at.date(), _field(session, "word_id"), level, key_score)] += 1
+
+    if not total:
+        return
+
+    insert = _insert(db)
+    stats = insert(PracticeStats).values(
+        id=1,
+        total_sessions=total,
+        scored_sessions=scored,
+        score_sum=score_sum,
+        updated_at=datetime.utcnow()
+    )
+    await db.execute(stats.on_conflict_do_update(
+        index_elements=[PracticeStats.id],
+        set_={
+            "total_sessions": PracticeStats.total_sessions + stats.excluded.total_sessions,
+            "scored_sessions": PracticeStats.scored_sessions + stats.excluded.scored_sessions,
+            "score_sum": PracticeStats.score_sum + stats.excluded.score_sum,
+            "updated_at": stats.excluded.updated_at
+        }
+    ))
+
+    for level in sorted(levels):
+        counts = insert(PracticeLevelCount).values(cefr_level=level, sessions=levels[level])
+        await db.execute(counts.on_conflict_do_update(
+            index_elements=[PracticeLevelCount.cefr_level],
+            set_={"sessions": PracticeLevelCount.sessions + counts.excluded.sessions}
+        ))
+
+    if daily:
+        totals: Counter = Counter()
+        for (_, word_id, level, score), sessions_count in daily.items():
+            totals[(word_id, level, score)] += sessions_count
+        await _bump(db, WordScoreDaily, ("day", "word_id", "cefr_level", "score"), daily)
+        await _bump(db, WordScoreTotal, ("word_id", "cefr_level", "score"), totals)
+
+
+async def _bump(db: AsyncSession, model, keys: Tuple[str, ...], counts: Counter) -> None:
+
+    upsert = _insert(db)(model)
+    await db.execute(
+        upsert.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={"sessions": model.sessions + upsert.excluded.sessions}
+        ),
+        [{**dict(zip(keys, key)), "sessions": counts[key]} for key in sorted(counts)]
+    )
+
+
+async def read_statistics(db: AsyncSession) -> Optional[Dict]:
+    """O(1) dashboard numbers from the summary tables; None if never initialised."""
+    stats = await db.get(PracticeStats, 1)
+    if stats is None:
+        return None
+
+    most_common = (await db.execute(
+        select(PracticeLevelCount.cefr_level)
+        .where(PracticeLevelCount.sessions > 0)
+        .order_by(PracticeLevelCount.sessions.desc())
+        .limit(1)
+    )).scalar()
+
+    return {
+        "total_sessions": stats.total_sessions,
+        "average_score": float(stats.score_sum / stats.scored_sessions) if stats.scored_sessions else 0.0,
+        "most_common_level": most_common or "N/A"
+    }
+
+
+async def reconcile(db: AsyncSession) -> Dict:
+    """Correct drift in every summary table against a scan of practice_sessions.
+
+    The scan and the current summary rows are read from one snapshot
+    without locking anything, so writers are never held up by the scan.
+    Only the difference between the two is then applied, in a short
+    transaction that takes locks in the same order as ``record_sessions``;
+    sessions committed during the scan are in neither side of the
+    difference and keep their increments. ``db`` must not be inside a
+    transaction. Two concurrent runs would apply the same correction twice,
+    which is why ``StatsReconciler`` holds an advisory lock around it.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    scanned = await _scan(db)
+    current = await _current(db)
+    await db.rollback()
+
+    drift = {table: _subtract(scanned[table], current[table]) for table in scanned}
+    await _apply(db, drift)
+    await db.commit()
+
+    return await read_statistics(db)
+
+
+async def _scan(db: AsyncSession) -> Dict[str, Counter]:
+
+    completed = PracticeSession.status == "completed"
+    total, scored, score_sum = (await db.execute(
+        select(func.count(PracticeSession.id), func.count(PracticeSession.score), func.sum(PracticeSession.score))
+        .where(completed)
+    )).one()
+    levels = (await db.execute(
+        select(PracticeSession.cefr_level, func.count(PracticeSession.id))
+        .where(completed, PracticeSession.cefr_level.isnot(None))
+        .group_by(PracticeSession.cefr_level)
+    )).all()
+
+    rolled = and_(completed, PracticeSession.score.isnot(None), PracticeSession.cefr_level.isnot(None))
+    day = type_coerce(func.date(PracticeSession.practiced_at), Date)
+    daily = Counter({
+        (row_day, word_id, level, score): sessions
+        for row_day, word_id, level, score, sessions in (await db.execute(
+            select(day, PracticeSession.word_id, PracticeSession.cefr_level, PracticeSession.score, func.count())
+            .where(rolled)
+            .group_by(day, PracticeSession.word_id, PracticeSession.cefr_level, PracticeSession.score)
+        )).all()
+    })
+    totals: Counter = Counter()
+    for (_, word_id, level, score), sessions in daily.items():
+        totals[(word_id, level, score)] += sessions
+
+    return {
+        "stats": Counter({"total_sessions": total, "scored_sessions": scored, "score_sum": Decimal(score_sum or 0)}),
+        "levels": Counter(dict(levels)),
+        "daily": daily,
+        "totals": totals
+    }
+
+
+async def _current(db: AsyncSession) -> Dict[str, Counter]:
+
+    stats = await db.get(PracticeStats, 1)
+    return {
+        "stats": Counter({
+            "total_sessions": stats.total_sessions if stats else 0,
+            "scored_sessions": stats.scored_sessions if stats else 0,
+            "score_sum": Decimal(stats.score_sum) if stats else Decimal(0)
+        }),
+        "levels": Counter(dict((await db.execute(
+            select(PracticeLevelCount.cefr_level, PracticeLevelCount.sessions)
+        )).all())),
+        "daily": Counter({
+            (day, word_id, level, score): sessions
+            for day, word_id, level, score, sessions in (await db.execute(select(
+                WordScoreDaily.day, WordScoreDaily.word_id, WordScoreDaily.cefr_level,
+                WordScoreDaily.score, WordScoreDaily.sessions
+            ))).all()
+        }),
+        "totals": Counter({
+            (word_id, level, score): sessions
+            for word_id, level, score, sessions in (await db.execute(select(
+                WordScoreTotal.word_id, WordScoreTotal.cefr_level, WordScoreTotal.score, WordScoreTotal.sessions
+            ))).all()
+        })
+    }
+
+
+def _subtract(scanned: Counter, current: Counter) -> Counter:
+
+    # Counter subtraction drops negatives; a correction needs them.
+    return Counter({
+        key: scanned.get(key, 0) - current.get(key, 0)
+        for key in set(scanned) | set(current)
+        if scanned.get(key, 0) != current.get(key, 0)
+    })
+
+
+async def _apply(db: AsyncSession, drift: Dict[str, Counter]) -> None:
+
+    insert = _insert(db)
+    # Always upserted, so a database without a stats row gets one.
+    stats = insert(PracticeStats).values(
+        id=1,
+        total_sessions=drift["stats"].get("total_sessions", 0),
+        scored_sessions=drift["stats"].get("scored_sessions", 0),
+        score_sum=drift["stats"].get("score_sum", 0),
+        updated_at=datetime.utcnow()
+    )
+    await db.execute(stats.on_conflict_do_update(
+        index_elements=[PracticeStats.id],
+        set_={
+            "total_sessions": PracticeStats.total_sessions + stats.excluded.total_sessions,
+            "scored_sessions": PracticeStats.scored_sessions + stats.excluded.scored_sessions,
+            "score_sum": PracticeStats.score_sum + stats.excluded.score_sum,
+            "updated_at": stats.excluded.updated_at
+        }
+    ))
+
+    for level in sorted(drift["levels"]):
+        counts = insert(PracticeLevelCount).values(cefr_level=level, sessions=drift["levels"][level])
+        await db.execute(counts.on_conflict_do_update(
+            index_elements=[PracticeLevelCount.cefr_level],
+            set_={"sessions": PracticeLevelCount.sessions + counts.excluded.sessions}
+        ))
+    if drift["daily"]:
+        await _bump(db, WordScoreDaily, ("day", "word_id", "cefr_level", "score"), drift["daily"])
+    if drift["totals"]:
+        await _bump(db, WordScoreTotal, ("word_id", "cefr_level", "score"), drift["totals"])
+    for model in (PracticeLevelCount, WordScoreDaily, WordScoreTotal):
+        await db.execute(delete(model).where(model.sessions <= 0))
+
+
+class StatsReconciler:
+    """Background job that periodically runs ``reconcile``."""
+
+    def __init__(self, session_factory: Callable[[], AsyncSession] = AsyncSessionLocal):
+        self.session_factory = session_factory
+        self.interval = float(os.getenv("STATS_RECONCILE_INTERVAL", 3600.0))
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.skipped = 0
+
+    async def run_once(self, wait: bool = False) -> Optional[Dict]:
+        """Reconcile unless another worker is already doing so (then None);
+        with ``wait``, queue behind that run instead of skipping."""
+
+        async with self.session_factory() as lock_db:
+            # Held by lock_db's open transaction until the reconcile is done.
+            if not await self._lock(lock_db, wait):
+                self.skipped += 1
+                logger.info("Dashboard aggregates are being reconciled on another worker; skipped")
+                return None
+            async with self.session_factory() as db:
+                result = await reconcile(db)
+        invalidation_bus.publish("dashboard")
+        self.runs += 1
+        logger.info(f"Dashboard aggregates reconciled: {result}")
+        return result
+
+    async def _lock(self, db: AsyncSession, wait: bool) -> bool:
+
+        if db.get_bind().dialect.name != "postgresql":
+            return True
+        if wait:
+            await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            return True
+        return bool((await db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"),
+            {"key": ADVISORY_LOCK_KEY}
+        )).scalar())
+
+    async def start(self) -> None:
+
+        # A database created without init.sql has no stats row yet; build it now.
+        try:
+            async with self.session_factory() as db:
+                initialised = await db.get(PracticeStats, 1) is not None
+            if not initialised:
+                await self.run_once()
+        except Exception as e:
+            logger.error(f"Dashboard aggregate reconcile failed: {e}")
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Dashboard aggregate reconcile failed: {e}")
@@ -0,0 +1,122 @@
+
+import os
+import asyncio
+import logging
+from collections import Counter
+from typing import Callable, Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import AsyncSessionLocal
+from services.practice_service import PracticeService
+
+logger = logging.getLogger(__name__)
+
+
+class InMemorySubmitQueue:
+    """Process-local queue of pending session ids. Pending rows are not
+    recovered after a restart; use the Postgres queue when that matters."""
+
+    name = "memory"
+
+    def __init__(self, maxsize: int = 0):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    async def put(self, session_id: int) -> None:
+        await self._queue.put(session_id)
+
+    async def get(self) -> int:
+        return await self._queue.get()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+
+class PostgresSubmitQueue:
+    """Durable queue backed by ``practice_sessions.status``.
+
+    ``put`` is only a local wake-up: the pending row committed by the route
+    already is the job. ``get`` claims the oldest pending row with
+    ``FOR UPDATE SKIP LOCKED`` so workers on every replica share the load,
+    and polls every ``poll_interval`` seconds for rows written elsewhere.
+    A claim holds for ``lease`` seconds; a row still ``processing`` after
+    that (its worker crashed or was redeployed) is claimed again, so the
+    lease must outlast the slowest validation.
+    """
+
+    name = "postgres"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        poll_interval: float = 1.0,
+        lease: float = 300.0
+    ):
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self._wakeup = asyncio.Event()
+
+    async def put(self, session_id: int) -> None:
+        self._wakeup.set()
+
+    async def get(self) -> int:
+        while True:
+            session_id = await self._claim()
+            if session_id is not None:
+                return session_id
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim(self) -> Optional[int]:
+        try:
+            async with self.session_factory() as db:
+                return await PracticeService(db).claim_pending_session(self.lease)
+        except Exception as e:
+            logger.error(f"Failed to claim pending session: {e}")
+            return None
+
+    def qsize(self) -> int:
+        return -1
+
+
+class SessionNotifier:
+    """Wakes local status/SSE waiters when a session finishes."""
+
+    def __init__(self):
+        self._events: Dict[int, asyncio.Event] = {}
+        self._waiting: Counter = Counter()
+
+    def notify(self, session_id: int) -> None:
+        event = self._events.pop(session_id, None)
+        if event is not None:
+            event.set()
+
+    async def wait(self, session_id: int, timeout: float) -> bool:
+        event = self._events.setdefault(session_id, asyncio.Event())
+        self._waiting[session_id] += 1
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            # Drop the event with its last waiter, or every timed-out wait leaks one.
+            self._waiting[session_id] -= 1
+            if not self._waiting[session_id]:
+                del self._waiting[session_id]
+                if self._events.get(session_id) is event:
+                    del self._events[session_id]
+
+
+def create_submit_queue(backend: Optional[str] = None):
+    backend = backend or os.getenv("SUBMIT_QUEUE_BACKEND", "memory")
+    if backend == "postgres":
+        return PostgresSubmitQueue(
+            poll_interval=float(os.getenv("SUBMIT_QUEUE_POLL_INTERVAL", 1.0)),
+            lease=float(os.getenv("SUBMIT_CLAIM_LEASE", 300.0))
+        )
+    if backend == "memory":
+        return InMemorySubmitQueue(maxsize=int(os.getenv("SUBMIT_QUEUE_MAXSIZE", 0)))
+    raise ValueError(f"Unknown SUBMIT_QUEUE_BACKEND: {backend}")
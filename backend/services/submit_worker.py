@@ -0,0 +1,133 @@
+
+import os
+import asyncio
+import logging
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import AsyncSessionLocal
+from services.ai_service import AIService
+from services.concurrency import OverloadedError
+from services.practice_service import PracticeService
+from services.submit_queue import SessionNotifier
+from services.vocab_service import VocabService
+
+logger = logging.getLogger(__name__)
+
+
+class SubmitWorkerPool:
+    """Drains the submit queue: looks up the word, validates the sentence and
+    writes the verdict onto the pending ``PracticeSession`` row."""
+
+    def __init__(
+        self,
+        queue,
+        vocab_service: VocabService,
+        ai_service: AIService,
+        notifier: Optional[SessionNotifier] = None,
+        workers: Optional[int] = None,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal
+    ):
+        self.queue = queue
+        self.vocab_service = vocab_service
+        self.ai_service = ai_service
+        self.notifier = notifier or SessionNotifier()
+        self.workers = workers or int(os.getenv("SUBMIT_WORKERS", 4))
+        self.max_attempts = int(os.getenv("SUBMIT_MAX_ATTEMPTS", 5))
+        self.session_factory = session_factory
+        self._tasks: List[asyncio.Task] = []
+        self.processed = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+        logger.info(f"Started {self.workers} submit workers ({self.queue.name} queue)")
+
+    async def stop(self) -> None:
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self) -> None:
+
+        while True:
+            session_id = await self.queue.get()
+            try:
+                await self.process(session_id)
+            except Exception as e:
+                logger.error(f"Submit worker failed on session {session_id}: {e}")
+
+    async def process(self, session_id: int) -> None:
+
+        job = await self._load(session_id)
+        if job is None:
+            return
+        word_id, user_sentence = job
+
+        try:
+            word = await self.vocab_service.get_word_by_id(word_id)
+            if not word:
+                await self._fail(session_id, "Word not found")
+                return
+
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    result = await self.ai_service.validate_sentence(
+                        word=word["word"],
+                        definition=word["definition"],
+                        sentence=user_sentence,
+                        word_id=word_id,
+                        difficulty=word.get("difficulty_level")
+                    )
+                    break
+                except OverloadedError as e:
+                    if attempt == self.max_attempts:
+                        raise
+                    await asyncio.sleep(e.retry_after)
+
+            await self._complete(session_id, result)
+            self.processed += 1
+
+        except Exception as e:
+            await self._fail(session_id, f"Validation failed: {e}")
+            raise
+
+        finally:
+            self.notifier.notify(session_id)
+
+    async def _load(self, session_id: int) -> Optional[Tuple[int, str]]:
+
+        async with self.session_factory() as db:
+            session = await PracticeService(db).get_session(session_id)
+            if session is None or session.status not in ("pending", "processing"):
+                return None
+            return session.word_id, session.user_sentence
+
+    async def _complete(self, session_id: int, result: dict) -> None:
+
+        async with self.session_factory() as db:
+            await PracticeService(db).complete_session(
+                session_id,
+                score=result["score"],
+                cefr_level=result["cefr_level"],
+                feedback=result["feedback"],
+                corrected_sentence=result.get("corrected_sentence")
+            )
+
+    async def _fail(self, session_id: int, reason: str) -> None:
+
+        self.failed += 1
+        async with self.session_factory() as db:
+            await PracticeService(db).fail_session(session_id, reason)
+
+    def stats(self) -> dict:
+
+        return {
+            "backend": self.queue.name,
+            "workers": len(self._tasks),
+            "queued": self.queue.qsize(),
+            "processed": self.processed,
+            "failed": self.failed
+        }
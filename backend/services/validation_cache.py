@@ -0,0 +1,117 @@
+
+import os
+import hashlib
+import logging
+from typing import Dict, Optional
+from sqlalchemy.dialects.postgresql import insert
+from db.database import AsyncSessionLocal
+from db.models import ValidationCacheEntry
+from services.cache import MISSING, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_sentence(sentence: str) -> str:
+    return " ".join(sentence.split()).casefold()
+
+
+def validation_key(word: str, sentence: str) -> str:
+    """Content address of a validation: sha256 over the normalized word and sentence."""
+    normalized = f"{word.strip().casefold()}\x00{normalize_sentence(sentence)}"
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class ValidationCache:
+    """Two-tier cache of AI validation results.
+
+    The memory tier is an LRU ``TTLCache``. The optional persistent tier is
+    the ``validation_cache`` table (``VALIDATION_CACHE_PERSIST=true``), read
+    on memory misses and written through on every store, so verdicts
+    survive restarts. Persistent-tier errors are logged and treated as
+    misses; the cache never fails a validation.
+    """
+
+    def __init__(self, persistent: Optional[bool] = None):
+        self.memory = TTLCache(
+            maxsize=int(os.getenv("VALIDATION_CACHE_SIZE", 10000)),
+            ttl=float(os.getenv("VALIDATION_CACHE_TTL", 7 * 24 * 3600))
+        )
+        if persistent is None:
+            persistent = os.getenv("VALIDATION_CACHE_PERSIST", "false").lower() == "true"
+        self.persistent = persistent
+
+        self.persistent_hits = 0
+        self.saved_seconds = 0.0
+        self._upstream_seconds = 0.0
+        self._upstream_calls = 0
+
+    async def get(self, key: str) -> Optional[Dict]:
+
+        result = self.memory.get(key)
+        if result is not MISSING:
+            self._record_saving()
+            return result
+
+        if self.persistent:
+            result = await self._load(key)
+            if result is not None:
+                self.persistent_hits += 1
+                self.memory.set(key, result)
+                self._record_saving()
+                return result
+
+        return None
+
+    async def set(self, key: str, word: str, result: Dict) -> None:
+
+        self.memory.set(key, result)
+        if self.persistent:
+            await self._store(key, word, result)
+
+    def record_upstream_latency(self, seconds: float) -> None:
+
+        self._upstream_seconds += seconds
+        self._upstream_calls += 1
+
+    def _record_saving(self) -> None:
+
+        if self._upstream_calls:
+            self.saved_seconds += self._upstream_seconds / self._upstream_calls
+
+    async def _load(self, key: str) -> Optional[Dict]:
+
+        try:
+            async with AsyncSessionLocal() as db:
+                entry = await db.get(ValidationCacheEntry, key)
+                return dict(entry.result) if entry else None
+        except Exception as e:
+            logger.error(f"Validation cache read failed: {e}")
+            return None
+
+    async def _store(self, key: str, word: str, result: Dict) -> None:
+
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    insert(ValidationCacheEntry)
+                    .values(key=key, word=word, result=result)
+                    .on_conflict_do_nothing(index_elements=["key"])
+                )
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Validation cache write failed: {e}")
+
+    def stats(self) -> Dict:
+
+        memory = self.memory.stats()
+        lookups = memory["hits"] + memory["misses"]
+        hits_total = memory["hits"] + self.persistent_hits
+        return {
+            **memory,
+            "persistent": self.persistent,
+            "persistent_hits": self.persistent_hits,
+            "hit_rate": round(hits_total / lookups, 4) if lookups else 0.0,
+            "upstream_calls": self._upstream_calls,
+            "avg_upstream_seconds": round(self._upstream_seconds / self._upstream_calls, 4) if self._upstream_calls else 0.0,
+            "saved_seconds": round(self.saved_seconds, 3)
+        }
@@ -1,45 +1,98 @@
 
 import os
-import httpx
-from typing import Optional, Dict
+import asyncio
+from typing import Dict, Iterable, Optional
+from services.cache import MISSING, SingleFlight, TTLCache
+from services.http_client import http_clients
 
 
 class VocabService:
-    
-    
+
+
     def __init__(self):
         self.api_url = os.getenv("VOCAB_API_URL", "http://worddee_api:8001")
         self.api_key = os.getenv("VOCAB_API_KEY", "")
-    
+        self.negative_ttl = float(os.getenv("VOCAB_CACHE_NEGATIVE_TTL", 30.0))
+        self._word_cache = TTLCache(
+            maxsize=int(os.getenv("VOCAB_CACHE_SIZE", 1024)),
+            ttl=float(os.getenv("VOCAB_CACHE_TTL", 300.0))
+        )
+        self._inflight = SingleFlight()
+        self.negative_hits = 0
+
     async def get_random_word(self, difficulty: Optional[str] = None) -> Optional[Dict]:
-       
+
         try:
             params = {}
             if difficulty:
                 params["difficulty"] = difficulty
-            
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.api_url}/api/random",
-                    params=params
-                )
-                response.raise_for_status()
-                return response.json()
-        
+
+            client = http_clients.get("vocab")
+            response = await client.get(
+                f"{self.api_url}/api/random",
+                params=params
+            )
+            response.raise_for_status()
+            word = response.json()
+
+            # The next submit is almost always for this word, so prime the cache.
+            if isinstance(word, dict) and "id" in word:
+                self._word_cache.set(word["id"], word)
+            return word
+
         except Exception as e:
             print(f"Error fetching random word: {e}")
             return None
-    
+
     async def get_word_by_id(self, word_id: int) -> Optional[Dict]:
-    
+
+        cached = self._word_cache.get(word_id)
+        if cached is not MISSING:
+            if cached is None:
+                self.negative_hits += 1
+            return cached
+
+        return await self._inflight.do(word_id, lambda: self._fetch_word(word_id))
+
+    async def get_words_by_ids(self, word_ids: Iterable[int]) -> Dict[int, Optional[Dict]]:
+
+        # worddee_api has no bulk endpoint, so each distinct id is resolved once,
+        # concurrently, through the same cache and single-flight as get_word_by_id.
+        unique_ids = list(dict.fromkeys(word_ids))
+        words = await asyncio.gather(*(self.get_word_by_id(word_id) for word_id in unique_ids))
+        return dict(zip(unique_ids, words))
+
+    async def _fetch_word(self, word_id: int) -> Optional[Dict]:
+
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self.api_url}/api/words/{word_id}"
-                )
-                response.raise_for_status()
-                return response.json()
-        
+            client = http_clients.get("vocab")
+            response = await client.get(
+                f"{self.api_url}/api/words/{word_id}"
+            )
+            if response.status_code == 404:
+                self._word_cache.set(word_id, None, ttl=self.negative_ttl)
+                return None
+            response.raise_for_status()
+            word = response.json()
+            self._word_cache.set(word_id, word)
+            return word
+
         except Exception as e:
+            # Transient failures are not cached; the next call retries upstream.
             print(f"Error fetching word {word_id}: {e}")
             return None
+
+    def invalidate_word(self, word_id: Optional[int] = None) -> None:
+
+        if word_id is None:
+            self._word_cache.clear()
+        else:
+            self._word_cache.pop(word_id)
+
+    def cache_stats(self) -> Dict:
+
+        return {
+            **self._word_cache.stats(),
+            "negative_hits": self.negative_hits,
+            "coalesced": self._inflight.coalesced
+        }
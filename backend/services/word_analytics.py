@@ -0,0 +1,149 @@
+
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models import Word, WordScoreDaily, WordScoreTotal
+
+PERCENTILES = (50, 90)
+
+
+def distribution_summary(scores: Counter, levels: Counter) -> Dict:
+    """Attempts, mean, exact percentiles and CEFR counts from a score histogram."""
+
+    attempts = sum(scores.values())
+    summary = {
+        "attempts": attempts,
+        "average_score": round(float(sum(score * n for score, n in scores.items()) / attempts), 2) if attempts else 0.0,
+        "cefr_distribution": dict(sorted(levels.items()))
+    }
+
+    ordered = sorted(scores.items())
+    for p in PERCENTILES:
+        # Nearest-rank percentile over the exact one-decimal scores.
+        rank, seen, value = max(1, -(-attempts * p // 100)), 0, None
+        for score, n in ordered:
+            seen += n
+            if seen >= rank:
+                value = float(score)
+                break
+        summary[f"p{p}_score"] = value
+    return summary
+
+
+class WordAnalyticsService:
+    """Per-word and per-difficulty score analytics read from the rollups.
+
+    Unbounded queries read ``word_score_totals``; windowed ones sum
+    ``word_score_daily`` over the requested days. Either way the work is
+    bounded by words x levels x distinct scores, not by session count.
+    Words are ranked and limited in SQL, and difficulty is joined from the
+    vocab API's ``words`` table, which shares this database.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def summary(
+        self,
+        days: Optional[int] = None,
+        word_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> Dict:
+
+        since = (datetime.utcnow() - timedelta(days=days - 1)).date() if days else None
+        rollup = self._rollup(since, word_id)
+
+        attempts = func.sum(rollup.c.sessions)
+        average = func.round(func.sum(rollup.c.score * rollup.c.sessions) / attempts, 2)
+        # Hardest words first: that is what the dashboard is looking for.
+        ranked = select(rollup.c.word_id).group_by(rollup.c.word_id).order_by(
+            average, attempts.desc(), rollup.c.word_id
+        )
+        if limit is not None:
+            ranked = ranked.limit(limit)
+        word_ids = list((await self.db.execute(ranked)).scalars())
+
+        scores: Dict[int, Counter] = defaultdict(Counter)
+        levels: Dict[int, Counter] = defaultdict(Counter)
+        for row_word_id, level, score, sessions in (await self.db.execute(
+            select(rollup.c.word_id, rollup.c.cefr_level, rollup.c.score, rollup.c.sessions)
+            .where(rollup.c.word_id.in_(word_ids))
+        )).all():
+            scores[row_word_id][Decimal(str(score))] += sessions
+            levels[row_word_id][level] += sessions
+
+        words = {
+            row.id: row for row in (await self.db.execute(
+                select(Word.id, Word.word, Word.difficulty_level).where(Word.id.in_(word_ids))
+            )).all()
+        }
+        word_stats = []
+        for wid in word_ids:
+            word = words.get(wid)
+            word_stats.append({
+                "word_id": wid,
+                "word": word.word if word else None,
+                "difficulty_level": word.difficulty_level if word else "Unknown",
+                **distribution_summary(scores[wid], levels[wid])
+            })
+        word_stats.sort(key=lambda w: (w["average_score"], -w["attempts"]))
+
+        return {"since": since, "words": word_stats, "difficulties": await self._by_difficulty(rollup)}
+
+    async def _by_difficulty(self, rollup) -> List[Dict]:
+
+        # Covers every word in the window, not just the page of words above.
+        joined = rollup.outerjoin(Word, Word.id == rollup.c.word_id)
+        word_counts = dict((await self.db.execute(
+            select(Word.difficulty_level, func.count(rollup.c.word_id.distinct()))
+            .select_from(joined)
+            .group_by(Word.difficulty_level)
+        )).all())
+
+        scores: Dict[Optional[str], Counter] = defaultdict(Counter)
+        levels: Dict[Optional[str], Counter] = defaultdict(Counter)
+        for difficulty, level, score, sessions in (await self.db.execute(
+            select(Word.difficulty_level, rollup.c.cefr_level, rollup.c.score, func.sum(rollup.c.sessions))
+            .select_from(joined)
+            .group_by(Word.difficulty_level, rollup.c.cefr_level, rollup.c.score)
+        )).all():
+            scores[difficulty][Decimal(str(score))] += sessions
+            levels[difficulty][level] += sessions
+
+        return sorted(
+            (
+                {
+                    "difficulty_level": difficulty or "Unknown",
+                    "words": word_counts[difficulty],
+                    **distribution_summary(scores[difficulty], levels[difficulty])
+                }
+                for difficulty in word_counts
+            ),
+            key=lambda d: d["difficulty_level"]
+        )
+
+    def _rollup(self, since: Optional[date], word_id: Optional[int]):
+
+        if since is None:
+            query = select(
+                WordScoreTotal.word_id, WordScoreTotal.cefr_level, WordScoreTotal.score, WordScoreTotal.sessions
+            ).where(WordScoreTotal.sessions > 0)
+            if word_id is not None:
+                query = query.where(WordScoreTotal.word_id == word_id)
+        else:
+            query = (
+                select(
+                    WordScoreDaily.word_id,
+                    WordScoreDaily.cefr_level,
+                    WordScoreDaily.score,
+                    func.sum(WordScoreDaily.sessions).label("sessions")
+                )
+                .where(WordScoreDaily.day >= since)
+                .group_by(WordScoreDaily.word_id, WordScoreDaily.cefr_level, WordScoreDaily.score)
+            )
+            if word_id is not None:
+                query = query.where(WordScoreDaily.word_id == word_id)
+        return query.subquery()
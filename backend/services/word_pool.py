@@ -0,0 +1,111 @@
+
+import os
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, Dict, Optional
+from services.cache import MISSING, TTLCache
+from services.vocab_service import VocabService
+
+logger = logging.getLogger(__name__)
+
+# Mirrors difficulty_enum in database/init.sql; None is the "any difficulty" pool.
+DIFFICULTIES = (None, "Beginner", "Intermediate", "Advanced")
+
+
+class WordPool:
+    """Pre-fetched random words per difficulty, refilled in the background.
+
+    ``take`` never touches the network: it pops a word from the in-memory
+    pool and, when the pool drops below ``low_water``, schedules a refill up
+    to ``high_water``. Words served to the same caller within
+    ``repeat_window`` seconds are skipped while other words are available.
+    """
+
+    def __init__(self, vocab_service: VocabService):
+        self.vocab_service = vocab_service
+        self.low_water = int(os.getenv("WORD_POOL_LOW_WATER", 5))
+        self.high_water = int(os.getenv("WORD_POOL_HIGH_WATER", 20))
+        self.refill_concurrency = int(os.getenv("WORD_POOL_REFILL_CONCURRENCY", 4))
+        self.repeat_window = float(os.getenv("WORD_POOL_REPEAT_WINDOW", 300.0))
+
+        self._pools: Dict[Optional[str], Deque[Dict]] = {d: deque() for d in DIFFICULTIES}
+        self._refills: Dict[Optional[str], asyncio.Task] = {}
+        self._recent = TTLCache(
+            maxsize=int(os.getenv("WORD_POOL_RECENT_SIZE", 10000)),
+            ttl=self.repeat_window
+        )
+        self.served = 0
+        self.empty = 0
+
+    def take(self, difficulty: Optional[str] = None, caller: Optional[str] = None) -> Optional[Dict]:
+
+        pool = self._pools.get(difficulty)
+        if pool is None:
+            return None
+
+        word = None
+        for _ in range(len(pool)):
+            candidate = pool.popleft()
+            if caller is None or self._recent.get((caller, candidate.get("id"))) is MISSING:
+                word = candidate
+                break
+            pool.append(candidate)
+
+        # Every pooled word was seen recently; a repeat still beats a round trip.
+        if word is None and pool:
+            word = pool.popleft()
+
+        self.refill(difficulty)
+
+        if word is None:
+            self.empty += 1
+            return None
+
+        if caller is not None:
+            self._recent.set((caller, word.get("id")), True)
+        self.served += 1
+        return word
+
+    def refill(self, difficulty: Optional[str] = None) -> None:
+
+        if len(self._pools[difficulty]) >= self.low_water:
+            return
+        task = self._refills.get(difficulty)
+        if task is None or task.done():
+            self._refills[difficulty] = asyncio.create_task(self._refill(difficulty))
+
+    async def _refill(self, difficulty: Optional[str]) -> None:
+
+        pool = self._pools[difficulty]
+        while len(pool) < self.high_water:
+            batch = min(self.refill_concurrency, self.high_water - len(pool))
+            words = await asyncio.gather(
+                *(self.vocab_service.get_random_word(difficulty) for _ in range(batch))
+            )
+            fetched = [w for w in words if w]
+            if not fetched:
+                logger.warning(f"Word pool refill for {difficulty or 'any'} got no words")
+                return
+            pool.extend(fetched)
+
+    async def start(self) -> None:
+
+        for difficulty in DIFFICULTIES:
+            self.refill(difficulty)
+
+    async def stop(self) -> None:
+
+        tasks = [t for t in self._refills.values() if not t.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refills.clear()
+
+    def stats(self) -> Dict:
+
+        return {
+            "served": self.served,
+            "empty": self.empty,
+            "sizes": {d or "any": len(p) for d, p in self._pools.items()}
+        }
@@ -0,0 +1,69 @@
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from db.database import Base
+from services.http_client import http_clients
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _engine_with_schema(url, **options):
+    engine = create_async_engine(url, **options)
+
+    async def create_schema():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_schema())
+    return engine
+
+
+@pytest.fixture
+def session_factory():
+    # One shared in-memory connection: sessions see each other's commits,
+    # but also each other's rollbacks.
+    engine = _engine_with_schema("sqlite+aiosqlite://", poolclass=StaticPool)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def file_session_factory(tmp_path):
+    # A file, so each session gets its own connection and transaction.
+    engine = _engine_with_schema(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def mock_upstream():
+    """``mock_upstream(name, handler)`` points an ``http_clients`` upstream at
+    a MockTransport (``handler`` may also be a ready transport); whatever
+    client was installed before is put back after the test."""
+
+    saved = dict(http_clients._clients)
+
+    def install(name, handler):
+        transport = handler if isinstance(handler, httpx.BaseTransport) else httpx.MockTransport(handler)
+        client = httpx.AsyncClient(transport=transport)
+        http_clients.set(name, client)
+        return client
+
+    yield install
+    http_clients._clients = saved
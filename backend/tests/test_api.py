@@ -1,12 +1,36 @@
-
+import os
+import socket
+from urllib.parse import urlparse
 
 import pytest
 from fastapi.testclient import TestClient
-from backend.main import app
+from sqlalchemy.engine import make_url
+
+from db.database import DATABASE_URL
+from main import app
 
 client = TestClient(app)
 
 
+def _reachable(host, port):
+    try:
+        socket.create_connection((host, port), timeout=2).close()
+    except OSError:
+        return False
+    return True
+
+
+_vocab_api = urlparse(os.getenv("VOCAB_API_URL", "http://worddee_api:8001"))
+_database = make_url(DATABASE_URL)
+requires_vocab_api = pytest.mark.skipif(
+    not _reachable(_vocab_api.hostname, _vocab_api.port or 80), reason="Vocab API not running"
+)
+requires_database = pytest.mark.skipif(
+    _database.get_backend_name() == "postgresql" and not _reachable(_database.host, _database.port or 5432),
+    reason="Database not running"
+)
+
+
 class TestHealthEndpoints:
     
 
@@ -16,7 +40,7 @@ class TestHealthEndpoints:
         assert response.status_code == 200
         data = response.json()
         assert "service" in data
-        assert data["service"] == "Worddee-AI Backend"
+        assert data["service"] == "Worddee.ai Backend"
 
     def test_health_endpoint(self):
         
@@ -29,6 +53,7 @@ class TestHealthEndpoints:
 class TestPracticeEndpoints:
     
 
+    @requires_vocab_api
     def test_get_random_word_no_difficulty(self):
         
         response = client.get("/api/practice/word")
@@ -38,6 +63,7 @@ class TestPracticeEndpoints:
         assert "definition" in data
         assert "difficulty_level" in data
 
+    @requires_vocab_api
     def test_get_random_word_with_difficulty(self):
         
         response = client.get("/api/practice/word?difficulty=Beginner")
@@ -45,6 +71,8 @@ class TestPracticeEndpoints:
         data = response.json()
         assert data["difficulty_level"] == "Beginner"
 
+    @requires_vocab_api
+    @requires_database
     def test_submit_practice_valid(self):
         
         payload = {
@@ -72,6 +100,7 @@ class TestPracticeEndpoints:
 class TestDashboardEndpoints:
     
 
+    @requires_database
     def test_get_dashboard_stats(self):
         
         response = client.get("/api/dashboard/stats")
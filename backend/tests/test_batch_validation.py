@@ -0,0 +1,77 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from services.ai_service import AIService
+
+
+def _items(sentences):
+    return [{"word": "apple", "definition": "A fruit", "sentence": s} for s in sentences]
+
+
+class TestValidateBatch:
+    
+
+    def test_batch_webhook_keeps_order_and_dedupes(self, mock_upstream):
+        
+        batches = []
+
+        async def handler(request):
+            items = json.loads(request.content)["items"]
+            batches.append(len(items))
+            return httpx.Response(200, json=[
+                {"score": float(len(item["sentence"]) % 10), "cefr_level": "A2", "feedback": item["sentence"]}
+                for item in items
+            ])
+
+        async def run():
+            mock_upstream("n8n", handler)
+            service = AIService()
+            service.batch_webhook_url = "http://n8n/webhook/validate-batch"
+            service.batch_size = 2
+            sentences = ["An apple.", "Two apples here.", "an  apple.", "Apples are red."]
+            return sentences, await service.validate_batch(_items(sentences))
+
+        sentences, results = asyncio.run(run())
+        assert sorted(batches) == [1, 2]
+        assert [r["feedback"] for r in results] == ["An apple.", "Two apples here.", "An apple.", "Apples are red."]
+        assert results[2]["corrected_sentence"] == "an  apple."
+
+    def test_failed_batch_falls_back_per_item(self, mock_upstream):
+        
+        async def handler(request):
+            return httpx.Response(500)
+
+        async def run():
+            mock_upstream("n8n", handler)
+            service = AIService()
+            service.batch_webhook_url = "http://n8n/webhook/validate-batch"
+            return await service.validate_batch(_items(["One apple.", "Two apples."]))
+
+        results = asyncio.run(run())
+        assert all("[Mock - error 500]" in r["feedback"] for r in results)
+        assert [r["corrected_sentence"] for r in results] == ["One apple.", "Two apples."]
+
+    def test_without_batch_webhook_uses_single_calls(self, mock_upstream):
+        
+        calls = []
+
+        async def handler(request):
+            calls.append(json.loads(request.content)["sentence"])
+            return httpx.Response(200, json={"score": 6.0, "cefr_level": "A2", "feedback": "ok"})
+
+        async def run():
+            mock_upstream("n8n", handler)
+            service = AIService()
+            service.batch_webhook_url = None
+            return await service.validate_batch(_items(["One apple.", "Two apples.", "one apple."]))
+
+        results = asyncio.run(run())
+        assert len(calls) == 2
+        assert [r["score"] for r in results] == [6.0, 6.0, 6.0]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
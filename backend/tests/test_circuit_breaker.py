@@ -0,0 +1,90 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services.ai_service import AIService
+from services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from services.latency import AdaptiveTimeout, LatencyTracker
+
+
+class TestCircuitBreaker:
+    
+
+    def test_opens_after_threshold_and_recovers(self, clock):
+        
+        breaker = CircuitBreaker("n8n", failure_threshold=2, recovery_timeout=10, clock=clock)
+        for _ in range(2):
+            breaker.before_call()
+            breaker.record_failure()
+        assert breaker.state == OPEN
+
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        clock.now = 11
+        breaker.before_call()
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.stats()["transitions"] == {
+            "closed->open": 1,
+            "open->half_open": 1,
+            "half_open->closed": 1
+        }
+
+    def test_failed_probe_reopens(self, clock):
+        
+        breaker = CircuitBreaker("n8n", failure_threshold=1, recovery_timeout=10, clock=clock)
+        breaker.record_failure()
+        clock.now = 11
+        breaker.before_call()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+
+class TestAdaptiveTimeout:
+    
+
+    def test_uses_ceiling_until_warmed_up(self):
+        
+        tracker = LatencyTracker()
+        timeout = AdaptiveTimeout(tracker, minimum=1.0, maximum=60.0, multiplier=3.0, min_samples=5)
+        assert timeout.current() == 60.0
+        for _ in range(5):
+            tracker.record(2.0)
+        assert timeout.current() == 6.0
+
+
+class TestAIServiceBreaker:
+    
+
+    def test_open_breaker_skips_webhook(self, mock_upstream):
+        
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            return httpx.Response(502)
+
+        async def run():
+            mock_upstream("n8n", handler)
+            service = AIService()
+            service.breaker.failure_threshold = 2
+            results = [
+                await service.validate_sentence("cat", "A pet", f"My cat number {i}.")
+                for i in range(4)
+            ]
+            return service, results
+
+        service, results = asyncio.run(run())
+        assert len(calls) == 2
+        assert service.breaker.state == OPEN
+        assert "service unavailable" in results[-1]["feedback"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
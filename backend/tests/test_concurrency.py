@@ -0,0 +1,73 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services.ai_service import AIService
+from services.concurrency import ConcurrencyLimiter, OverloadedError
+
+
+class TestConcurrencyLimiter:
+    
+
+    def test_rejects_when_queue_full(self):
+        
+        async def run():
+            limiter = ConcurrencyLimiter("test", max_concurrency=1, max_queue=1)
+            release = asyncio.Event()
+
+            async def hold():
+                async with limiter.acquire():
+                    await release.wait()
+
+            holders = [asyncio.create_task(hold()) for _ in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(OverloadedError):
+                async with limiter.acquire():
+                    pass
+            release.set()
+            await asyncio.gather(*holders)
+            return limiter
+
+        limiter = asyncio.run(run())
+        assert limiter.rejected == 1
+        assert limiter.active == 0 and limiter.waiting == 0
+
+    def test_queue_timeout_rejects(self):
+        
+        async def run():
+            limiter = ConcurrencyLimiter("test", max_concurrency=1, max_queue=5, queue_timeout=0.01)
+            async with limiter.acquire():
+                with pytest.raises(OverloadedError):
+                    async with limiter.acquire():
+                        pass
+
+        asyncio.run(run())
+
+
+class TestValidationCoalescing:
+    
+
+    def test_identical_submissions_share_one_call(self, mock_upstream):
+        
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"score": 8.0, "cefr_level": "B2", "feedback": "Nice."})
+
+        async def run():
+            mock_upstream("n8n", handler)
+            service = AIService()
+            return await asyncio.gather(*(
+                service.validate_sentence("cat", "A pet", "The cat sleeps.") for _ in range(5)
+            ))
+
+        results = asyncio.run(run())
+        assert len(calls) == 1
+        assert all(r["cefr_level"] == "B2" for r in results)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+
+from services.dashboard_cache import DashboardCache, etag_matches
+
+
+def _counting_build(delay=0.0):
+    calls = []
+
+    async def build():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return f"body-{len(calls)}".encode()
+
+    return build, calls
+
+
+class TestDashboardCache:
+    
+
+    def test_etag_is_current_until_invalidated(self, clock):
+        
+        async def run():
+            cache = DashboardCache(stale_ttl=0, max_age=60, clock=clock)
+            build, calls = _counting_build()
+            first = await cache.get(build)
+            before = cache.not_modified_since(first.etag)
+            cache.invalidate()
+            after = cache.not_modified_since(first.etag)
+            second = await cache.get(build)
+            return first, second, before, after, calls
+
+        first, second, before, after, calls = asyncio.run(run())
+        assert before is True
+        assert after is False
+        assert first.etag != second.etag
+        assert second.body == b"body-2"
+        assert len(calls) == 2
+
+    def test_concurrent_misses_share_one_build(self, clock):
+        
+        async def run():
+            cache = DashboardCache(stale_ttl=0, max_age=60, clock=clock)
+            build, calls = _counting_build(delay=0.05)
+            results = await asyncio.gather(*[cache.get(build) for _ in range(20)])
+            return results, calls
+
+        results, calls = asyncio.run(run())
+        assert len(calls) == 1
+        assert {r.body for r in results} == {b"body-1"}
+
+    def test_stale_body_served_while_rebuilding(self, clock):
+        
+        async def run():
+            cache = DashboardCache(stale_ttl=2, max_age=60, clock=clock)
+            build, calls = _counting_build(delay=0.05)
+            await cache.get(build)
+            cache.invalidate()
+            stale = await asyncio.gather(*[cache.get(build) for _ in range(10)])
+            await asyncio.sleep(0.1)
+            fresh = await cache.get(build)
+            return stale, fresh, calls
+
+        stale, fresh, calls = asyncio.run(run())
+        assert {r.body for r in stale} == {b"body-1"}
+        assert fresh.body == b"body-2"
+        assert len(calls) == 2
+
+    def test_max_age_expires_body_without_invalidation(self, clock):
+        
+        async def run():
+            cache = DashboardCache(stale_ttl=0, max_age=30, clock=clock)
+            build, calls = _counting_build()
+            first = await cache.get(build)
+            clock.now = 31
+            expired = cache.not_modified_since(first.etag)
+            await cache.get(build)
+            return expired, calls
+
+        expired, calls = asyncio.run(run())
+        assert expired is False
+        assert len(calls) == 2
+
+    def test_etag_is_shared_across_workers(self, clock):
+        
+        async def run():
+            worker_a = DashboardCache(stale_ttl=0, max_age=60, clock=clock)
+            worker_b = DashboardCache(stale_ttl=0, max_age=60, clock=clock)
+            worker_b.invalidate()
+            body = b'{"total_sessions": 3}'
+
+            async def build():
+                return body
+
+            first = await worker_a.get(build)
+            second = await worker_b.get(build)
+            return first, second, worker_b.not_modified_since(first.etag)
+
+        first, second, matches = asyncio.run(run())
+        # Same stats, same ETag, whatever each worker's local version.
+        assert first.version != second.version
+        assert first.etag == second.etag
+        assert matches is True
+
+    def test_etag_matches_lists_and_wildcard(self):
+        
+        assert etag_matches('W/"a-1"', 'W/"a-0", W/"a-1"')
+        assert etag_matches('W/"a-1"', "*")
+        assert not etag_matches('W/"a-1"', None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from services.http_client import HTTPClientManager, UpstreamConfig
+
+
+class TestHTTPClientManager:
+    
+
+    def test_client_is_reused(self):
+        
+        manager = HTTPClientManager()
+        manager.register(UpstreamConfig(name="vocab", timeout=10.0))
+        assert manager.get("vocab") is manager.get("vocab")
+        asyncio.run(manager.shutdown())
+
+    def test_shutdown_closes_clients(self):
+        
+        manager = HTTPClientManager()
+        manager.register(UpstreamConfig(name="vocab", timeout=10.0))
+
+        async def run():
+            await manager.startup()
+            client = manager.get("vocab")
+            await manager.shutdown()
+            return client
+
+        client = asyncio.run(run())
+        assert client.is_closed
+
+    def test_limits_from_env(self, monkeypatch):
+        
+        monkeypatch.setenv("N8N_HTTP_TIMEOUT", "12.5")
+        monkeypatch.setenv("N8N_HTTP_MAX_CONNECTIONS", "7")
+        monkeypatch.setenv("N8N_HTTP2", "false")
+        config = UpstreamConfig.from_env("n8n", "N8N", timeout=60.0)
+        assert config.timeout == 12.5
+        assert config.max_connections == 7
+        assert config.http2 is False
+
+        client = config.build_client()
+        assert client.timeout.read == 12.5
+        asyncio.run(client.aclose())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
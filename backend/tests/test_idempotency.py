@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from db.models import IdempotencyKey
+from services.idempotency import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyReused,
+    InMemoryIdempotencyStore,
+    PostgresIdempotencyStore,
+    request_fingerprint
+)
+
+BODY = request_fingerprint({"word_id": 1, "user_sentence": "I eat an apple."})
+
+
+def _handler(calls, delay=0.05, fail=False):
+
+    async def submit():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("validation failed")
+        return 200, {"session_id": len(calls)}
+
+    return submit
+
+
+class TestInMemoryIdempotencyStore:
+    
+
+    def test_retries_attach_to_in_flight_then_replay(self):
+        
+        calls = []
+        store = InMemoryIdempotencyStore()
+
+        async def run():
+            concurrent = await asyncio.gather(*(store.run("submit:a", BODY, _handler(calls)) for _ in range(3)))
+            later = await store.run("submit:a", BODY, _handler(calls))
+            return concurrent, later
+
+        concurrent, later = asyncio.run(run())
+        assert len(calls) == 1
+        assert [replayed for _, _, replayed in concurrent] == [False, True, True]
+        assert later == (200, {"session_id": 1}, True)
+        assert store.stats()["attached"] == 2 and store.stats()["replayed"] == 1
+
+    def test_reused_key_and_failed_request(self):
+        
+        calls = []
+        store = InMemoryIdempotencyStore()
+
+        async def run():
+            with pytest.raises(RuntimeError):
+                await store.run("submit:b", BODY, _handler(calls, fail=True))
+            # Failures are not stored, so the retry runs again.
+            await store.run("submit:b", BODY, _handler(calls))
+            with pytest.raises(IdempotencyKeyReused):
+                await store.run("submit:b", request_fingerprint({"other": True}), _handler(calls))
+
+        asyncio.run(run())
+        assert len(calls) == 2
+
+
+class TestPostgresIdempotencyStore:
+    
+
+    def test_workers_share_one_execution(self, file_session_factory):
+        
+        calls = []
+
+        async def run():
+            first = PostgresIdempotencyStore(file_session_factory, poll_interval=0.01)
+            second = PostgresIdempotencyStore(file_session_factory, poll_interval=0.01)
+            results = await asyncio.gather(
+                first.run("submit:c", BODY, _handler(calls, delay=0.1)),
+                second.run("submit:c", BODY, _handler(calls))
+            )
+            async with file_session_factory() as db:
+                row = (await db.execute(select(IdempotencyKey))).scalar_one()
+            return results, row
+
+        results, row = asyncio.run(run())
+        assert len(calls) == 1
+        # Either worker may claim the key first; the other replays its response.
+        assert sorted(results, key=lambda result: result[2]) == [(200, {"session_id": 1}, False), (200, {"session_id": 1}, True)]
+        assert row.status_code == 200 and row.response == {"session_id": 1}
+
+    def test_wait_timeout_and_expired_lock(self, file_session_factory):
+        
+        calls = []
+
+        async def run():
+            owner = PostgresIdempotencyStore(file_session_factory)
+            other = PostgresIdempotencyStore(file_session_factory, wait_timeout=0.05, poll_interval=0.01)
+            running = asyncio.ensure_future(owner.run("submit:d", BODY, _handler(calls, delay=0.5)))
+            await asyncio.sleep(0.02)
+            with pytest.raises(IdempotencyKeyInProgress):
+                await other.run("submit:d", BODY, _handler(calls))
+            with pytest.raises(IdempotencyKeyReused):
+                await other.run("submit:d", request_fingerprint({"other": True}), _handler(calls))
+            running.cancel()
+            await asyncio.gather(running, return_exceptions=True)
+
+            # A worker that died mid-request leaves its lock behind until it expires.
+            stale = PostgresIdempotencyStore(file_session_factory, lock_timeout=0)
+            assert await stale._claim("submit:e", BODY)
+            return await other.run("submit:e", BODY, _handler(calls))
+
+        assert asyncio.run(run()) == (200, {"session_id": 2}, False)
+        assert len(calls) == 2
+
+    def test_failure_releases_key(self, file_session_factory):
+        
+        calls = []
+
+        async def run():
+            store = PostgresIdempotencyStore(file_session_factory)
+            with pytest.raises(RuntimeError):
+                await store.run("submit:f", BODY, _handler(calls, fail=True))
+            return await store.run("submit:f", BODY, _handler(calls))
+
+        assert asyncio.run(run()) == (200, {"session_id": 2}, False)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -1,9 +1,11 @@
 """Integration tests for worddee-ai system"""
 
-import pytest
-import requests
 import time
 
+import pytest
+
+requests = pytest.importorskip("requests")
+
 
 VOCAB_API_URL = "http://localhost:8001"
 BACKEND_URL = "http://localhost:8000"
@@ -11,6 +13,18 @@ FRONTEND_URL = "http://localhost:3000"
 N8N_URL = "http://localhost:5678"
 
 
+def _running(url):
+    try:
+        requests.get(url, timeout=2)
+    except requests.exceptions.RequestException:
+        return False
+    return True
+
+
+# These talk to the docker-compose stack; without it there is nothing to test.
+pytestmark = pytest.mark.skipif(not _running(f"{BACKEND_URL}/health"), reason="Worddee services not running")
+
+
 class TestServiceAvailability:
     
 
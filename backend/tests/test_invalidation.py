@@ -0,0 +1,130 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from services.invalidation import MAX_PAYLOAD, InvalidationBus, LocalHub, LocalTransport, PostgresTransport
+
+
+def _worker(hub, seen, name="worker"):
+    bus = InvalidationBus(LocalTransport(hub) if hub is not None else None)
+    bus.ping_interval = 0.05
+    bus.reconnect_delay = 0.01
+    bus.register("dashboard", lambda key: seen.append((name, "dashboard", key)))
+    bus.register("vocab", lambda key: seen.append((name, "vocab", key)))
+    return bus
+
+
+async def _until(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.005)
+
+
+class TestInvalidationBus:
+    
+
+    def test_publish_reaches_other_workers_once(self):
+        
+        hub, seen = LocalHub(), []
+
+        async def run():
+            a, b = _worker(hub, seen, "a"), _worker(hub, seen, "b")
+            await a.start()
+            await b.start()
+            await _until(lambda: a.connected and b.connected)
+            for _ in range(50):
+                a.publish("dashboard")
+            a.publish("vocab", 7)
+            await _until(lambda: b.received)
+            await a.stop()
+            await b.stop()
+
+        asyncio.run(run())
+        # Applied locally at once, de-duplicated on the wire, never echoed back.
+        assert seen.count(("a", "dashboard", None)) == 50
+        assert [entry for entry in seen if entry[0] == "b"] == [("b", "dashboard", None), ("b", "vocab", 7)]
+        assert len(hub.sent) == 1
+
+    def test_reconnect_flushes_and_sends_what_was_queued(self):
+        
+        hub, seen = LocalHub(), []
+
+        async def run():
+            a, b = _worker(hub, seen, "a"), _worker(hub, seen, "b")
+            await a.start()
+            await b.start()
+            await _until(lambda: a.connected and b.connected)
+            a.reconnect_delay = 0.2
+            hub.drop()
+            await _until(lambda: not a.connected)
+            a.publish("vocab", 3)
+            await _until(lambda: a.reconnects and b.reconnects)
+            await _until(lambda: ("b", "vocab", 3) in seen)
+            stats = a.stats()
+            await a.stop()
+            await b.stop()
+            return stats
+
+        stats = asyncio.run(run())
+        assert stats["reconnects"] == 1 and stats["full_flushes"] == 1
+        assert ("b", "dashboard", None) in seen and ("b", "vocab", None) in seen
+
+    def test_overflow_sends_full_flush(self):
+        
+        hub, seen = LocalHub(), []
+
+        async def run():
+            a, b = _worker(hub, seen, "a"), _worker(hub, seen, "b")
+            a.max_pending, a.reconnect_delay = 2, 0.2
+            await a.start()
+            await b.start()
+            await _until(lambda: a.connected and b.connected)
+            a.transport.terminate()
+            await _until(lambda: not a.connected)
+            for word_id in range(5):
+                a.publish("vocab", word_id)
+            await _until(lambda: b.received)
+            await a.stop()
+            await b.stop()
+
+        asyncio.run(run())
+        assert sorted(entry for entry in seen if entry[0] == "b") == [("b", "dashboard", None), ("b", "vocab", None)]
+
+    def test_payloads_stay_under_notify_limit(self):
+        
+        bus = InvalidationBus()
+        items = [("validation", "k" * 64 + str(n)) for n in range(500)]
+        payloads = bus._payloads(items)
+        assert len(payloads) > 1
+        assert all(len(payload.encode("utf-8")) < MAX_PAYLOAD for payload in payloads)
+        decoded = [tuple(item) for payload in payloads for item in json.loads(payload)["items"]]
+        assert decoded == items
+
+    def test_postgres_listen_notify(self):
+        
+        url = os.getenv("TEST_POSTGRES_URL")
+        if not url:
+            pytest.skip("TEST_POSTGRES_URL not set")
+        seen = []
+
+        async def run():
+            a = _worker(None, seen, "a")
+            b = _worker(None, seen, "b")
+            a.transport, b.transport = PostgresTransport(url), PostgresTransport(url)
+            await a.start()
+            await b.start()
+            await _until(lambda: a.connected and b.connected, timeout=10)
+            a.publish("vocab", 11)
+            await _until(lambda: ("b", "vocab", 11) in seen, timeout=10)
+            await a.stop()
+            await b.stop()
+
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,41 @@
+from collections import Counter
+
+import pytest
+
+from benchmarks.load import compare, percentile, summarize
+
+
+def _result(p95, p99, rps, error_rate=0.0):
+    return {"p95_ms": p95, "p99_ms": p99, "throughput_rps": rps, "error_rate": error_rate}
+
+
+class TestLoadReport:
+    
+
+    def test_summarize_counts_errors_and_percentiles(self):
+        
+        samples = [i / 1000 for i in range(1, 101)]
+        statuses = Counter({200: 97, 503: 2, 0: 1})
+        summary = summarize(samples, statuses, elapsed=2.0)
+        assert summary["requests"] == 100
+        assert summary["errors"] == 3
+        assert summary["throughput_rps"] == 50.0
+        assert summary["p50_ms"] == 50.0
+        assert summary["p99_ms"] == 99.0
+        assert summary["status_counts"] == {"0": 1, "200": 97, "503": 2}
+        assert percentile([], 99) == 0.0
+
+    def test_compare_flags_only_regressions_beyond_tolerance(self):
+        
+        baseline = {"scenarios": {"submit": _result(100, 200, 50), "word": _result(10, 20, 500)}}
+        current = {"scenarios": {"submit": _result(105, 260, 40), "word": _result(9, 18, 600, error_rate=0.05)}}
+        assert compare(baseline, current, tolerance=0.1) == [
+            "submit: p99_ms 200 -> 260",
+            "submit: throughput_rps 50 -> 40",
+            "word: error_rate 0.0 -> 0.05"
+        ]
+        assert compare(baseline, baseline, tolerance=0.1) == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from services.ai_service import AIService
+from services.latency import LatencyTracker
+from services.model_router import ModelRouter
+
+FAST_URL = "http://n8n-fast/webhook/validate-sentence"
+STRONG_URL = "http://n8n-strong/webhook/validate-sentence"
+BACKUP_URL = "http://n8n-backup/webhook/validate-sentence"
+DEFAULT_URL = "http://n8n/webhook/validate-sentence"
+
+
+def _router(backup_url=BACKUP_URL, warm=0.01):
+    router = ModelRouter()
+    router.hedge_min_samples = 5
+    router.max_hedge_ratio = 1.0
+    for route in (*router.routes.values(), router.default):
+        route.url, route.backup_url = None, backup_url
+        for _ in range(router.hedge_min_samples):
+            route.primary_latency.record(warm)
+    return router
+
+
+def _send(delays, calls, failing=()):
+
+    async def send(url):
+        calls.append(url)
+        await asyncio.sleep(delays.get(url, 0))
+        if url in failing:
+            raise httpx.ConnectError("down")
+        return {"url": url}
+
+    return send
+
+
+class TestModelRouter:
+    
+
+    def test_routes_by_difficulty(self, mock_upstream):
+        
+        calls = []
+
+        async def handler(request):
+            calls.append(str(request.url))
+            return httpx.Response(200, json={"score": 8.0, "cefr_level": "B1", "feedback": "ok"})
+
+        async def run():
+            mock_upstream("n8n", handler)
+            service = AIService()
+            service.webhook_url = DEFAULT_URL
+            service.router.routes["Beginner"].url = FAST_URL
+            service.router.routes["Advanced"].url = STRONG_URL
+            await service.validate_sentence("cat", "A pet", "My cat sleeps.", difficulty="Beginner")
+            await service.validate_sentence("ephemeral", "Short-lived", "Fame is ephemeral.", difficulty="Advanced")
+            await service.validate_sentence("ambitious", "Driven", "She is ambitious.", difficulty="Intermediate")
+            await service.validate_sentence("dog", "A pet", "My dog barks.")
+            return service.upstream_stats()["routes"]
+
+        routes = asyncio.run(run())
+        assert calls == [FAST_URL, STRONG_URL, DEFAULT_URL, DEFAULT_URL]
+        assert [routes[name]["calls"] for name in ("beginner", "advanced", "intermediate", "default")] == [1, 1, 1, 1]
+        assert routes["beginner"]["latency"]["samples"] == 1
+
+    def test_slow_primary_is_hedged_and_backup_wins(self):
+        
+        calls = []
+        router = _router()
+        send = _send({DEFAULT_URL: 1.0, BACKUP_URL: 0.0}, calls)
+
+        async def run():
+            started = time.perf_counter()
+            result = await router.call("Beginner", send, DEFAULT_URL)
+            return result, time.perf_counter() - started
+
+        result, elapsed = asyncio.run(run())
+        assert result == {"url": BACKUP_URL}
+        assert calls == [DEFAULT_URL, BACKUP_URL]
+        assert elapsed < 0.5
+        stats = router.stats()["beginner"]
+        assert (stats["hedged"], stats["hedge_wins"], stats["hedge_win_rate"]) == (1, 1, 1.0)
+
+    def test_fast_primary_is_not_hedged(self):
+        
+        calls = []
+        router = _router(warm=0.2)
+        result = asyncio.run(router.call("Advanced", _send({}, calls), DEFAULT_URL))
+        assert result == {"url": DEFAULT_URL}
+        assert calls == [DEFAULT_URL]
+        assert router.stats()["advanced"]["hedged"] == 0
+
+    def test_no_hedging_until_warmed_up_or_over_budget(self):
+        
+        calls = []
+        router = _router()
+        router.routes["Beginner"].primary_latency = LatencyTracker()
+        router.max_hedge_ratio = 0.0
+        send = _send({DEFAULT_URL: 0.05}, calls)
+
+        async def run():
+            await router.call("Beginner", send, DEFAULT_URL)
+            await router.call("Intermediate", send, DEFAULT_URL)
+
+        asyncio.run(run())
+        assert calls == [DEFAULT_URL, DEFAULT_URL]
+        assert router.stats()["beginner"]["hedge_delay"] is None
+
+    def test_failed_request_falls_through_to_the_other(self):
+        
+        calls = []
+        router = _router()
+        send = _send({DEFAULT_URL: 0.05, BACKUP_URL: 0.2}, calls, failing=(DEFAULT_URL,))
+        assert asyncio.run(router.call("Beginner", send, DEFAULT_URL)) == {"url": BACKUP_URL}
+
+        both_down = _send({DEFAULT_URL: 0.05}, [], failing=(DEFAULT_URL, BACKUP_URL))
+        with pytest.raises(httpx.ConnectError):
+            asyncio.run(router.call("Beginner", both_down, DEFAULT_URL))
+        assert router.stats()["beginner"]["errors"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
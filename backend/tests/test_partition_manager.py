@@ -0,0 +1,92 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from services.partition_manager import (
+    PartitionManager,
+    add_months,
+    expired_partitions,
+    parse_partition_month,
+    partition_name
+)
+
+
+class TestPartitionHelpers:
+    
+
+    def test_month_arithmetic_crosses_years(self):
+        
+        assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+        assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+    def test_names_round_trip(self):
+        
+        name = partition_name(date(2025, 3, 1))
+        assert name == "practice_sessions_y2025m03"
+        assert parse_partition_month(name) == date(2025, 3, 1)
+        assert parse_partition_month("practice_sessions_default") is None
+
+    def test_only_fully_expired_months_are_retired(self):
+        
+        names = [partition_name(date(2025, m, 1)) for m in range(1, 13)] + ["practice_sessions_default"]
+        expired = expired_partitions(names, today=date(2025, 12, 15), retention_months=6)
+        assert [month for _, month in expired] == [date(2025, m, 1) for m in range(1, 6)]
+        assert expired_partitions(names, today=date(2025, 12, 15), retention_months=0) == []
+
+
+class TestPartitionManager:
+    
+
+    def test_noop_on_unpartitioned_database(self, session_factory):
+        
+        async def run():
+            return await PartitionManager(session_factory).run_once()
+
+        assert asyncio.run(run()) == {"partitioned": False}
+
+    def test_one_worker_per_pass_and_reconcile_after_retention(self, monkeypatch, session_factory):
+        
+        class FakeReconciler:
+            runs = 0
+
+            async def run_once(self, wait=False):
+                assert wait
+                FakeReconciler.runs += 1
+
+        locks = iter([True, False])
+        manager = PartitionManager(session_factory, reconciler=FakeReconciler())
+
+        async def partitioned(db):
+            return True
+
+        async def try_lock(db):
+            return next(locks)
+
+        async def ensure(db, today):
+            return []
+
+        async def retire(db, today):
+            return ["practice_sessions_y2024m01"]
+
+        monkeypatch.setattr(manager, "_is_partitioned", partitioned)
+        monkeypatch.setattr(manager, "_try_lock", try_lock)
+        monkeypatch.setattr(manager, "_ensure_partitions", ensure)
+        monkeypatch.setattr(manager, "_apply_retention", retire)
+
+        first = asyncio.run(manager.run_once())
+        second = asyncio.run(manager.run_once())
+        assert first["retired"] == ["practice_sessions_y2024m01"]
+        assert second == {"partitioned": True, "skipped": True}
+        assert FakeReconciler.runs == 1
+        assert manager.stats()["skipped"] == 1
+
+    def test_rejects_unknown_retention_mode(self, monkeypatch):
+        
+        monkeypatch.setenv("SESSION_RETENTION_MODE", "shred")
+        with pytest.raises(ValueError):
+            PartitionManager()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,96 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services.ai_service import AIService
+from services.prevalidator import PreValidator, inflections
+
+
+class TestPreValidator:
+    
+
+    def test_plausible_sentences_pass(self):
+        
+        validator = PreValidator(enabled=True)
+        for word, sentence in [
+            ("apple", "I eat an apple."),
+            ("run", "She ran home quickly."),
+            ("run", "He is running late."),
+            ("study", "He studied all night."),
+            ("stop", "They stopped the car."),
+            ("happy", "They lived happily ever after."),
+            ("child", "The children play outside."),
+            ("ice cream", "I love ice cream."),
+            ("apple", "Apples are red."),
+        ]:
+            assert validator.check(word, sentence) is None, (word, sentence)
+
+    def test_clear_failures_are_rejected_with_reason(self):
+        
+        validator = PreValidator(enabled=True)
+        cases = {
+            "empty": "   ",
+            "not_text": "!!!! ???? 1234",
+            "too_short": "Apple",
+            "gibberish": "asdfgh qwrtzp lkjhg",
+            "missing_word": "I eat a banana.",
+        }
+        for reason, sentence in cases.items():
+            result = validator.check("apple", sentence)
+            assert result is not None, reason
+            assert result["is_correct"] is False
+            assert result["score"] <= 2.0
+        assert validator.stats()["by_reason"] == {reason: 1 for reason in cases}
+
+    def test_multi_word_target_needs_every_part(self):
+        
+        validator = PreValidator(enabled=True)
+        assert validator.check("ice cream", "I love ice.") is not None
+        assert validator.check("ice cream", "Ice creams melt fast.") is None
+
+    def test_inflections_cover_regular_and_irregular_forms(self):
+        
+        assert {"makes", "making", "made"} <= inflections("make")
+        assert {"bigger", "biggest"} <= inflections("big")
+        assert {"flies", "flew"} <= inflections("fly")
+
+    def test_disabled_passes_everything(self):
+        
+        validator = PreValidator(enabled=False)
+        assert validator.check("apple", "") is None
+        assert validator.stats()["checked"] == 0
+
+    def test_rejections_skip_webhook_and_cache(self, mock_upstream):
+        
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"score": 8.0, "cefr_level": "B1", "feedback": "ok"})
+
+        async def run():
+            mock_upstream("n8n", handler)
+            service = AIService()
+            service.prevalidator = PreValidator(enabled=True)
+            rejected = await service.validate_sentence("apple", "A fruit", "I eat a banana.")
+            accepted = await service.validate_sentence("apple", "A fruit", "I eat an apple.")
+            batch = await service.validate_batch([
+                {"word": "apple", "definition": "A fruit", "sentence": "xkcd"},
+                {"word": "apple", "definition": "A fruit", "sentence": "Apples are green."}
+            ])
+            return service, rejected, accepted, batch
+
+        service, rejected, accepted, batch = asyncio.run(run())
+        assert len(calls) == 2
+        assert rejected["is_correct"] is False
+        assert rejected["corrected_sentence"] == "I eat a banana."
+        assert accepted["score"] == 8.0
+        assert batch[0]["is_correct"] is False and batch[1]["score"] == 8.0
+        assert service.cache.stats()["upstream_calls"] == 2
+        stats = service.upstream_stats()["prevalidator"]
+        assert stats["rejected"] == 2 and stats["checked"] == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
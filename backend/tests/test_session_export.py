@@ -0,0 +1,76 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from db.database import Base
+from db.models import PracticeSession
+from services.session_export import export_sessions
+
+START = datetime(2025, 1, 1)
+
+
+async def _seeded_factory(rows=25):
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(PracticeSession), [
+            {
+                "word_id": i % 2,
+                "user_sentence": f'Sentence {i}, with "quotes".',
+                "score": 7.5,
+                "cefr_level": "B1",
+                "feedback": "ok",
+                "practiced_at": START + timedelta(minutes=i),
+                "status": "completed"
+            }
+            for i in range(rows)
+        ])
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def _export(fmt, **kwargs):
+    factory = await _seeded_factory()
+    chunks = [chunk async for chunk in await export_sessions(fmt, session_factory=factory, batch_size=4, **kwargs)]
+    return chunks
+
+
+class TestSessionExport:
+    
+
+    def test_ndjson_streams_in_batches_and_filters(self):
+        
+        chunks = asyncio.run(_export("ndjson", word_id=1))
+        records = [json.loads(line) for line in b"".join(chunks).splitlines()]
+        assert len(chunks) == 3
+        assert [r["id"] for r in records] == list(range(2, 26, 2))
+        assert records[0]["score"] == 7.5
+        assert records[0]["practiced_at"] == "2025-01-01T00:01:00"
+
+    def test_csv_gzip_round_trip(self):
+        
+        chunks = asyncio.run(_export("csv", gzip=True))
+        rows = list(csv.reader(io.StringIO(gzip.decompress(b"".join(chunks)).decode())))
+        assert rows[0][:3] == ["id", "word_id", "user_sentence"]
+        assert len(rows) == 26
+        assert rows[1][2] == 'Sentence 0, with "quotes".'
+
+    def test_parquet_row_group_per_batch(self):
+        
+        pq = pytest.importorskip("pyarrow.parquet")
+        chunks = asyncio.run(_export("parquet"))
+        parquet = pq.ParquetFile(io.BytesIO(b"".join(chunks)))
+        assert parquet.metadata.num_rows == 25
+        assert parquet.metadata.num_row_groups == 7
+        assert parquet.read().column("score").to_pylist()[0] == 7.5
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
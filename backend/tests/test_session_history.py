@@ -0,0 +1,96 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from db.database import Base
+from db.models import PracticeSession
+from routes.dashboard import _decode_cursor, _encode_cursor
+from services.practice_service import PracticeService
+
+START = datetime(2025, 1, 1)
+
+
+async def _seeded_factory():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # Pairs of rows share a timestamp so the id tiebreaker is exercised.
+        await conn.execute(insert(PracticeSession), [
+            {
+                "word_id": i % 3,
+                "user_sentence": f"Sentence {i}.",
+                "score": float(i % 11),
+                "cefr_level": ("A2", "B1", "C1")[i % 3],
+                "feedback": "ok",
+                "practiced_at": START + timedelta(minutes=i // 2),
+                "status": "pending" if i % 10 == 9 else "completed"
+            }
+            for i in range(50)
+        ])
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def _walk(factory, limit, **filters):
+    pages, after = [], None
+    async with factory() as db:
+        service = PracticeService(db)
+        while True:
+            rows, has_more = await service.get_sessions_page(limit=limit, after=after, **filters)
+            pages.append([row.id for row in rows])
+            if not has_more:
+                return pages
+            after = (rows[-1].practiced_at, rows[-1].id)
+
+
+class TestSessionHistory:
+    
+
+    def test_pages_cover_every_completed_row_once_in_order(self):
+        
+        async def run():
+            factory = await _seeded_factory()
+            return await _walk(factory, limit=7)
+
+        pages = asyncio.run(run())
+        ids = [i for page in pages for i in page]
+        expected = sorted((i + 1 for i in range(50) if i % 10 != 9), key=lambda n: ((n - 1) // 2, n), reverse=True)
+        assert ids == expected
+        assert all(len(page) == 7 for page in pages[:-1])
+
+    def test_filters_combine_with_the_seek(self):
+        
+        async def run():
+            factory = await _seeded_factory()
+            return await _walk(
+                factory,
+                limit=2,
+                word_id=1,
+                min_score=3,
+                max_score=8,
+                since=START + timedelta(minutes=5),
+                until=START + timedelta(minutes=20)
+            )
+
+        ids = [i for page in asyncio.run(run()) for i in page]
+        expected = [
+            i + 1 for i in reversed(range(50))
+            if i % 10 != 9 and i % 3 == 1 and 3 <= i % 11 <= 8 and 5 <= i // 2 < 20
+        ]
+        assert ids == expected
+
+    def test_cursor_round_trip_and_rejects_garbage(self):
+        
+        session = PracticeSession(id=42, practiced_at=datetime(2025, 12, 12, 10, 0, 0, 123456))
+        assert _decode_cursor(_encode_cursor(session)) == (session.practiced_at, 42)
+        with pytest.raises(HTTPException) as exc:
+            _decode_cursor("not-a-cursor")
+        assert exc.value.status_code == 400
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,96 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, select
+
+from db.models import PracticeSession
+from services.practice_service import PracticeService
+from services.session_writer import SessionWriteBuffer
+
+
+def _session(i):
+    return PracticeSession(
+        word_id=1,
+        user_sentence=f"Sentence {i}.",
+        score=7.0,
+        cefr_level="B1",
+        feedback="ok",
+        practiced_at=datetime.utcnow()
+    )
+
+
+class TestSessionWriteBuffer:
+    
+
+    def test_concurrent_writes_share_a_flush(self, session_factory):
+        
+        async def run():
+            writer = SessionWriteBuffer(enabled=True, session_factory=session_factory)
+            writer.flush_interval = 0.01
+            await writer.start()
+            sessions = await asyncio.gather(*(writer.write(_session(i)) for i in range(25)))
+            await writer.stop()
+            async with session_factory() as db:
+                rows = (await db.execute(select(PracticeSession).order_by(PracticeSession.id))).scalars().all()
+            return writer, sessions, rows
+
+        writer, sessions, rows = asyncio.run(run())
+        assert writer.flushes == 1
+        assert [s.id for s in sessions] == [r.id for r in rows]
+        assert [s.user_sentence for s in sessions] == [r.user_sentence for r in rows]
+        assert all(r.status == "completed" for r in rows)
+
+    def test_stop_flushes_buffer(self, session_factory):
+        
+        async def run():
+            writer = SessionWriteBuffer(enabled=True, session_factory=session_factory)
+            writer.flush_interval = 60
+            await writer.start()
+            pending = [asyncio.create_task(writer.write(_session(i))) for i in range(3)]
+            await asyncio.sleep(0.01)
+            await writer.stop()
+            await asyncio.gather(*pending)
+            async with session_factory() as db:
+                return (await db.execute(select(func.count(PracticeSession.id)))).scalar()
+
+        assert asyncio.run(run()) == 3
+
+    def test_writer_waiting_for_space_at_stop_is_written(self, session_factory):
+        
+        async def run():
+            writer = SessionWriteBuffer(enabled=True, session_factory=session_factory)
+            writer.capacity = 1
+            writer.flush_interval = 60
+            await writer.start()
+            first = asyncio.create_task(writer.write(_session(0)))
+            await asyncio.sleep(0.01)
+            # Blocked on capacity until stop() flushes the first row.
+            second = asyncio.create_task(writer.write(_session(1)))
+            await asyncio.sleep(0.01)
+            await writer.stop()
+            sessions = await asyncio.wait_for(asyncio.gather(first, second), 2)
+            async with session_factory() as db:
+                count = (await db.execute(select(func.count(PracticeSession.id)))).scalar()
+            return sessions, count
+
+        sessions, count = asyncio.run(run())
+        assert sorted(s.id for s in sessions) == [1, 2]
+        assert count == 2
+
+    def test_practice_service_uses_writer(self, session_factory):
+        
+        async def run():
+            writer = SessionWriteBuffer(enabled=True, session_factory=session_factory)
+            async with session_factory() as db:
+                session = await PracticeService(db, writer=writer).save_session(
+                    word_id=1, user_sentence="Hi.", score=8.0, cefr_level="A2", feedback="ok"
+                )
+            await writer.stop()
+            return session
+
+        assert asyncio.run(run()).id == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
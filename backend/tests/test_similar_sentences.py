@@ -0,0 +1,127 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services.ai_service import AIService
+from services.practice_service import PracticeService
+from services.similar_sentences import SimilarSentenceIndex, jaccard, normalize, shingles
+
+SENTENCE = "I eat an apple every morning for breakfast."
+VERDICT = {"score": 8.0, "cefr_level": "B1", "is_correct": True, "feedback": "Nice.", "corrected_sentence": SENTENCE}
+
+
+def _index(threshold=0.9):
+    index = SimilarSentenceIndex()
+    index.enabled = True
+    index.threshold = threshold
+    return index
+
+
+class TestSimilarSentenceIndex:
+    
+
+    def test_formatting_variants_are_exact_hits(self):
+        
+        index = _index()
+        index.add(1, SENTENCE, VERDICT)
+        for variant in ("i eat an apple every morning for breakfast ", "I eat an apple, every morning for breakfast!"):
+            result, similarity = index.lookup(1, variant)
+            assert similarity == 1.0
+            assert result["score"] == 8.0
+
+    def test_threshold_decides_small_edits(self):
+        
+        edited = "I eat an apple every morning for breakfast today."
+        similarity = jaccard(shingles(normalize(SENTENCE)), shingles(normalize(edited)))
+        strict, loose = _index(0.9), _index(0.7)
+        strict.add(1, SENTENCE, VERDICT)
+        loose.add(1, SENTENCE, VERDICT)
+        assert 0.7 < similarity < 0.9
+        assert strict.lookup(1, edited) is None
+        assert loose.lookup(1, edited)[1] == round(similarity, 4)
+        assert loose.lookup(1, "Apples are my favourite fruit.") is None
+
+    def test_changed_article_is_reused(self):
+        
+        index = _index()
+        index.add(1, "I eat an apple every morning.", VERDICT)
+        result, similarity = index.lookup(1, "I eat the apple every morning.")
+        assert similarity == 1.0
+        assert result["score"] == 8.0
+        # Any other changed word is a different sentence.
+        assert index.lookup(1, "I ate an apple every morning.") is None
+        
+        index.fold_articles = False
+        index.add(2, "I eat an apple every morning.", VERDICT)
+        assert index.lookup(2, "I eat the apple every morning.") is None
+
+    def test_words_are_separate(self):
+        
+        index = _index()
+        index.add(1, SENTENCE, VERDICT)
+        assert index.lookup(2, SENTENCE) is None
+
+    def test_unchanged_sentence_is_not_offered_as_correction(self):
+        
+        index = _index()
+        index.add(1, SENTENCE, VERDICT)
+        index.add(1, "He go to school.", {**VERDICT, "corrected_sentence": "He goes to school."})
+        assert index.lookup(1, SENTENCE)[0]["corrected_sentence"] is None
+        assert index.lookup(1, "he go to school")[0]["corrected_sentence"] == "He goes to school."
+
+    def test_eviction_keeps_buckets_consistent(self):
+        
+        index = _index()
+        index.max_per_word = 2
+        for n in range(5):
+            index.add(1, f"Sentence number {n} about apples.", VERDICT)
+        word = index._words[1]
+        assert len(word.entries) == 2
+        assert set().union(*word.buckets.values()) == set(word.entries)
+
+    def test_rebuild_loads_graded_sessions_only(self, session_factory):
+        
+        async def run():
+            async with session_factory() as db:
+                service = PracticeService(db)
+                await service.save_session(word_id=1, user_sentence=SENTENCE, score=9.0, cefr_level="B2", feedback="Good.")
+                await service.save_session(word_id=1, user_sentence="Apple pie is sweet.", score=7.0, cefr_level="B1",
+                                           feedback="[Mock - timeout] Good attempt!")
+                await service.create_pending_session(word_id=1, user_sentence="I like apples a lot.")
+            index = _index()
+            index.session_factory = session_factory
+            rows = await index.rebuild()
+            return index, rows
+
+        index, rows = asyncio.run(run())
+        assert rows == 1
+        result, _ = index.lookup(1, SENTENCE.upper())
+        assert result["score"] == 9.0 and result["is_correct"] is True
+        assert index.lookup(1, "Apple pie is sweet.") is None
+
+    def test_ai_service_skips_webhook_for_near_duplicates(self, mock_upstream):
+        
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"score": 9.0, "cefr_level": "B2", "feedback": "Great."})
+
+        async def run():
+            mock_upstream("n8n", handler)
+            service = AIService()
+            service.similar = _index()
+            first = await service.validate_sentence("apple", "A fruit", SENTENCE, word_id=1)
+            second = await service.validate_sentence("apple", "A fruit", "i eat an apple every morning for breakfast!!", word_id=1)
+            third = await service.validate_sentence("apple", "A fruit", "i eat an apple every morning for breakfast", word_id=2)
+            return first, second, third
+
+        first, second, third = asyncio.run(run())
+        assert len(calls) == 2
+        assert second["score"] == first["score"] == 9.0
+        assert second["corrected_sentence"] == "i eat an apple every morning for breakfast!!"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from db.migrate import MigrationError, check_schema, discover, migrate, pending
+from services.readiness import Readiness
+
+
+class TestMigrate:
+    
+
+    def test_discovers_repo_migrations_in_order(self):
+        
+        versions = [version for version, _ in discover()]
+        assert versions == sorted(versions)
+        assert versions[:5] == ["001", "002", "003", "004", "005"]
+
+    def test_pending_skips_applied_versions(self):
+        
+        available = [("001", "a.sql"), ("002", "b.sql"), ("003", "c.sql")]
+        assert pending(available, {"001", "003"}) == [("002", "b.sql")]
+
+    def test_sqlite_schema_comes_from_models(self, tmp_path):
+        
+        url = f"sqlite:///{tmp_path / 'app.db'}"
+        first = migrate(url)
+        second = migrate(url)
+        engine = create_engine(url)
+        assert "practice_sessions" in first
+        assert second == []
+        assert inspect(engine).has_table("practice_sessions")
+        engine.dispose()
+
+    def test_schema_check_fails_before_migrate(self, tmp_path):
+        
+        url = f"sqlite:///{tmp_path / 'app.db'}"
+
+        async def check():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'app.db'}")
+            try:
+                await check_schema(engine)
+            finally:
+                await engine.dispose()
+
+        with pytest.raises(MigrationError):
+            asyncio.run(check())
+        migrate(url)
+        asyncio.run(check())
+
+
+class TestReadiness:
+    
+
+    def test_failed_check_is_retried_until_ready(self):
+        
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError("database unreachable")
+
+        async def run():
+            readiness = Readiness()
+            readiness.retry_interval = 0.01
+            readiness.register("database", flaky)
+            await readiness.start()
+            before = readiness.stats()
+            for _ in range(100):
+                if readiness.ready:
+                    break
+                await asyncio.sleep(0.01)
+            await readiness.stop()
+            return before, readiness.stats()
+
+        before, after = asyncio.run(run())
+        assert before["ready"] is False
+        assert before["checks"]["database"]["error"] == "database unreachable"
+        assert after["ready"] is True
+        assert len(attempts) == 3
+
+    def test_later_checks_wait_for_earlier_ones(self):
+        
+        ran = []
+
+        async def failing():
+            raise RuntimeError("down")
+
+        async def schema():
+            ran.append("schema")
+
+        async def run():
+            readiness = Readiness()
+            readiness.retry_interval = 0
+            readiness.register("database", failing)
+            readiness.register("schema", schema)
+            await readiness.start()
+            return readiness.stats()
+
+        stats = asyncio.run(run())
+        assert ran == []
+        assert stats["checks"]["schema"] == {"ok": False, "error": "not run"}
+
+    def test_slow_check_times_out(self):
+        
+        async def hang():
+            await asyncio.sleep(10)
+
+        async def run():
+            readiness = Readiness()
+            readiness.timeout = 0.01
+            readiness.retry_interval = 0
+            readiness.register("database", hang)
+            await readiness.start()
+            return readiness.stats()
+
+        assert asyncio.run(run())["checks"]["database"]["ok"] is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select, update
+
+from db.models import PracticeStats, WordScoreDaily, WordScoreTotal
+from services.practice_service import PracticeService
+from services.stats_aggregates import reconcile
+
+
+async def _seed(db):
+    service = PracticeService(db)
+    await service.save_session(word_id=1, user_sentence="A.", score=8.0, cefr_level="B1", feedback="ok")
+    await service.save_session(word_id=1, user_sentence="B.", score=6.0, cefr_level="A2", feedback="ok")
+    await service.save_sessions([
+        {"word_id": 2, "user_sentence": "C.", "score": 7.0, "cefr_level": "B1", "feedback": "ok"}
+    ])
+    pending = await service.create_pending_session(3, "D.")
+    return service, pending
+
+
+class TestStatsAggregates:
+    
+
+    def test_aggregates_match_full_scan(self, session_factory):
+        
+        async def run():
+            async with session_factory() as db:
+                service, pending = await _seed(db)
+                before = await service.get_statistics()
+                await service.complete_session(pending.id, score=10.0, cefr_level="C1", feedback="great")
+                after = await service.get_statistics()
+                scanned = await service.compute_statistics()
+            return before, after, scanned
+
+        before, after, scanned = asyncio.run(run())
+        assert before == {"total_sessions": 3, "average_score": 7.0, "most_common_level": "B1"}
+        assert after == scanned
+        assert after["total_sessions"] == 4
+
+    def test_reconcile_corrects_drift(self, session_factory):
+        
+        async def run():
+            async with session_factory() as db:
+                service, _ = await _seed(db)
+                await db.execute(update(PracticeStats).values(total_sessions=99))
+                await db.commit()
+                drifted = await service.get_statistics()
+                fixed = await reconcile(db)
+            return drifted, fixed
+
+        drifted, fixed = asyncio.run(run())
+        assert drifted["total_sessions"] == 99
+        assert fixed == {"total_sessions": 3, "average_score": 7.0, "most_common_level": "B1"}
+
+    def test_reconcile_only_applies_the_difference(self, session_factory):
+        
+        async def rollups(db):
+            daily = (await db.execute(select(WordScoreDaily.word_id, WordScoreDaily.sessions))).all()
+            totals = (await db.execute(select(WordScoreTotal.word_id, WordScoreTotal.sessions))).all()
+            return sorted(daily), sorted(totals)
+
+        async def run():
+            async with session_factory() as db:
+                await _seed(db)
+                expected = await rollups(db)
+                await db.execute(update(WordScoreTotal).where(WordScoreTotal.word_id == 2).values(sessions=5))
+                await db.execute(update(WordScoreDaily).where(WordScoreDaily.word_id == 1).values(sessions=0))
+                await db.commit()
+                await reconcile(db)
+                fixed = await rollups(db)
+                await reconcile(db)
+                return expected, fixed, await rollups(db)
+
+        expected, fixed, again = asyncio.run(run())
+        assert fixed == expected
+        # Nothing drifted the second time, so nothing changed.
+        assert again == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
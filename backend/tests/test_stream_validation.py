@@ -0,0 +1,170 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from services.ai_service import AIService
+from services.circuit_breaker import CLOSED, HALF_OPEN, OPEN
+
+STREAM_URL = "http://n8n/webhook/validate-sentence-stream"
+
+
+def _ndjson(*chunks):
+    return "".join(json.dumps(chunk) + "\n" for chunk in chunks).encode()
+
+
+async def _collect(service, sentence="I eat an apple every day."):
+    return [event async for event in service.stream_validation("apple", "A fruit", sentence)]
+
+
+class TestStreamValidation:
+    
+
+    def test_streams_assessment_then_feedback_deltas(self, mock_upstream):
+        
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(200, content=_ndjson(
+                {"score": 8.5, "cefr_level": "B2", "is_correct": True},
+                {"delta": "Nice "},
+                {"delta": "sentence."},
+                {"corrected_sentence": "I eat an apple every day."}
+            ))
+
+        async def run():
+            mock_upstream("n8n", handler)
+            service = AIService()
+            service.stream_webhook_url = STREAM_URL
+            return await _collect(service), await _collect(service)
+
+        first, repeat = asyncio.run(run())
+        assert [event for event, _ in first] == ["assessment", "feedback", "feedback", "result"]
+        assert first[0][1] == {"score": 8.5, "cefr_level": "B2", "is_correct": True}
+        assert first[-1][1]["feedback"] == "Nice sentence."
+        # The completed stream is cached and replayed without another call.
+        assert len(calls) == 1
+        assert [event for event, _ in repeat] == ["assessment", "feedback", "result"]
+        assert repeat[1][1] == {"delta": "Nice sentence."}
+
+    def test_without_stream_webhook_replays_plain_validation(self, mock_upstream):
+        
+        async def handler(request):
+            return httpx.Response(200, json={"score": 6.0, "cefr_level": "A2", "feedback": "ok"})
+
+        async def run():
+            mock_upstream("n8n", handler)
+            service = AIService()
+            service.stream_webhook_url = None
+            return await _collect(service)
+
+        events = asyncio.run(run())
+        assert [event for event, _ in events] == ["assessment", "feedback", "result"]
+        assert events[-1][1]["score"] == 6.0
+
+    def test_failure_before_assessment_falls_back(self, mock_upstream):
+        
+        async def handler(request):
+            return httpx.Response(500)
+
+        async def run():
+            mock_upstream("n8n", handler)
+            service = AIService()
+            service.stream_webhook_url = STREAM_URL
+            return service, await _collect(service)
+
+        service, events = asyncio.run(run())
+        assert "[Mock - error 500]" in events[-1][1]["feedback"]
+        assert service.breaker.stats()["consecutive_failures"] == 1
+
+    def test_failure_mid_stream_is_raised(self, mock_upstream):
+        
+        async def body():
+            yield _ndjson({"score": 7.0, "cefr_level": "B1"})
+            raise httpx.ReadError("connection lost")
+
+        async def handler(request):
+            return httpx.Response(200, content=body())
+
+        async def run():
+            mock_upstream("n8n", handler)
+            service = AIService()
+            service.stream_webhook_url = STREAM_URL
+            events = []
+            with pytest.raises(httpx.ReadError):
+                async for event in service.stream_validation("apple", "A fruit", "I eat an apple every day."):
+                    events.append(event)
+            return events
+
+        events = asyncio.run(run())
+        assert [event for event, _ in events] == ["assessment"]
+
+    def test_cancelled_half_open_stream_releases_probe(self, mock_upstream):
+        
+        async def body():
+            yield _ndjson({"score": 7.0, "cefr_level": "B1"})
+            await asyncio.sleep(10)
+
+        async def handler(request):
+            if request.url.path.endswith("-stream"):
+                return httpx.Response(200, content=body())
+            return httpx.Response(200, json={"score": 6.0, "cefr_level": "A2", "feedback": "ok"})
+
+        async def run():
+            mock_upstream("n8n", handler)
+            service = AIService()
+            service.stream_webhook_url = STREAM_URL
+            service.breaker.recovery_timeout = 0
+            service.breaker.record_failure()
+            service.breaker._transition(OPEN)
+            assessed = asyncio.Event()
+
+            async def consume():
+                async for event, _ in service.stream_validation("apple", "A fruit", "I eat an apple every day."):
+                    if event == "assessment":
+                        assessed.set()
+
+            task = asyncio.ensure_future(consume())
+            await asyncio.wait_for(assessed.wait(), 2)
+            assert service.breaker.state == HALF_OPEN
+            # The client disconnects mid-stream.
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            state = service.breaker.state
+            return state, await service.validate_sentence("apple", "A fruit", "I eat an apple at noon.")
+
+        state, validation = asyncio.run(run())
+        # The probe is released, not counted as a failure, so the next call probes.
+        assert state == HALF_OPEN
+        assert validation["score"] == 6.0
+        assert "[Mock" not in validation["feedback"]
+
+    def test_closed_streams_do_not_trip_breaker(self, mock_upstream):
+        
+        async def body():
+            yield _ndjson({"score": 7.0, "cefr_level": "B1"})
+            await asyncio.sleep(10)
+
+        async def handler(request):
+            return httpx.Response(200, content=body())
+
+        async def run():
+            mock_upstream("n8n", handler)
+            service = AIService()
+            service.stream_webhook_url = STREAM_URL
+            for n in range(service.breaker.failure_threshold + 2):
+                events = service.stream_validation("apple", "A fruit", f"I eat an apple on day {n}.")
+                await events.__anext__()
+                # The SSE client disconnects.
+                await events.aclose()
+            return service.breaker.stats()
+
+        stats = asyncio.run(run())
+        assert stats["state"] == CLOSED
+        assert stats["consecutive_failures"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
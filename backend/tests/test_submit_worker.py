@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from services.practice_service import PracticeService
+from services.submit_queue import InMemorySubmitQueue, SessionNotifier
+from services.submit_worker import SubmitWorkerPool
+
+
+class FakeVocabService:
+
+    async def get_word_by_id(self, word_id):
+        if word_id == 1:
+            return {"id": 1, "word": "apple", "definition": "A fruit"}
+        return None
+
+
+class FakeAIService:
+
+    async def validate_sentence(self, word, definition, sentence, word_id=None, difficulty=None):
+        return {"score": 8.5, "cefr_level": "B1", "feedback": "Nice.", "corrected_sentence": sentence}
+
+
+def _create_pending(session_factory, word_id, sentence):
+
+    async def run():
+        async with session_factory() as db:
+            return (await PracticeService(db).create_pending_session(word_id, sentence)).id
+
+    return asyncio.run(run())
+
+
+def _get_session(session_factory, session_id):
+
+    async def run():
+        async with session_factory() as db:
+            return await PracticeService(db).get_session(session_id)
+
+    return asyncio.run(run())
+
+
+class TestSubmitWorkerPool:
+    
+
+    def test_worker_completes_pending_session(self, session_factory):
+        
+        session_id = _create_pending(session_factory, 1, "I eat an apple.")
+
+        async def run():
+            queue = InMemorySubmitQueue()
+            pool = SubmitWorkerPool(
+                queue, FakeVocabService(), FakeAIService(), workers=1, session_factory=session_factory
+            )
+            await pool.start()
+            waiter = asyncio.create_task(pool.notifier.wait(session_id, timeout=5))
+            await asyncio.sleep(0)
+            await queue.put(session_id)
+            notified = await waiter
+            await pool.stop()
+            return notified
+
+        assert asyncio.run(run())
+        session = _get_session(session_factory, session_id)
+        assert session.status == "completed"
+        assert float(session.score) == 8.5
+
+    def test_unknown_word_marks_session_failed(self, session_factory):
+        
+        session_id = _create_pending(session_factory, 999, "Hello there.")
+
+        pool = SubmitWorkerPool(
+            InMemorySubmitQueue(), FakeVocabService(), FakeAIService(), workers=1, session_factory=session_factory
+        )
+        asyncio.run(pool.process(session_id))
+
+        session = _get_session(session_factory, session_id)
+        assert session.status == "failed"
+        assert session.feedback == "Word not found"
+
+    def test_expired_claim_is_taken_over(self, session_factory):
+        
+        session_id = _create_pending(session_factory, 1, "I eat an apple.")
+
+        async def claim(lease):
+            async with session_factory() as db:
+                return await PracticeService(db).claim_pending_session(lease)
+
+        async def complete():
+            async with session_factory() as db:
+                await PracticeService(db).complete_session(session_id, 8.0, "B1", "Nice.")
+                return await PracticeService(db).get_statistics()
+
+        assert asyncio.run(claim(300)) == session_id
+        # Still leased to the first worker.
+        assert asyncio.run(claim(300)) is None
+        # That worker died; once the lease is up another one takes the row over.
+        assert asyncio.run(claim(0)) == session_id
+        assert _get_session(session_factory, session_id).claimed_at is not None
+
+        # Both workers finish, but the session is only counted once.
+        asyncio.run(complete())
+        assert asyncio.run(complete())["total_sessions"] == 1
+
+
+class TestSessionNotifier:
+    
+
+    def test_timed_out_waiters_are_dropped(self):
+        
+        notifier = SessionNotifier()
+
+        async def run():
+            results = await asyncio.gather(*(notifier.wait(1, timeout=0.01) for _ in range(3)))
+            waiter = asyncio.ensure_future(notifier.wait(2, timeout=1))
+            await asyncio.sleep(0)
+            notifier.notify(2)
+            return results, await waiter
+
+        timed_out, notified = asyncio.run(run())
+        assert timed_out == [False, False, False]
+        assert notified is True
+        assert notifier._events == {} and not notifier._waiting
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,91 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from middleware.timing import TimingMiddleware
+from services.telemetry import (
+    Registry,
+    http_request_duration,
+    http_requests_in_flight,
+    http_requests_total,
+    timed
+)
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(TimingMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    return app
+
+
+class TestRegistry:
+    
+
+    def test_histogram_renders_cumulative_buckets(self):
+        
+        registry = Registry()
+        latency = registry.histogram("op_seconds", "Op latency.", ("op",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 3.0):
+            latency.observe(value, "read")
+        text = registry.render()
+        assert 'op_seconds_bucket{op="read",le="0.1"} 1' in text
+        assert 'op_seconds_bucket{op="read",le="1"} 3' in text
+        assert 'op_seconds_bucket{op="read",le="+Inf"} 4' in text
+        assert 'op_seconds_count{op="read"} 4' in text
+        assert "# TYPE op_seconds histogram" in text
+
+    def test_label_values_are_escaped_and_names_unique(self):
+        
+        registry = Registry()
+        errors = registry.counter("errors_total", "Errors.", ("reason",))
+        errors.inc('bad "quote"\n')
+        assert 'errors_total{reason="bad \\"quote\\"\\n"} 1' in registry.render()
+        with pytest.raises(ValueError):
+            registry.counter("errors_total", "Again.")
+
+    def test_timed_records_even_on_error(self):
+        
+        registry = Registry()
+        phase = registry.histogram("phase_seconds", "Phase.", ("phase",))
+        with pytest.raises(RuntimeError):
+            with timed(phase, "save"):
+                raise RuntimeError("boom")
+        assert phase.count("save") == 1
+
+
+class TestTimingMiddleware:
+    
+
+    def test_labels_by_route_template_and_status(self):
+        
+        async def run():
+            transport = httpx.ASGITransport(app=_app())
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                await client.get("/items/1")
+                await client.get("/items/2")
+                await client.get("/items/0")
+                await client.get("/missing")
+
+        before = (
+            http_request_duration.count("GET", "/items/{item_id}"),
+            http_requests_total.value("GET", "/items/{item_id}", "404"),
+            http_requests_total.value("GET", "unmatched", "404")
+        )
+        asyncio.run(run())
+        assert http_request_duration.count("GET", "/items/{item_id}") == before[0] + 3
+        assert http_requests_total.value("GET", "/items/{item_id}", "404") == before[1] + 1
+        assert http_requests_total.value("GET", "unmatched", "404") == before[2] + 1
+        assert http_requests_in_flight.value() == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,69 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services.ai_service import AIService
+from services.validation_cache import validation_key
+
+
+def _n8n_transport(calls):
+
+    async def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json=[{
+            "score": 9.0,
+            "cefr_level": "B1",
+            "is_correct": True,
+            "feedback": "Great sentence.",
+            "corrected_sentence": None
+        }])
+
+    return httpx.MockTransport(handler)
+
+
+class TestValidationCache:
+    
+
+    def test_key_ignores_case_and_whitespace(self):
+        
+        assert validation_key("Apple", "I eat an  apple every morning. ") == \
+            validation_key("apple", "i eat an apple every morning.")
+        assert validation_key("apple", "I eat an apple.") != validation_key("apple", "I eat a pear.")
+
+    def test_repeat_sentence_skips_webhook(self, mock_upstream):
+        
+        calls = []
+
+        async def run():
+            mock_upstream("n8n", _n8n_transport(calls))
+            service = AIService()
+            first = await service.validate_sentence("apple", "A fruit", "I eat an apple every morning.")
+            second = await service.validate_sentence("apple", "A fruit", "i eat an apple  every morning.")
+            return service, first, second
+
+        service, first, second = asyncio.run(run())
+        assert len(calls) == 1
+        assert second["score"] == first["score"] == 9.0
+        assert second["corrected_sentence"] == "i eat an apple  every morning."
+        stats = service.cache.stats()
+        assert stats["hits"] == 1
+        assert stats["upstream_calls"] == 1
+
+    def test_fallback_results_are_not_cached(self, mock_upstream):
+        
+        async def failing(request):
+            return httpx.Response(500)
+
+        async def run():
+            mock_upstream("n8n", failing)
+            service = AIService()
+            await service.validate_sentence("apple", "A fruit", "I eat an apple.")
+            return service
+
+        service = asyncio.run(run())
+        assert len(service.cache.memory) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,83 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services.cache import MISSING, TTLCache
+from services.vocab_service import VocabService
+
+
+def _vocab_transport(calls):
+
+    async def handler(request):
+        calls.append(request.url.path)
+        await asyncio.sleep(0.01)
+        if request.url.path == "/api/words/1":
+            return httpx.Response(200, json={"id": 1, "word": "apple", "definition": "A fruit"})
+        return httpx.Response(404, json={"detail": "Word not found"})
+
+    return httpx.MockTransport(handler)
+
+
+class TestTTLCache:
+    
+
+    def test_entries_expire(self, clock):
+        
+        cache = TTLCache(maxsize=4, ttl=10, clock=clock)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        clock.now = 11
+        assert cache.get("a") is MISSING
+
+    def test_lru_eviction(self):
+        
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is MISSING
+        assert cache.get("a") == 1
+        assert cache.evictions == 1
+
+
+class TestVocabCache:
+    
+
+    def test_concurrent_misses_share_one_request(self, mock_upstream):
+        
+        calls = []
+
+        async def run():
+            mock_upstream("vocab", _vocab_transport(calls))
+            service = VocabService()
+            words = await asyncio.gather(*(service.get_word_by_id(1) for _ in range(10)))
+            again = await service.get_word_by_id(1)
+            return service, words, again
+
+        service, words, again = asyncio.run(run())
+        assert all(w["word"] == "apple" for w in words)
+        assert again["word"] == "apple"
+        assert calls == ["/api/words/1"]
+        assert service.cache_stats()["coalesced"] == 9
+
+    def test_not_found_is_cached(self, mock_upstream):
+        
+        calls = []
+
+        async def run():
+            mock_upstream("vocab", _vocab_transport(calls))
+            service = VocabService()
+            first = await service.get_word_by_id(999)
+            second = await service.get_word_by_id(999)
+            return service, first, second
+
+        service, first, second = asyncio.run(run())
+        assert first is None and second is None
+        assert len(calls) == 1
+        assert service.cache_stats()["negative_hits"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
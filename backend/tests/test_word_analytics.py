@@ -0,0 +1,113 @@
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from db.models import Word, WordScoreDaily, WordScoreTotal
+from services.practice_service import PracticeService
+from services.stats_aggregates import reconcile
+from services.word_analytics import WordAnalyticsService, distribution_summary
+
+
+async def _seed(db):
+    db.add_all([
+        Word(id=1, word="apple", definition="A fruit", difficulty_level="Beginner"),
+        Word(id=2, word="ubiquitous", definition="Found everywhere", difficulty_level="Advanced")
+    ])
+    service = PracticeService(db)
+    for score, level in ((9.0, "B2"), (8.0, "B1"), (8.0, "B1")):
+        await service.save_session(word_id=1, user_sentence="Apple.", score=score, cefr_level=level, feedback="ok")
+    await service.save_sessions([
+        {"word_id": 2, "user_sentence": "Hard.", "score": score, "cefr_level": "A2", "feedback": "ok"}
+        for score in (3.0, 4.5, 6.0)
+    ])
+    old = await service.create_pending_session(2, "Old.")
+    old.practiced_at = datetime.utcnow() - timedelta(days=40)
+    await db.commit()
+    await service.complete_session(old.id, score=2.0, cefr_level="A1", feedback="weak")
+
+
+async def _rollups(db):
+    daily = (await db.execute(select(WordScoreDaily).order_by(
+        WordScoreDaily.day, WordScoreDaily.word_id, WordScoreDaily.cefr_level, WordScoreDaily.score
+    ))).scalars().all()
+    totals = (await db.execute(select(WordScoreTotal).order_by(
+        WordScoreTotal.word_id, WordScoreTotal.cefr_level, WordScoreTotal.score
+    ))).scalars().all()
+    return (
+        [(str(r.day), r.word_id, r.cefr_level, Decimal(str(r.score)), r.sessions) for r in daily],
+        [(r.word_id, r.cefr_level, Decimal(str(r.score)), r.sessions) for r in totals]
+    )
+
+
+class TestWordAnalytics:
+    
+
+    def test_summary_per_word_and_difficulty(self, session_factory):
+        
+        async def run():
+            async with session_factory() as db:
+                await _seed(db)
+                service = WordAnalyticsService(db)
+                return await service.summary(), await service.summary(days=30)
+
+        everything, recent = asyncio.run(run())
+        hardest = everything["words"][0]
+        assert hardest["word"] == "ubiquitous"
+        assert hardest["attempts"] == 4
+        assert hardest["cefr_distribution"] == {"A1": 1, "A2": 3}
+        assert recent["words"][0]["attempts"] == 3
+        assert recent["words"][0]["average_score"] == 4.5
+        assert [d["difficulty_level"] for d in everything["difficulties"]] == ["Advanced", "Beginner"]
+        beginner = everything["difficulties"][1]
+        assert beginner["words"] == 1
+        assert beginner["p50_score"] == 8.0
+        assert beginner["p90_score"] == 9.0
+
+    def test_limit_applies_to_words_not_difficulties(self, session_factory):
+        
+        async def run():
+            async with session_factory() as db:
+                await _seed(db)
+                # Practised, but missing from the words table.
+                await PracticeService(db).save_session(
+                    word_id=3, user_sentence="Gone.", score=10.0, cefr_level="C2", feedback="ok"
+                )
+                return await WordAnalyticsService(db).summary(limit=1)
+
+        summary = asyncio.run(run())
+        assert [w["word"] for w in summary["words"]] == ["ubiquitous"]
+        assert [(d["difficulty_level"], d["words"]) for d in summary["difficulties"]] == [
+            ("Advanced", 1), ("Beginner", 1), ("Unknown", 1)
+        ]
+
+    def test_incremental_rollups_match_rebuild(self, session_factory):
+        
+        async def run():
+            async with session_factory() as db:
+                await _seed(db)
+                incremental = await _rollups(db)
+                await reconcile(db)
+                rebuilt = await _rollups(db)
+            return incremental, rebuilt
+
+        incremental, rebuilt = asyncio.run(run())
+        assert incremental == rebuilt
+        assert len(incremental[1]) == 6
+
+    def test_distribution_summary_percentiles(self):
+        
+        scores = Counter({Decimal("2.0"): 1, Decimal("5.0"): 8, Decimal("9.5"): 1})
+        summary = distribution_summary(scores, Counter({"B1": 10}))
+        assert summary["attempts"] == 10
+        assert summary["average_score"] == 5.15
+        assert summary["p50_score"] == 5.0
+        assert summary["p90_score"] == 5.0
+        assert distribution_summary(Counter(), Counter())["p50_score"] is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,71 @@
+import asyncio
+import itertools
+
+import pytest
+
+from services.word_pool import WordPool
+
+
+class FakeVocabService:
+
+    def __init__(self):
+        self.calls = 0
+        self._ids = itertools.count(1)
+
+    async def get_random_word(self, difficulty=None):
+        self.calls += 1
+        return {"id": next(self._ids), "word": "apple", "difficulty_level": difficulty or "Beginner"}
+
+
+class TestWordPool:
+    
+
+    def test_serves_from_pool_after_warmup(self):
+        
+        async def run():
+            vocab = FakeVocabService()
+            pool = WordPool(vocab)
+            await pool.start()
+            await asyncio.gather(*pool._refills.values())
+            calls = vocab.calls
+            word = pool.take("Beginner", "client-a")
+            await pool.stop()
+            return pool, vocab, calls, word
+
+        pool, vocab, calls, word = asyncio.run(run())
+        assert word is not None
+        assert word["difficulty_level"] == "Beginner"
+        assert pool.stats()["sizes"]["Beginner"] == pool.high_water - 1
+        assert vocab.calls == calls
+
+    def test_empty_pool_returns_none_and_refills(self):
+        
+        async def run():
+            pool = WordPool(FakeVocabService())
+            word = pool.take("Advanced")
+            await asyncio.gather(*pool._refills.values())
+            return pool, word
+
+        pool, word = asyncio.run(run())
+        assert word is None
+        assert pool.stats()["sizes"]["Advanced"] == pool.high_water
+
+    def test_skips_recent_words_for_same_caller(self):
+        
+        async def run():
+            pool = WordPool(FakeVocabService())
+            pool._pools["Beginner"].extend([{"id": 1}, {"id": 2}, {"id": 1}])
+            served = [pool.take("Beginner", "client-a")["id"] for _ in range(2)]
+            await pool.stop()
+            return served
+
+        assert asyncio.run(run()) == [1, 2]
+
+    def test_unknown_difficulty_is_not_pooled(self):
+        
+        pool = WordPool(FakeVocabService())
+        assert pool.take("Expert") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
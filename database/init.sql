@@ -11,20 +11,99 @@ CREATE TABLE words (
 );
 
 
+-- Range-partitioned by month on practiced_at; the backend's PartitionManager
+-- keeps future months created and applies SESSION_RETENTION_MONTHS.
+-- The primary key has to include the partition key.
 CREATE TABLE practice_sessions (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     word_id INTEGER NOT NULL REFERENCES words(id) ON DELETE CASCADE,
     user_sentence TEXT NOT NULL,
     score DECIMAL(3,1) CHECK (score BETWEEN 0 AND 10),
     cefr_level VARCHAR(10),
     feedback TEXT,
     corrected_sentence TEXT,
-    practiced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    practiced_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    status VARCHAR(20) NOT NULL DEFAULT 'completed',
+    claimed_at TIMESTAMP,
+    PRIMARY KEY (id, practiced_at)
+) PARTITION BY RANGE (practiced_at);
+
+-- Catches rows outside every monthly range so inserts never fail.
+CREATE TABLE practice_sessions_default PARTITION OF practice_sessions DEFAULT;
+
+DO $$
+DECLARE
+    month DATE := date_trunc('month', CURRENT_DATE);
+BEGIN
+    FOR i IN 0..3 LOOP
+        EXECUTE format(
+            'CREATE TABLE practice_sessions_y%sm%s PARTITION OF practice_sessions FOR VALUES FROM (%L) TO (%L)',
+            to_char(month, 'YYYY'), to_char(month, 'MM'), month, month + INTERVAL '1 month'
+        );
+        month := month + INTERVAL '1 month';
+    END LOOP;
+END $$;
+
+-- AI validation results keyed by sha256(normalized word + sentence)
+CREATE TABLE validation_cache (
+    key VARCHAR(64) PRIMARY KEY,
+    word VARCHAR(100) NOT NULL,
+    result JSON NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Stored responses for Idempotency-Key on POST /api/practice/submit
+CREATE TABLE idempotency_keys (
+    key VARCHAR(300) PRIMARY KEY,
+    request_hash VARCHAR(64) NOT NULL,
+    status_code INTEGER,
+    response JSON,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL
+);
+
+-- Incrementally maintained dashboard aggregates (completed sessions only)
+CREATE TABLE practice_stats (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    total_sessions BIGINT NOT NULL DEFAULT 0,
+    scored_sessions BIGINT NOT NULL DEFAULT 0,
+    score_sum DECIMAL(14,1) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO practice_stats (id) VALUES (1);
+
+CREATE TABLE practice_level_counts (
+    cefr_level VARCHAR(10) PRIMARY KEY,
+    sessions BIGINT NOT NULL DEFAULT 0
+);
+
+-- Per-word score rollups behind /api/dashboard/words (scored, completed sessions)
+CREATE TABLE word_score_daily (
+    day DATE NOT NULL,
+    word_id INTEGER NOT NULL,
+    cefr_level VARCHAR(10) NOT NULL,
+    score DECIMAL(3,1) NOT NULL,
+    sessions BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, word_id, cefr_level, score)
+);
+
+CREATE TABLE word_score_totals (
+    word_id INTEGER NOT NULL,
+    cefr_level VARCHAR(10) NOT NULL,
+    score DECIMAL(3,1) NOT NULL,
+    sessions BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (word_id, cefr_level, score)
 );
 
 CREATE INDEX idx_words_difficulty ON words(difficulty_level);
 CREATE INDEX idx_sessions_word_id ON practice_sessions(word_id);
 CREATE INDEX idx_sessions_practiced_at ON practice_sessions(practiced_at DESC);
+CREATE INDEX idx_sessions_claimable ON practice_sessions(id) WHERE status IN ('pending', 'processing');
+CREATE INDEX idx_sessions_history ON practice_sessions(practiced_at DESC, id DESC) WHERE status = 'completed';
+CREATE INDEX idx_sessions_word_history ON practice_sessions(word_id, practiced_at DESC, id DESC) WHERE status = 'completed';
+CREATE INDEX idx_sessions_level_history ON practice_sessions(cefr_level, practiced_at DESC, id DESC) WHERE status = 'completed';
+CREATE INDEX idx_idempotency_keys_expires ON idempotency_keys(expires_at);
 
 
 
@@ -63,4 +142,13 @@ INSERT INTO words (word, definition, difficulty_level) VALUES
 ('facilitate', 'Make an action or process easier', 'Advanced'),
 ('comprehensive', 'Complete and including everything necessary', 'Advanced'),
 ('mitigate', 'Make something less severe or serious', 'Advanced'),
-('ephemeral', 'Lasting for a very short time', 'Advanced');
\ No newline at end of file
+('ephemeral', 'Lasting for a very short time', 'Advanced');
+
+-- Migrations already reflected in this file; `python -m db.migrate` applies
+-- anything newer. Add each new migration's version here too.
+CREATE TABLE schema_migrations (
+    version VARCHAR(32) PRIMARY KEY,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO schema_migrations (version) VALUES ('001'), ('002'), ('003'), ('004'), ('005'), ('006'), ('007');
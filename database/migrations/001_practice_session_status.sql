@@ -0,0 +1,14 @@
+-- Adds the async submit status to databases created before it existed.
+-- Fresh installs get the same schema from database/init.sql.
+
+ALTER TABLE practice_sessions
+    ADD COLUMN IF NOT EXISTS status VARCHAR(20) NOT NULL DEFAULT 'completed';
+
+CREATE INDEX IF NOT EXISTS idx_sessions_pending ON practice_sessions(id) WHERE status = 'pending';
+
+CREATE TABLE IF NOT EXISTS validation_cache (
+    key VARCHAR(64) PRIMARY KEY,
+    word VARCHAR(100) NOT NULL,
+    result JSON NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,36 @@
+-- Summary tables behind /api/dashboard/stats, backfilled from existing sessions.
+
+CREATE TABLE IF NOT EXISTS practice_stats (
+    id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    total_sessions BIGINT NOT NULL DEFAULT 0,
+    scored_sessions BIGINT NOT NULL DEFAULT 0,
+    score_sum DECIMAL(14,1) NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS practice_level_counts (
+    cefr_level VARCHAR(10) PRIMARY KEY,
+    sessions BIGINT NOT NULL DEFAULT 0
+);
+
+BEGIN;
+
+INSERT INTO practice_stats (id, total_sessions, scored_sessions, score_sum, updated_at)
+SELECT 1, COUNT(*), COUNT(score), COALESCE(SUM(score), 0), CURRENT_TIMESTAMP
+FROM practice_sessions
+WHERE status = 'completed'
+ON CONFLICT (id) DO UPDATE SET
+    total_sessions = EXCLUDED.total_sessions,
+    scored_sessions = EXCLUDED.scored_sessions,
+    score_sum = EXCLUDED.score_sum,
+    updated_at = EXCLUDED.updated_at;
+
+DELETE FROM practice_level_counts;
+
+INSERT INTO practice_level_counts (cefr_level, sessions)
+SELECT cefr_level, COUNT(*)
+FROM practice_sessions
+WHERE status = 'completed' AND cefr_level IS NOT NULL
+GROUP BY cefr_level;
+
+COMMIT;
@@ -0,0 +1,12 @@
+-- Seek indexes for GET /api/dashboard/sessions (keyset pagination on practiced_at, id).
+-- CONCURRENTLY cannot run inside a transaction block; run this file with psql
+-- in autocommit mode so the table stays writable while the indexes build.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sessions_history
+    ON practice_sessions(practiced_at DESC, id DESC) WHERE status = 'completed';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sessions_word_history
+    ON practice_sessions(word_id, practiced_at DESC, id DESC) WHERE status = 'completed';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sessions_level_history
+    ON practice_sessions(cefr_level, practiced_at DESC, id DESC) WHERE status = 'completed';
@@ -0,0 +1,42 @@
+-- Per-word score rollups behind /api/dashboard/words, backfilled from existing sessions.
+-- The backfill is a single GROUP BY pass; run it off-peak on large tables.
+
+CREATE TABLE IF NOT EXISTS word_score_daily (
+    day DATE NOT NULL,
+    word_id INTEGER NOT NULL,
+    cefr_level VARCHAR(10) NOT NULL,
+    score DECIMAL(3,1) NOT NULL,
+    sessions BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, word_id, cefr_level, score)
+);
+
+CREATE TABLE IF NOT EXISTS word_score_totals (
+    word_id INTEGER NOT NULL,
+    cefr_level VARCHAR(10) NOT NULL,
+    score DECIMAL(3,1) NOT NULL,
+    sessions BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (word_id, cefr_level, score)
+);
+
+BEGIN;
+
+-- Writers bump practice_stats first, so holding it keeps the backfill and
+-- live increments from double counting.
+SELECT id FROM practice_stats WHERE id = 1 FOR UPDATE;
+
+DELETE FROM word_score_daily;
+
+INSERT INTO word_score_daily (day, word_id, cefr_level, score, sessions)
+SELECT DATE(practiced_at), word_id, cefr_level, score, COUNT(*)
+FROM practice_sessions
+WHERE status = 'completed' AND score IS NOT NULL AND cefr_level IS NOT NULL
+GROUP BY DATE(practiced_at), word_id, cefr_level, score;
+
+DELETE FROM word_score_totals;
+
+INSERT INTO word_score_totals (word_id, cefr_level, score, sessions)
+SELECT word_id, cefr_level, score, SUM(sessions)
+FROM word_score_daily
+GROUP BY word_id, cefr_level, score;
+
+COMMIT;
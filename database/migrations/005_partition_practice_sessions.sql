@@ -0,0 +1,67 @@
+-- Converts practice_sessions into a table range-partitioned by month on practiced_at.
+-- Runs in one transaction under an exclusive lock: take the backend down (or
+-- accept a write pause) for the duration of the copy. Ids and the id
+-- sequence are preserved. Fresh installs get the same schema from init.sql.
+
+BEGIN;
+
+LOCK TABLE practice_sessions IN ACCESS EXCLUSIVE MODE;
+
+ALTER TABLE practice_sessions RENAME TO practice_sessions_legacy;
+ALTER INDEX IF EXISTS idx_sessions_word_id RENAME TO idx_sessions_legacy_word_id;
+ALTER INDEX IF EXISTS idx_sessions_practiced_at RENAME TO idx_sessions_legacy_practiced_at;
+ALTER INDEX IF EXISTS idx_sessions_pending RENAME TO idx_sessions_legacy_pending;
+ALTER INDEX IF EXISTS idx_sessions_history RENAME TO idx_sessions_legacy_history;
+ALTER INDEX IF EXISTS idx_sessions_word_history RENAME TO idx_sessions_legacy_word_history;
+ALTER INDEX IF EXISTS idx_sessions_level_history RENAME TO idx_sessions_legacy_level_history;
+
+CREATE TABLE practice_sessions (
+    id INTEGER NOT NULL DEFAULT nextval('practice_sessions_id_seq'),
+    word_id INTEGER NOT NULL REFERENCES words(id) ON DELETE CASCADE,
+    user_sentence TEXT NOT NULL,
+    score DECIMAL(3,1) CHECK (score BETWEEN 0 AND 10),
+    cefr_level VARCHAR(10),
+    feedback TEXT,
+    corrected_sentence TEXT,
+    practiced_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    status VARCHAR(20) NOT NULL DEFAULT 'completed',
+    PRIMARY KEY (id, practiced_at)
+) PARTITION BY RANGE (practiced_at);
+
+ALTER SEQUENCE practice_sessions_id_seq OWNED BY practice_sessions.id;
+
+CREATE TABLE practice_sessions_default PARTITION OF practice_sessions DEFAULT;
+
+-- One partition per month from the oldest session through three months ahead.
+DO $$
+DECLARE
+    month DATE := date_trunc('month', COALESCE((SELECT MIN(practiced_at) FROM practice_sessions_legacy), CURRENT_DATE));
+    last_month DATE := date_trunc('month', CURRENT_DATE) + INTERVAL '3 months';
+BEGIN
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE practice_sessions_y%sm%s PARTITION OF practice_sessions FOR VALUES FROM (%L) TO (%L)',
+            to_char(month, 'YYYY'), to_char(month, 'MM'), month, month + INTERVAL '1 month'
+        );
+        month := month + INTERVAL '1 month';
+    END LOOP;
+END $$;
+
+INSERT INTO practice_sessions
+    (id, word_id, user_sentence, score, cefr_level, feedback, corrected_sentence, practiced_at, status)
+SELECT id, word_id, user_sentence, score, cefr_level, feedback, corrected_sentence,
+       COALESCE(practiced_at, CURRENT_TIMESTAMP), status
+FROM practice_sessions_legacy;
+
+DROP TABLE practice_sessions_legacy;
+
+CREATE INDEX idx_sessions_word_id ON practice_sessions(word_id);
+CREATE INDEX idx_sessions_practiced_at ON practice_sessions(practiced_at DESC);
+CREATE INDEX idx_sessions_pending ON practice_sessions(id) WHERE status = 'pending';
+CREATE INDEX idx_sessions_history ON practice_sessions(practiced_at DESC, id DESC) WHERE status = 'completed';
+CREATE INDEX idx_sessions_word_history ON practice_sessions(word_id, practiced_at DESC, id DESC) WHERE status = 'completed';
+CREATE INDEX idx_sessions_level_history ON practice_sessions(cefr_level, practiced_at DESC, id DESC) WHERE status = 'completed';
+
+COMMIT;
+
+ANALYZE practice_sessions;
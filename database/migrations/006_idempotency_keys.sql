@@ -0,0 +1,14 @@
+-- Stored responses for Idempotency-Key on POST /api/practice/submit, shared by
+-- every worker when IDEMPOTENCY_BACKEND=postgres. Expired rows are purged by
+-- the backend as it goes.
+
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key VARCHAR(300) PRIMARY KEY,
+    request_hash VARCHAR(64) NOT NULL,
+    status_code INTEGER,
+    response JSON,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_expires ON idempotency_keys (expires_at);
@@ -0,0 +1,8 @@
+-- Async submit claims become leases: a 'processing' row whose claimed_at is
+-- older than SUBMIT_CLAIM_LEASE is claimed again, so a worker that crashed
+-- or was redeployed mid-validation no longer strands its session.
+
+ALTER TABLE practice_sessions ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_sessions_claimable ON practice_sessions(id) WHERE status IN ('pending', 'processing');
+DROP INDEX IF EXISTS idx_sessions_pending;
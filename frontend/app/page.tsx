@@ -1,8 +1,8 @@
 
 'use client';
 
-import { useState, useEffect } from 'react';
-import { api, Word, PracticeResult } from '@/lib/api';
+import { useState, useEffect, useRef } from 'react';
+import { api, newIdempotencyKey, Word, PracticeResult } from '@/lib/api';
 import WordCard from '@/components/WordCard';
 import PracticeForm from '@/components/PracticeForm';
 import ResultCard from '@/components/ResultCard';
@@ -12,6 +12,8 @@ export default function PracticePage() {
   const [result, setResult] = useState<PracticeResult | null>(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState('');
+  // Submitting the same sentence again (e.g. after a timeout) reuses the key.
+  const lastSubmit = useRef<{ attempt: string; key: string } | null>(null);
 
   const loadWord = async () => {
     try {
@@ -34,7 +36,13 @@ export default function PracticePage() {
     try {
       setLoading(true);
       setError('');
-      const data = await api.submitPractice(word.id, sentence);
+      const attempt = `${word.id}:${sentence}`;
+      let submit = lastSubmit.current;
+      if (!submit || submit.attempt !== attempt) {
+        submit = { attempt, key: newIdempotencyKey() };
+        lastSubmit.current = submit;
+      }
+      const data = await api.submitPractice(word.id, sentence, submit.key);
       setResult(data);
     } catch (err) {
       console.error('Error submitting practice:', err);
@@ -28,6 +28,15 @@ export interface DashboardStats {
   recent_sessions: PracticeResult[];
 }
 
+// Sent as Idempotency-Key so a retried submit (ours or a proxy's) is not
+// validated and saved twice. crypto.randomUUID needs a secure context.
+export function newIdempotencyKey(): string {
+  if (typeof crypto !== 'undefined' && typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID();
+  }
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+}
+
 class APIError extends Error {
   constructor(message: string, public status?: number) {
     super(message);
@@ -52,11 +61,18 @@ export const api = {
   },
 
   
-  async submitPractice(wordId: number, sentence: string): Promise<PracticeResult> {
+  async submitPractice(
+    wordId: number,
+    sentence: string,
+    idempotencyKey: string = newIdempotencyKey()
+  ): Promise<PracticeResult> {
     try {
       const res = await fetch(`${BACKEND_URL}/api/practice/submit`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: {
+          'Content-Type': 'application/json',
+          'Idempotency-Key': idempotencyKey,
+        },
         body: JSON.stringify({
           word_id: wordId,
           user_sentence: sentence,